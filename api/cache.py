@@ -15,6 +15,7 @@ CACHE_TYPE_REDIS_CACHE = "RedisCache"
 CACHE_EXECUTOR = None
 REDIS_CLIENT = None
 STALENESS_L2_CACHE_ENABLED = False
+RBAC_PERMISSIONS_L2_CACHE_ENABLED = False
 logger = get_logger("cache")
 
 
@@ -24,6 +25,7 @@ def init_cache(app_config, flask_app):
     global CACHE_EXECUTOR
     global REDIS_CLIENT
     global STALENESS_L2_CACHE_ENABLED
+    global RBAC_PERMISSIONS_L2_CACHE_ENABLED
     cache_type = "NullCache"
     logger.info("Initializing Cache")
 
@@ -54,6 +56,11 @@ def init_cache(app_config, flask_app):
             "INVENTORY_API_STALENESS_CACHE_ENABLED=true)"
         )
 
+    if RBAC_PERMISSIONS_L2_CACHE_ENABLED := (
+        CACHE_CONFIG.get("CACHE_TYPE") == CACHE_TYPE_REDIS_CACHE and app_config.api_rbac_permissions_cache_enabled
+    ):
+        logger.info("RBAC permissions L2 (Redis) cache is enabled")
+
     if not CACHE:
         logger.info(f"Cache is unset; using config={CACHE_CONFIG}")
         CACHE = Cache(config=CACHE_CONFIG)
@@ -112,13 +119,81 @@ def delete_keys(cache_key, wildcard=True, spawn=False):
             logger.info(f"Not deleting cache: CACHE_TYPE '{cache_type}' != '{CACHE_TYPE_REDIS_CACHE}'")
 
 
+# --- insights-client system cache ---
+
+# Per-org Redis set with the (prefixed) system keys cached for that org, so that org-level
+# invalidations don't have to SCAN the keyspace.
+SYSTEM_KEYS_INDEX_PREFIX = "hbi:system_keys:"
+
+
+def _system_keys_index(org_id: str) -> str:
+    return f"{SYSTEM_KEYS_INDEX_PREFIX}{org_id}"
+
+
+def _redis_cache_enabled() -> bool:
+    return bool(CACHE_CONFIG) and CACHE_CONFIG.get("CACHE_TYPE") == CACHE_TYPE_REDIS_CACHE
+
+
+def _run_cache_deletion(func, *args, spawn=False):
+    if spawn and CACHE_EXECUTOR:
+        CACHE_EXECUTOR.submit(func, *args)
+    else:
+        func(*args)
+
+
+def _delete_system_keys_redis(keys_by_org: dict[str, set[str]]):
+    try:
+        pipeline = _get_redis_client().pipeline(transaction=False)
+        for org_id, keys in keys_by_org.items():
+            pipeline.delete(*keys)
+            pipeline.srem(_system_keys_index(org_id), *keys)
+        pipeline.execute()
+        logger.info(f"Deleted cache keys count: {sum(len(keys) for keys in keys_by_org.values())}")
+    except Exception as exc:
+        logger.exception("Cache deletion failed", exc_info=exc)
+
+
+def _delete_org_system_keys_redis(org_id: str, key_prefix: str):
+    try:
+        client = _get_redis_client()
+        keys = [key for key in client.smembers(_system_keys_index(org_id)) if key.decode().startswith(key_prefix)]
+        if keys:
+            _delete_system_keys_redis({org_id: set(keys)})
+        else:
+            logger.info(f"Found no cached system keys for org_id={org_id} matching: {key_prefix}")
+    except Exception as exc:
+        logger.exception("Cache deletion failed", exc_info=exc)
+
+
+def delete_cached_system_keys_batch(systems, spawn=False):
+    """
+    Delete the cached insights-client systems of many hosts in one Redis round trip.
+
+    :param systems: iterable of (insights_id, org_id, owner_id) tuples; incomplete ones are skipped
+    """
+    if not _redis_cache_enabled():
+        return
+
+    keys_by_org: dict[str, set[str]] = {}
+    for insights_id, org_id, owner_id in systems:
+        if insights_id and org_id and owner_id:
+            keys_by_org.setdefault(org_id, set()).add(
+                f"{CACHE_PREFIX}insights_id={insights_id}_org={org_id}_user=SYSTEM-{owner_id}"
+            )
+
+    if keys_by_org:
+        _run_cache_deletion(_delete_system_keys_redis, keys_by_org, spawn=spawn)
+
+
 def delete_cached_system_keys(insights_id=None, org_id=None, owner_id=None, spawn=False):
-    if insights_id and org_id and owner_id:
-        delete_keys(f"insights_id={insights_id}_org={org_id}_user=SYSTEM-{owner_id}", wildcard=False, spawn=spawn)
-    elif insights_id and org_id and not owner_id:
-        delete_keys(f"insights_id={insights_id}_org={org_id}", wildcard=True, spawn=spawn)
-    elif not insights_id and org_id:
-        delete_keys(f"insights_id=*_org={org_id}", wildcard=True, spawn=spawn)
+    if not org_id or not _redis_cache_enabled():
+        return
+
+    if insights_id and owner_id:
+        delete_cached_system_keys_batch([(insights_id, org_id, owner_id)], spawn=spawn)
+    else:
+        key_prefix = f"{CACHE_PREFIX}insights_id={insights_id}_org={org_id}" if insights_id else CACHE_PREFIX
+        _run_cache_deletion(_delete_org_system_keys_redis, org_id, key_prefix, spawn=spawn)
 
 
 def set_cached_system(system_key, host, config):
@@ -129,7 +204,15 @@ def set_cached_system(system_key, host, config):
         logger.info("Cache is unset when attampting to set value.")
         init_cache(config, None)
     try:
-        CACHE.set(key=system_key, value=host, timeout=config.cache_insights_client_system_timeout_sec)
+        timeout = config.cache_insights_client_system_timeout_sec
+        CACHE.set(key=system_key, value=host, timeout=timeout)
+        if _redis_cache_enabled() and (org_id := host.get("org_id")):
+            # The index outlives every key added to it, and expires once they all have
+            index = _system_keys_index(org_id)
+            pipeline = _get_redis_client().pipeline(transaction=False)
+            pipeline.sadd(index, f"{CACHE_PREFIX}{system_key}")
+            pipeline.expire(index, timeout)
+            pipeline.execute()
     except Exception as exec:
         logger.exception("Cache deletion failed", exc_info=exec)
 
@@ -198,3 +281,85 @@ def delete_cached_staleness(org_id: str):
         logger.debug(f"Staleness cache deleted for org_id={org_id} (key={key})")
     except Exception as exc:
         logger.exception("Failed to delete cached staleness", exc_info=exc)
+
+
+# --- RBAC permissions cache ---
+
+RBAC_PERMISSIONS_CACHE_KEY_PREFIX = "hbi:rbac_permissions:"
+
+
+def _rbac_permissions_cache_key(key: tuple) -> str:
+    return RBAC_PERMISSIONS_CACHE_KEY_PREFIX + ":".join(str(part) for part in key)
+
+
+def get_cached_rbac_permissions(key: tuple):
+    if not RBAC_PERMISSIONS_L2_CACHE_ENABLED:
+        return None
+    try:
+        raw = _get_redis_client().get(_rbac_permissions_cache_key(key))
+        return None if raw is None else json.loads(raw)
+    except Exception as exc:
+        logger.warning("Failed to get cached RBAC permissions", exc_info=exc)
+        return None
+
+
+def set_cached_rbac_permissions(key: tuple, permissions: list, timeout: int):
+    if not RBAC_PERMISSIONS_L2_CACHE_ENABLED:
+        return
+    try:
+        _get_redis_client().set(_rbac_permissions_cache_key(key), json.dumps(permissions), ex=timeout)
+    except Exception as exc:
+        logger.exception("Failed to set cached RBAC permissions", exc_info=exc)
+
+
+# --- Kessel decisions cache ---
+
+KESSEL_DECISIONS_GENERATION_KEY_PREFIX = "hbi:kessel_decisions_generation:"
+
+
+def get_kessel_decisions_generation(org_id: str) -> int:
+    if not _redis_cache_enabled():
+        return 0
+    try:
+        raw = _get_redis_client().get(f"{KESSEL_DECISIONS_GENERATION_KEY_PREFIX}{org_id}")
+        return int(raw) if raw is not None else 0
+    except Exception as exc:
+        logger.warning("Failed to get Kessel decisions generation", exc_info=exc)
+        return 0
+
+
+def bump_kessel_decisions_generation(org_id: str):
+    if not _redis_cache_enabled():
+        return
+    try:
+        _get_redis_client().incr(f"{KESSEL_DECISIONS_GENERATION_KEY_PREFIX}{org_id}")
+    except Exception as exc:
+        logger.exception("Failed to bump Kessel decisions generation", exc_info=exc)
+
+
+# --- Host counts cache ---
+
+HOST_COUNTS_GENERATION_KEY_PREFIX = "hbi:host_counts_generation:"
+
+
+def get_host_counts_generation(org_id: str) -> int:
+    if not _redis_cache_enabled():
+        return 0
+    try:
+        raw = _get_redis_client().get(f"{HOST_COUNTS_GENERATION_KEY_PREFIX}{org_id}")
+        return int(raw) if raw is not None else 0
+    except Exception as exc:
+        logger.warning("Failed to get host counts generation", exc_info=exc)
+        return 0
+
+
+def bump_host_counts_generations(org_ids: set[str]):
+    if not org_ids or not _redis_cache_enabled():
+        return
+    try:
+        pipeline = _get_redis_client().pipeline(transaction=False)
+        for org_id in org_ids:
+            pipeline.incr(f"{HOST_COUNTS_GENERATION_KEY_PREFIX}{org_id}")
+        pipeline.execute()
+    except Exception as exc:
+        logger.exception("Failed to bump host counts generations", exc_info=exc)
@@ -15,6 +15,7 @@ from sqlalchemy import and_
 from sqlalchemy import func
 from sqlalchemy import not_
 from sqlalchemy import or_
+from sqlalchemy import select
 from sqlalchemy.sql.expression import ColumnElement
 
 from api.filtering.db_app_data_filters import build_app_data_filters
@@ -164,13 +165,27 @@ def _tags_filter(string_tags: list[str]) -> list:
     return [or_(Host.tags.contains(tag) for tag in tags)]
 
 
+def _host_in_groups(*criteria, join_groups: bool = False) -> ColumnElement:
+    # Correlated on the host, so filtering by group neither needs hosts_groups joined nor repeats hosts
+    assoc_query = select(HostGroupAssoc.host_id)
+    if join_groups:
+        assoc_query = assoc_query.join(Group, Group.id == HostGroupAssoc.group_id)
+    return assoc_query.where(
+        HostGroupAssoc.org_id == Host.org_id, HostGroupAssoc.host_id == Host.id, *criteria
+    ).exists()
+
+
+def _ungrouped_filter() -> ColumnElement:
+    return or_(~_host_in_groups(), _host_in_groups(Group.ungrouped.is_(True), join_groups=True))
+
+
 def _group_names_filter(group_name_list: list) -> list:
     _query_filter: list = []
     group_name_list_lower = [group_name.lower() for group_name in group_name_list]
     if len(group_name_list) > 0:
-        group_filters = [func.lower(Group.name).in_(group_name_list_lower)]
+        group_filters = [_host_in_groups(func.lower(Group.name).in_(group_name_list_lower), join_groups=True)]
         if "" in group_name_list:
-            group_filters += [or_(HostGroupAssoc.group_id.is_(None), Group.ungrouped.is_(True))]
+            group_filters += [_ungrouped_filter()]
 
         _query_filter += (or_(*group_filters),)
 
@@ -180,9 +195,9 @@ def _group_names_filter(group_name_list: list) -> list:
 def _group_ids_filter(group_id_list: list) -> list:
     _query_filter = []
     if len(group_id_list) > 0:
-        group_filters = [HostGroupAssoc.group_id.in_(group_id_list)]
+        group_filters = [_host_in_groups(HostGroupAssoc.group_id.in_(group_id_list))]
         if None in group_id_list:
-            group_filters += [or_(HostGroupAssoc.group_id.is_(None), Group.ungrouped.is_(True))]
+            group_filters += [_ungrouped_filter()]
 
         _query_filter += [or_(*group_filters)]
 
@@ -568,12 +583,9 @@ def query_filters(
     needs_static_join = needs_static_join or join_static_profile
     needs_dynamic_join = needs_dynamic_join or join_dynamic_profile
 
+    # Group filters are EXISTS subqueries and the group name ordering reads Host.groups, no group joins needed
     query_base = db.session.query(Host)
 
-    # Determine base query - start with Host and add group joins if needed
-    if group_name or group_ids or rbac_filter or order_by == "group_name":
-        query_base = query_base.outerjoin(HostGroupAssoc).outerjoin(Group)
-
     # Add system profile joins if needed (dynamic detection or explicit request)
     if needs_static_join:
         query_base = query_base.outerjoin(HostStaticSystemProfile)
@@ -7,12 +7,15 @@ from sqlalchemy import desc
 from sqlalchemy import func
 
 from app.auth import get_current_identity
+from app.common import inventory_config
 from app.logging import get_logger
 from app.models import Group
+from app.models import GroupHostCount
 from app.models import HostGroupAssoc
 from app.models import db
 from app.serialization import serialize_rbac_workspace_with_host_count
 from lib.group_repository import serialize_group
+from lib.group_repository import serialize_group_list
 from lib.host_repository import get_host_counts_batch
 from lib.middleware import get_rbac_workspaces_by_ids
 
@@ -93,16 +96,15 @@ def get_group_list_from_db(filters, page, per_page, param_order_by, param_order_
         else GROUPS_ORDER_HOW_MAPPING[order_by_str]
     )
 
+    query = Group.query.outerjoin(HostGroupAssoc).filter(*filters).group_by(Group.id)
+    if order_by_str == "host_count" and inventory_config().group_host_counts_table_enabled:
+        # Order by the materialized counts instead of aggregating hosts_groups
+        order_by = func.coalesce(GroupHostCount.host_count, 0)
+        query = Group.query.outerjoin(GroupHostCount, GroupHostCount.group_id == Group.id).filter(*filters)
+
     # Order the list of groups, then offset and limit based on page and per_page
     group_list = (
-        Group.query.outerjoin(HostGroupAssoc)
-        .filter(*filters)
-        .group_by(Group.id)
-        .order_by(order_how_func(order_by))
-        .order_by(Group.id)
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
+        query.order_by(order_how_func(order_by)).order_by(Group.id).offset((page - 1) * per_page).limit(per_page).all()
     )
 
     # Get the total number of groups that would be returned using just the filters
@@ -246,9 +248,7 @@ def get_filtered_group_list_db(group_name, page, per_page, order_by, order_how,
 def build_paginated_group_list_response(total, page, per_page, group_list):
     # group resource provided by rbac_v2 does not have org_id
     identity = get_current_identity()
-    json_group_list = [
-        serialize_group(group, identity.org_id, getattr(identity, "account_number", None)) for group in group_list
-    ]
+    json_group_list = serialize_group_list(group_list, identity.org_id, getattr(identity, "account_number", None))
     return {
         "total": total,
         "count": len(json_group_list),
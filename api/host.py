@@ -13,10 +13,13 @@ from api import metrics
 from api import pagination_params
 from api.cache import CACHE
 from api.cache import delete_cached_system_keys
+from api.cache import delete_cached_system_keys_batch
+from api.cache import set_cached_system
 from api.cache_key import make_system_cache_key
 from api.filtering.db_filters import update_query_for_owner_id
 from api.host_query import build_paginated_host_list_response
 from api.host_query import staleness_timestamps
+from api.host_query_db import HostListCursor
 from api.host_query_db import get_all_hosts
 from api.host_query_db import get_host_id_by_insights_id
 from api.host_query_db import get_host_ids_list
@@ -46,6 +49,7 @@ from app.models import db
 from app.payload_tracker import PayloadTrackerContext
 from app.payload_tracker import PayloadTrackerProcessingContext
 from app.payload_tracker import get_payload_tracker
+from app.queue.event_producer import DeliveryReport
 from app.queue.events import EventType
 from app.queue.events import build_event
 from app.queue.events import extract_system_profile_fields_for_headers
@@ -59,8 +63,8 @@ from app.utils import check_all_ids_found
 from lib.host_delete import delete_hosts
 from lib.host_repository import find_existing_host
 from lib.host_repository import find_non_culled_hosts
+from lib.host_repository import get_existing_host_ids
 from lib.host_repository import get_host_list_by_id_list_from_db
-from lib.host_repository import host_exists
 from lib.middleware import access
 
 FactOperations = Enum("FactOperations", ("merge", "replace"))
@@ -97,10 +101,13 @@ def get_host_list(
     filter=None,
     fields=None,
     rbac_filter=None,
+    cursor=None,
+    total_mode=None,
 ):
     total = 0
     host_list = ()
     owner_id = None
+    next_cursor = None
     current_identity = get_current_identity()
 
     # Validate mutually exclusive group filters
@@ -126,6 +133,7 @@ def get_host_list(
             system_type,
             filter,
             fields,
+            cursor,
         ]
     )
     is_cached_insights_client_system_query = (
@@ -147,7 +155,10 @@ def get_host_list(
             return flask_json_response(json_data)
 
     try:
-        host_list, total, additional_fields, system_profile_fields = get_host_list_from_db(
+        if cursor:
+            cursor = HostListCursor.decode(cursor)
+            page = cursor.page
+        host_list, total, additional_fields, system_profile_fields, next_cursor, total_mode = get_host_list_from_db(
             display_name,
             fqdn,
             hostname_or_id,
@@ -172,19 +183,27 @@ def get_host_list(
             filter,
             fields,
             rbac_filter,
+            cursor,
+            total_mode,
         )
     except ValueError as e:
         log_get_host_list_failed(logger)
         flask.abort(400, str(e))
 
     json_data = build_paginated_host_list_response(
-        total, page, per_page, host_list, additional_fields, system_profile_fields
+        total,
+        page,
+        per_page,
+        host_list,
+        additional_fields,
+        system_profile_fields,
+        next_cursor=next_cursor.encode() if next_cursor else None,
+        total_mode=total_mode,
     )
     if is_cached_insights_client_system_query and len(host_list) == 1:
         system_key = make_system_cache_key(insights_id, current_identity.org_id, owner_id)
         output_host = serialize_host_with_params(host_list[0])
-        timeout = inventory_config().cache_insights_client_system_timeout_sec
-        CACHE.set(key=system_key, value=output_host, timeout=timeout)
+        set_cached_system(system_key, output_host, inventory_config())
 
     return flask_json_response(json_data)
 
@@ -396,7 +415,7 @@ def get_host_system_profile_by_id(
     return flask_json_response(json_output)
 
 
-def _emit_patch_event(serialized_host, host):
+def _emit_patch_event(serialized_host, host, existing_host_ids=None, delivery_report=None):
     host_type, os_name, bootc_booted = extract_system_profile_fields_for_headers(host)
     headers = message_headers(
         EventType.updated,
@@ -408,10 +427,55 @@ def _emit_patch_event(serialized_host, host):
     )
     metadata = {"b64_identity": to_auth_header(get_current_identity())}
     event = build_event(EventType.updated, serialized_host, platform_metadata=metadata)
-    if not host_exists(host.id, org_id=host.org_id, session=db.session):
+    if existing_host_ids is None:
+        existing_host_ids = get_existing_host_ids([(host.org_id, host.id)])
+    if str(host.id) not in existing_host_ids:
         logger.warning(f"Skipping update event for host {host.id}: host no longer exists")
         return
-    current_app.event_producer.write_event(event, str(host.id), headers, wait=True)
+    if delivery_report is None:
+        current_app.event_producer.write_event(event, str(host.id), headers, wait=True)
+    else:
+        current_app.event_producer.write_event(event, str(host.id), headers, delivery_report=delivery_report)
+
+
+def _apply_host_updates(hosts, update):
+    # Modify all the hosts first, then flush and commit once so the outbox entries are written together
+    updated_hosts = []
+    for host in hosts:
+        update(host)
+        if db.session.is_modified(host):
+            updated_hosts.append(host)
+
+    if updated_hosts:
+        db.session.flush()  # Trigger outbox event listeners before commit
+        db.session.commit()
+
+    return updated_hosts
+
+
+def _emit_patch_events(hosts, staleness, identity):
+    if not hosts:
+        return
+
+    # Check which of the updated hosts still exist with a single query
+    existing_host_ids = get_existing_host_ids((host.org_id, host.id) for host in hosts)
+
+    delivery_report = DeliveryReport()
+    cached_systems = []
+    for host in hosts:
+        serialized_host = serialize_host(host, staleness_timestamps(), staleness=staleness)
+        _emit_patch_event(serialized_host, host, existing_host_ids, delivery_report)
+        owner_id = serialize_uuid(host.static_system_profile.owner_id) if host.static_system_profile else None
+        cached_systems.append((serialize_uuid(host.insights_id), identity.org_id, owner_id))
+
+    # One flush for all the update events instead of one per host
+    failed_keys = current_app.event_producer.flush_delivery_report(
+        delivery_report, inventory_config().host_update_flush_timeout
+    )
+    if failed_keys:
+        logger.error("Update events not delivered for hosts: %s", sorted(failed_keys))
+
+    delete_cached_system_keys_batch(cached_systems)
 
 
 @api_operation
@@ -434,18 +498,8 @@ def patch_host_by_id(host_id_list, body, rbac_filter=None):
 
     staleness = get_staleness_obj(current_identity.org_id)
 
-    for host in hosts_to_update:
-        host.patch(validated_patch_host_data)
-
-        if db.session.is_modified(host):
-            db.session.flush()  # Trigger outbox event listeners before commit
-            db.session.commit()
-            serialized_host = serialize_host(host, staleness_timestamps(), staleness=staleness)
-            _emit_patch_event(serialized_host, host)
-            insights_id = serialize_uuid(host.insights_id)
-            owner_id = serialize_uuid(host.static_system_profile.owner_id) if host.static_system_profile else None
-            if insights_id and owner_id:
-                delete_cached_system_keys(insights_id=insights_id, org_id=current_identity.org_id, owner_id=owner_id)
+    updated_hosts = _apply_host_updates(hosts_to_update, lambda host: host.patch(validated_patch_host_data))
+    _emit_patch_events(updated_hosts, staleness, current_identity)
 
     log_patch_host_success(logger, host_id_list)
     return flask_json_response({}, HTTPStatus.OK)
@@ -507,21 +561,14 @@ def update_facts_by_namespace(operation, host_id_list, namespace, fact_dict, rba
 
     staleness = get_staleness_obj(current_identity.org_id)
 
-    for host in hosts_to_update:
+    def _update_facts(host):
         if operation is FactOperations.replace:
             host.replace_facts_in_namespace(namespace, fact_dict)
         else:
             host.merge_facts_in_namespace(namespace, fact_dict)
 
-        if db.session.is_modified(host):
-            db.session.flush()  # Trigger outbox event listeners before commit
-            db.session.commit()
-            serialized_host = serialize_host(host, staleness_timestamps(), staleness=staleness)
-            _emit_patch_event(serialized_host, host)
-            insights_id = serialize_uuid(host.insights_id)
-            owner_id = serialize_uuid(host.static_system_profile.owner_id) if host.static_system_profile else None
-            if insights_id and owner_id:
-                delete_cached_system_keys(insights_id=insights_id, org_id=current_identity.org_id, owner_id=owner_id)
+    updated_hosts = _apply_host_updates(hosts_to_update, _update_facts)
+    _emit_patch_events(updated_hosts, staleness, current_identity)
 
     logger.debug("hosts_to_update:%s", hosts_to_update)
 
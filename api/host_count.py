@@ -0,0 +1,128 @@
+"""
+Totals of the host lists (GET /hosts and /beta/hosts-view).
+
+Counting the filtered hosts can cost more than reading the page, so the total can be counted in one of
+these modes, chosen per request with total_mode or by the HOST_LIST_TOTAL_MODE config:
+
+- exact: counts the hosts; DISTINCT is only used when the query joins a table that can repeat hosts.
+- cached: the exact count, cached for a short TTL per org and normalized filter set. Ingesting or
+  deleting hosts of an org invalidates its cached counts.
+- estimate: the planner's row estimate for the query (EXPLAIN), cheap but approximate; for UIs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import flask
+from sqlalchemy import func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ClauseElement
+from sqlalchemy.sql.expression import Executable
+
+from api.filtering.db_filters import _is_table_already_joined
+from api.metrics import host_list_total_mode
+from app.auth.identity import Identity
+from app.auth.identity import IdentityType
+from app.common import inventory_config
+from app.logging import get_logger
+from app.models import Host
+from app.models import HostGroupAssoc
+from app.models import db
+from lib.host_count_cache import host_count_cache
+
+__all__ = ("TOTAL_MODES", "count_hosts")
+
+logger = get_logger(__name__)
+
+TOTAL_MODES = ("exact", "cached", "estimate")
+
+# Query parameters that change the page, but not which hosts are counted
+_NOT_FILTER_ARGS = {"page", "per_page", "order_by", "order_how", "cursor", "total_mode"}
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kwargs):
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def _repeats_hosts(query: Query) -> bool:
+    # Every other table joined to hosts is keyed by (org_id, host_id); hosts_groups can have many rows per host
+    return _is_table_already_joined(query, HostGroupAssoc)
+
+
+def _exact_count(query: Query) -> int:
+    counted_id = Host.id.distinct() if _repeats_hosts(query) else Host.id
+    return query.with_entities(func.count(counted_id)).scalar()
+
+
+def _estimated_count(query: Query) -> int:
+    ids_query = query.with_entities(Host.id)
+    if _repeats_hosts(query):
+        ids_query = ids_query.distinct()
+    plan = db.session.execute(_Explain(ids_query.statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _filter_key(identity: Identity, rbac_filter: dict | None) -> str:
+    args = flask.request.args
+    filters = {
+        key: sorted(args.getlist(key)) for key in args if key not in _NOT_FILTER_ARGS and not key.startswith("fields[")
+    }
+    # Both the path and the identity can narrow down the hosts too
+    owner_id = identity.system.get("cn") if identity.identity_type == IdentityType.SYSTEM else None
+    key_data = [flask.request.path, filters, rbac_filter, owner_id]
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _cached_count(query: Query, identity: Identity, rbac_filter: dict | None) -> int:
+    config = inventory_config()
+    key = host_count_cache.scope(identity.org_id, _filter_key(identity, rbac_filter))
+    total = host_count_cache.get(key)
+    if total is None:
+        total = _exact_count(query)
+        host_count_cache.put(key, total, config.host_count_cache_ttl, config.host_count_cache_max_size)
+    return total
+
+
+def count_hosts(
+    query: Query, total_mode: str | None, identity: Identity, rbac_filter: dict | None = None
+) -> tuple[int, str]:
+    """
+    Count the hosts of a filtered host list query.
+
+    Args:
+        query: The filtered, unordered host list query
+        total_mode: "exact", "cached" or "estimate"; None uses the configured mode
+        identity: The identity the query is filtered for
+        rbac_filter: The RBAC filter applied to the query, part of the cache key
+
+    Returns:
+        Tuple of (total, mode used). "cached" falls back to "exact" when the cache is disabled.
+    """
+    config = inventory_config()
+    total_mode = total_mode or config.host_list_total_mode
+    if total_mode not in TOTAL_MODES:
+        logger.warning(f"Unknown host list total mode {total_mode!r}, counting exactly")
+        total_mode = "exact"
+    if total_mode == "cached" and (config.host_count_cache_ttl <= 0 or not flask.has_request_context()):
+        total_mode = "exact"
+
+    if total_mode == "estimate":
+        total = _estimated_count(query)
+    elif total_mode == "cached":
+        total = _cached_count(query, identity, rbac_filter)
+    else:
+        total = _exact_count(query)
+
+    host_list_total_mode.labels(total_mode).inc()
+    return total, total_mode
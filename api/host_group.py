@@ -86,7 +86,7 @@ def get_host_list_by_group(
 
     # Get hosts from database (regardless of feature flag - host data is in DB)
     try:
-        host_list, total, additional_fields, system_profile_fields = get_host_list(
+        host_list, total, additional_fields, system_profile_fields, *_ = get_host_list(
             display_name=display_name,
             fqdn=fqdn,
             hostname_or_id=hostname_or_id,
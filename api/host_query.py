@@ -8,7 +8,15 @@ __all__ = ("build_paginated_host_list_response", "staleness_timestamps")
 
 
 def build_paginated_host_list_response(
-    total, page, per_page, host_list, additional_fields=tuple(), system_profile_fields=None, serialize_hosts=True
+    total,
+    page,
+    per_page,
+    host_list,
+    additional_fields=tuple(),
+    system_profile_fields=None,
+    serialize_hosts=True,
+    next_cursor=None,
+    total_mode=None,
 ):
     timestamps = staleness_timestamps()
     identity = get_current_identity()
@@ -20,13 +28,18 @@ def build_paginated_host_list_response(
             serialize_host(host, timestamps, False, additional_fields, staleness, system_profile_fields)
             for host in host_list
         ]
-    return {
+    response = {
         "total": total,
         "count": len(json_host_list),
         "page": page,
         "per_page": per_page,
         "results": json_host_list,
     }
+    if total_mode:
+        response["total_mode"] = total_mode
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 def staleness_timestamps():
@@ -1,24 +1,40 @@
 from __future__ import annotations
 
-import re
+import json
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from binascii import Error as Base64Error
+from collections import namedtuple
 from collections.abc import Iterator
 from copy import deepcopy
+from datetime import datetime
 from itertools import islice
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy import Boolean
+from sqlalchemy import Column
 from sqlalchemy import Integer
 from sqlalchemy import and_
 from sqlalchemy import case
+from sqlalchemy import false
 from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy import literal_column
+from sqlalchemy import null
+from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import tuple_
 from sqlalchemy.exc import MultipleResultsFound
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Query
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import load_only
 from sqlalchemy.sql import expression
+from sqlalchemy.sql import operators
 from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.expression import Subquery
+from sqlalchemy.sql.expression import UnaryExpression
 
 from api.filtering.app_data_sorting import resolve_app_sort
 from api.filtering.db_filters import ORDER_BY_STATIC_PROFILE_FIELDS
@@ -28,6 +44,8 @@ from api.filtering.db_filters import hosts_field_filter
 from api.filtering.db_filters import query_filters
 from api.filtering.db_filters import rbac_permissions_filter
 from api.filtering.db_filters import update_query_for_owner_id
+from api.host_count import TOTAL_MODES
+from api.host_count import count_hosts
 from api.host_query import staleness_timestamps
 from api.staleness_query import get_staleness_obj
 from app.auth import get_current_identity
@@ -52,6 +70,7 @@ from lib.feature_flags import FLAG_INVENTORY_WORKLOADS_FIELDS_BACKWARD_COMPATIBI
 from lib.feature_flags import get_flag_value
 
 __all__ = (
+    "HostListCursor",
     "get_all_hosts",
     "get_host_list",
     "get_host_list_by_id_list",
@@ -63,6 +82,9 @@ __all__ = (
 
 logger = get_logger(__name__)
 
+# hosts_groups can have many rows per host
+_GROUP_TABLES = frozenset((HostGroupAssoc.__table__, Group.__table__))
+
 DEFAULT_COLUMNS = [
     Host.id,
     Host.account,
@@ -91,6 +113,36 @@ DEFAULT_COLUMNS = [
 ]
 
 
+class HostListCursor(namedtuple("HostListCursor", ("order_by", "order_how", "page", "total", "total_mode", "values"))):
+    """
+    Position in a host list paginated by keyset instead of by OFFSET.
+
+    "values" are the ordering values of the last host of the previous page, in params_to_order_by order.
+    The total is counted once, when the first page is read, and carried over to the following pages
+    with the mode it was counted in.
+    """
+
+    def encode(self) -> str:
+        return urlsafe_b64encode(json.dumps(self._asdict(), default=str).encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> HostListCursor:
+        try:
+            state = json.loads(urlsafe_b64decode(cursor.encode()))
+            decoded = cls(**state)
+        except (Base64Error, UnicodeError, ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor.") from e
+
+        if (
+            not isinstance(decoded.page, int)
+            or not isinstance(decoded.total, int)
+            or decoded.total_mode not in TOTAL_MODES
+            or not isinstance(decoded.values, list)
+        ):
+            raise ValueError("Invalid cursor.")
+        return decoded
+
+
 def get_all_hosts() -> list:
     query_results = _find_hosts_entities_query(columns=[Host.id]).all()
     ids_list = [str(result[0]) for result in query_results]
@@ -108,7 +160,10 @@ def _get_host_list_using_filters(
     param_order_how: str | None,
     fields: dict | None,
     allow_app_fields: bool = False,
-) -> tuple[list[Host], int, tuple[str, ...], list[str]]:
+    cursor: HostListCursor | None = None,
+    total_mode: str | None = "exact",
+    rbac_filter: dict | None = None,
+) -> tuple[list[Host], int, tuple[str, ...], list[str], HostListCursor | None, str]:
     """
     Internal function to get filtered, ordered, and paginated host list.
 
@@ -121,9 +176,13 @@ def _get_host_list_using_filters(
         param_order_how: Order direction ("ASC" or "DESC")
         fields: Requested fields dict (for system_profile handling)
         allow_app_fields: If True, supports app:field sorting (e.g., "vulnerability:critical_cves")
+        cursor: Keyset position to continue from instead of the page offset; the count is not run again
+        total_mode: How to count the total, see api.host_count; None uses the configured mode
+        rbac_filter: RBAC filter included in all_filters, which cached counts are keyed on
 
     Returns:
-        Tuple of (items, count, additional_fields, system_profile_fields)
+        Tuple of (items, count, additional_fields, system_profile_fields, next_cursor, total_mode).
+        next_cursor is None on the last page and when the ordering can't be paginated by keyset.
     """
     # Check if 'system_profile' is requested to decide between "Full ORM" vs "Light Columns"
     sp_fields_map = fields.get("system_profile", {}) if fields else {}
@@ -149,17 +208,44 @@ def _get_host_list_using_filters(
             query=query_base, columns=DEFAULT_COLUMNS.copy(), order_by=param_order_by
         )
 
-    filtered_query = base_query.filter(*all_filters)
-
-    # Count distinct host IDs to avoid overcountiung when JOINs are involved
-    count_total = filtered_query.with_entities(func.count(Host.id.distinct())).scalar()
-
-    ordered_query = filtered_query.order_by(
-        *params_to_order_by(param_order_by, param_order_how, allow_app_fields=allow_app_fields)
-    )
-    paginated_results = ordered_query.paginate(page=page, per_page=per_page, error_out=True, count=False)
+    ordering = params_to_order_by(param_order_by, param_order_how, allow_app_fields=allow_app_fields)
+    keyset = _keyset_columns(ordering)
+    filtered_query = _join_referenced_group_tables(base_query, *all_filters, *ordering).filter(*all_filters)
+    ordered_query = filtered_query.order_by(*ordering)
+
+    if cursor:
+        if keyset is None:
+            raise ValueError(f'Cursor pagination is not supported when ordering by "{param_order_by}".')
+        if (cursor.order_by, cursor.order_how) != (param_order_by, param_order_how) or len(cursor.values) != len(
+            keyset
+        ):
+            raise ValueError("The cursor doesn't match the requested ordering.")
+
+        count_total, total_mode = cursor.total, cursor.total_mode
+        # One extra row tells whether there is a next page
+        items = ordered_query.filter(_keyset_filter(keyset, cursor.values)).limit(per_page + 1).all()
+        has_next_page = len(items) > per_page
+        items = items[:per_page]
+    else:
+        count_total, total_mode = count_hosts(filtered_query, total_mode, get_current_identity(), rbac_filter)
+
+        paginated_results = ordered_query.paginate(page=page, per_page=per_page, error_out=True, count=False)
+        items = paginated_results.items
+        # Only an exact total tells for sure whether a full page is the last one
+        has_next_page = page * per_page < count_total if total_mode == "exact" else len(items) == per_page
+
+    next_cursor = None
+    if keyset is not None and has_next_page and items:
+        next_cursor = HostListCursor(
+            param_order_by,
+            param_order_how,
+            page + 1,
+            count_total,
+            total_mode,
+            [getattr(items[-1], column.key) for column, _ in keyset],
+        )
 
-    return paginated_results.items, count_total, additional_fields, system_profile_fields
+    return items, count_total, additional_fields, system_profile_fields, next_cursor, total_mode
 
 
 def get_host_list(
@@ -187,7 +273,9 @@ def get_host_list(
     filter: dict | None,
     fields: dict | None,
     rbac_filter: dict | None,
-) -> tuple[list[Host], int, tuple[str, ...], list[str]]:
+    cursor: HostListCursor | None = None,
+    total_mode: str | None = "exact",
+) -> tuple[list[Host], int, tuple[str, ...], list[str], HostListCursor | None, str]:
     all_filters, query_base = query_filters(
         fqdn,
         display_name,
@@ -213,7 +301,16 @@ def get_host_list(
     )
 
     return _get_host_list_using_filters(
-        query_base, all_filters, page, per_page, param_order_by, param_order_how, fields
+        query_base,
+        all_filters,
+        page,
+        per_page,
+        param_order_by,
+        param_order_how,
+        fields,
+        cursor=cursor,
+        total_mode=total_mode,
+        rbac_filter=rbac_filter,
     )
 
 
@@ -229,7 +326,7 @@ def get_host_list_by_id_list(
     all_filters = host_id_list_filter(host_id_list)
     all_filters += rbac_permissions_filter(rbac_filter)
 
-    items, total, additional_fields, system_profile_fields = _get_host_list_using_filters(
+    items, total, additional_fields, system_profile_fields, *_ = _get_host_list_using_filters(
         None, all_filters, page, per_page, param_order_by, param_order_how, fields
     )
 
@@ -321,6 +418,65 @@ def _order_how(column, order_how: str):
         raise ValueError('Unsupported ordering direction, use "ASC" or "DESC".')
 
 
+def _keyset_columns(ordering: tuple) -> list[tuple[Column, bool]] | None:
+    """
+    Split an ordering built by params_to_order_by into (column, descending) pairs.
+
+    Returns None if the ordering has anything but plain ascending or descending hosts columns,
+    like the group name, the operating system or an app data field, which can't be paginated by keyset.
+    """
+    keyset = []
+    for order in ordering:
+        if not isinstance(order, UnaryExpression) or order.modifier not in (operators.asc_op, operators.desc_op):
+            return None
+        if not isinstance(order.element, Column) or order.element.table is not Host.__table__:
+            return None
+        keyset.append((order.element, order.modifier is operators.desc_op))
+    return keyset
+
+
+def _keyset_value(column: Column, value: Any) -> Any:
+    if value is None:
+        return None
+    if column.type.python_type is datetime:
+        return datetime.fromisoformat(value)
+    if column.type.python_type is UUID:
+        return UUID(value)
+    return value
+
+
+def _keyset_filter(keyset: list[tuple[Column, bool]], cursor_values: list) -> ColumnElement:
+    """
+    Filter the hosts that come after the cursor values in the keyset ordering.
+
+    Postgres puts NULLs last in ascending and first in descending order, the filter follows that.
+    """
+    try:
+        values = [_keyset_value(column, value) for (column, _), value in zip(keyset, cursor_values, strict=True)]
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+    if all(descending for _, descending in keyset) and None not in values:
+        # A row comparison can use the ordering index; NULLs are never after a value in descending order
+        return tuple_(*(column for column, _ in keyset)) < tuple_(
+            *(literal(value, column.type) for (column, _), value in zip(keyset, values, strict=True))
+        )
+
+    # (a > x) OR (a = x AND b > y) OR ..., with each comparison in its column's direction
+    after_cursor = []
+    equal_so_far: list[ColumnElement] = []
+    for (column, descending), value in zip(keyset, values, strict=True):
+        if value is None:
+            after = column.isnot(None) if descending else false()
+            equal = column.is_(None)
+        else:
+            after = column < value if descending else or_(column > value, column.is_(None))
+            equal = column == value
+        after_cursor.append(and_(*equal_so_far, after))
+        equal_so_far.append(equal)
+    return or_(*after_cursor)
+
+
 def get_host_list_for_views(
     display_name: str | None,
     fqdn: str | None,
@@ -346,7 +502,9 @@ def get_host_list_for_views(
     filter: dict | None,
     fields: dict | None,  # noqa: ARG001
     rbac_filter: dict | None,
-) -> tuple[list[Host], int]:
+    cursor: HostListCursor | None = None,
+    total_mode: str | None = "exact",
+) -> tuple[list[Host], int, HostListCursor | None, str]:
     """
     Get host list for views endpoint with unified sorting support.
 
@@ -355,7 +513,7 @@ def get_host_list_for_views(
     and adds the required JOIN when needed.
 
     Returns:
-        Tuple of (host_list, total_count)
+        Tuple of (host_list, total_count, next_cursor, total_mode)
     """
     all_filters, query_base = query_filters(
         fqdn,
@@ -391,10 +549,20 @@ def get_host_list_for_views(
             )
 
     # Reuse _get_host_list_using_filters with app fields enabled, no system_profile support
-    items, count, _, _ = _get_host_list_using_filters(
-        query_base, all_filters, page, per_page, param_order_by, param_order_how, fields=None, allow_app_fields=True
+    items, count, _, _, next_cursor, total_mode = _get_host_list_using_filters(
+        query_base,
+        all_filters,
+        page,
+        per_page,
+        param_order_by,
+        param_order_how,
+        fields=None,
+        allow_app_fields=True,
+        cursor=cursor,
+        total_mode=total_mode,
+        rbac_filter=rbac_filter,
     )
-    return items, count
+    return items, count, next_cursor, total_mode
 
 
 def _find_hosts_entities_query(
@@ -408,7 +576,7 @@ def _find_hosts_entities_query(
     identity = identity or get_current_identity()
 
     if query is None:
-        query = db.session.query(Host).outerjoin(HostGroupAssoc).outerjoin(Group)
+        query = db.session.query(Host)
         if order_by in ORDER_BY_STATIC_PROFILE_FIELDS:
             query = query.outerjoin(HostStaticSystemProfile)
         query = query.filter(Host.org_id == identity.org_id)
@@ -419,7 +587,7 @@ def _find_hosts_entities_query(
 
 
 def _find_hosts_model_query(columns: list[ColumnElement], identity: Any = None) -> Query:
-    query = db.session.query(Host).outerjoin(HostGroupAssoc).outerjoin(Group)
+    query = db.session.query(Host)
 
     # In this case, return a list of Hosts
     # wih the requested columns.
@@ -433,6 +601,19 @@ def _find_hosts_model_query(columns: list[ColumnElement], identity: Any = None)
     return update_query_for_owner_id(identity, query)
 
 
+def _join_referenced_group_tables(query: Query, *clauses: ColumnElement) -> Query:
+    """
+    Outer join hosts_groups and groups to a hosts query only if the filters or ordering reference them.
+
+    The group filters are EXISTS subqueries and the group name ordering reads Host.groups, so host queries
+    don't need the joins; joining hosts_groups could also repeat a host for each of its groups.
+    """
+    referenced = {table for clause in clauses for table in getattr(clause, "_from_objects", ())}
+    if referenced & _GROUP_TABLES and not _is_table_already_joined(query, HostGroupAssoc):
+        query = query.outerjoin(HostGroupAssoc).outerjoin(Group)
+    return query
+
+
 def get_host_tags_list_by_id_list(
     host_id_list: list[str], limit: int, offset: int, order_by: str, order_how: str, rbac_filter: dict
 ) -> tuple[dict, int]:
@@ -441,6 +622,7 @@ def get_host_tags_list_by_id_list(
     all_filters = host_id_list_filter(host_id_list)
     all_filters += rbac_permissions_filter(rbac_filter)
     order = params_to_order_by(order_by, order_how)
+    query = _join_referenced_group_tables(query, *all_filters, *order)
     query_results = query.filter(*all_filters).order_by(*order).offset(offset).limit(limit).all()
     db.session.close()
     host_tags_dict, _ = _expand_host_tags(query_results)
@@ -548,39 +730,101 @@ def get_tag_list(
         get_current_identity(),
     )
     query = _find_hosts_entities_query(query=query_base, columns=columns)
+    tag_counts = _tag_counts_subquery(query.filter(*all_filters), search)
 
-    query_results = query.filter(*all_filters).all()
-    db.session.close()
-    _, host_tags_dict = _expand_host_tags(query_results)
-    host_tags = host_tags_dict
-    if search:
-        regex = re.compile(search, re.IGNORECASE)
-        host_tags = {}
-        for key in host_tags_dict.keys():
-            if regex.search(key):
-                host_tags[key] = host_tags_dict[key]
-
-    tag_list = []
-    query_count = 0
-    tag_count_list = []
-    for stored_key, tag_contents in host_tags.items():
-        tag_count_item = {"tag": stored_key, "count": len(tag_contents.get("hosts"))}
-        tag_count_list.append(tag_count_item)
+    tag_order = tag_counts.c.tag.collate("C")
     if order_by == "tag":
-        sorted_tag_count_list = sorted(tag_count_list, reverse=order_how == "DESC", key=lambda item: item["tag"])
-    if order_by == "count":
-        sorted_tag_count_list = sorted(tag_count_list, reverse=order_how == "DESC", key=lambda item: item["count"])
-    for tag_item in sorted_tag_count_list:
-        tag_key = tag_item.get("tag")
-        tag_dict = host_tags[tag_key]
-        output = {"tag": tag_dict.get("output", {}), "count": len(tag_dict.get("hosts", []))}
-        tag_list.append(output)
-
-    query_count = len(tag_list)
-    tag_list = list(islice(islice(tag_list, offset, None), limit))
+        order = [tag_order.desc() if order_how == "DESC" else tag_order.asc()]
+    else:
+        count_order = tag_counts.c.count.desc() if order_how == "DESC" else tag_counts.c.count.asc()
+        order = [count_order, tag_order.asc()]
+
+    rows, query_count = _fetch_counts_page(tag_counts, order, limit, offset)
+
+    tag_list = [
+        {"tag": {"namespace": row.namespace, "key": row.key, "value": row.value}, "count": row.count} for row in rows
+    ]
     return tag_list, query_count
 
 
+def _fetch_counts_page(counts: Subquery, order: list, limit: int, offset: int) -> tuple[list, int]:
+    """
+    Fetch one page of an aggregated counts subquery, with the total number of its rows.
+
+    The total comes from a count(*) window over the page query; only a page past the end, which has no row
+    to carry it, needs a separate count.
+    """
+    page_query = select(counts, func.count().over().label("total")).order_by(*order).offset(offset).limit(limit)
+    rows = db.session.execute(page_query).all()
+    if rows:
+        total = rows[0].total
+    elif offset:
+        total = db.session.execute(select(func.count()).select_from(counts)).scalar_one()
+    else:
+        total = 0
+    db.session.close()
+    return rows, total
+
+
+def _tag_counts_subquery(hosts_query: Query, search: str | None) -> Subquery:
+    """
+    Expand the tags of the filtered hosts and count them in the database, one row per distinct tag.
+
+    Mirrors _expand_host_tags: a key without values is one tag with a null value, "null" namespaces, keys
+    and values are returned as null, and the "namespace/key=value" string is what is grouped, searched
+    and sorted on.
+    """
+    hosts = hosts_query.subquery("filtered_hosts")
+    namespaces = func.jsonb_each(hosts.c.tags).table_valued("key", "value", joins_implicitly=True).alias("namespaces")
+    tag_keys = (
+        func.jsonb_each(namespaces.c.value).table_valued("key", "value", joins_implicitly=True).alias("tag_keys")
+    )
+    has_values = and_(func.jsonb_typeof(tag_keys.c.value) == "array", tag_keys.c.value != func.jsonb_build_array())
+    tag_values = (
+        func.jsonb_array_elements(case((has_values, tag_keys.c.value), else_=func.jsonb_build_array(tag_keys.c.value)))
+        .table_valued("value", joins_implicitly=True)
+        .alias("tag_values")
+    )
+
+    as_text = literal_column("'{}'")
+    raw_tags = (
+        select(
+            func.nullif(namespaces.c.key, "null").label("namespace"),
+            func.nullif(tag_keys.c.key, "null").label("key"),
+            case(
+                (has_values, tag_values.c.value.op("#>>")(as_text)),
+                (
+                    func.jsonb_typeof(tag_keys.c.value) == "string",
+                    func.nullif(tag_keys.c.value.op("#>>")(as_text), ""),
+                ),
+                else_=null(),
+            ).label("value"),
+        )
+        .select_from(hosts, namespaces, tag_keys, tag_values)
+        .subquery("raw_tags")
+    )
+
+    value = func.nullif(raw_tags.c.value, "null")
+    tag = func.concat(
+        func.coalesce(raw_tags.c.namespace, "None"),
+        "/",
+        func.coalesce(raw_tags.c.key, "None"),
+        "=",
+        case((func.coalesce(raw_tags.c.value, "") == "", ""), else_=func.coalesce(value, "None")),
+    ).label("tag")
+
+    tag_counts = select(
+        tag,
+        func.min(raw_tags.c.namespace).label("namespace"),
+        func.min(raw_tags.c.key).label("key"),
+        func.min(value).label("value"),
+        func.count().label("count"),
+    ).group_by(tag)
+    if search:
+        tag_counts = tag_counts.having(tag.regexp_match(search, flags="i"))
+    return tag_counts.subquery("tag_counts")
+
+
 def get_os_info(
     limit: int,
     offset: int,
@@ -614,19 +858,19 @@ def get_os_info(
     # Only include records that have set an operating_system.name
     filters += (columns[0].isnot(None),)
 
-    query_results = os_query.filter(*filters).group_by(*columns[:-1]).order_by(func.count().desc()).all()
-    db.session.close()
-
-    os_count_list = []
-    for result in query_results:
-        os_count_item = {
-            "value": {"name": result[0], "major": int(result[1]), "minor": int(result[2])},
-            "count": result[3],
-        }
-        os_count_list.append(os_count_item)
+    os_counts = os_query.filter(*filters).group_by(*columns[:-1]).subquery("os_counts")
+    order = [
+        os_counts.c.count.desc(),
+        os_counts.c.name.collate("C").asc(),
+        os_counts.c.major.asc(),
+        os_counts.c.minor.asc(),
+    ]
+    rows, query_count = _fetch_counts_page(os_counts, order, limit, offset)
 
-    query_count = len(os_count_list)
-    os_list = list(islice(islice(os_count_list, offset, None), limit))
+    os_list = [
+        {"value": {"name": row.name, "major": int(row.major), "minor": int(row.minor)}, "count": row.count}
+        for row in rows
+    ]
     return os_list, query_count
 
 
@@ -708,35 +952,20 @@ def get_sap_sids_info(
     )
 
     sap_sids_query = _find_hosts_entities_query(query_base, columns)
+    host_sap_sids = sap_sids_query.filter(*filters).subquery("host_sap_sids")
 
-    query_results = sap_sids_query.filter(*filters).all()
-    db.session.close()
-    sap_sids = {}
-    for result in query_results:
-        host_id = result[0]
-        sap_sid = result[1]
-        if sap_sid not in sap_sids:
-            sap_sids[sap_sid] = {host_id}
-        else:
-            sap_sids[sap_sid].add(host_id)
-
-    sap_sids_dict = sap_sids
+    # A host is counted once per SID, even when the joins return it more than once
+    sap_sid_counts = select(
+        host_sap_sids.c.sap_sids.label("value"), func.count(host_sap_sids.c.id.distinct()).label("count")
+    ).group_by(host_sap_sids.c.sap_sids)
     if search:
-        regex = re.compile(search, re.IGNORECASE)
-        sap_sids_dict = {}
-        for key in sap_sids.keys():
-            if regex.search(key):
-                sap_sids_dict[key] = sap_sids[key]
-
-    sap_sids_list = []
-    query_count = 0
-    sap_sids_count_list = []
-    for sap_sid, host_list in sap_sids_dict.items():
-        sap_sid_count_item = {"value": sap_sid, "count": len(host_list)}
-        sap_sids_count_list.append(sap_sid_count_item)
-    sap_sids_count_list = sorted(sap_sids_count_list, reverse=True, key=lambda item: item["count"])
-    query_count = len(sap_sids_count_list)
-    sap_sids_list = list(islice(islice(sap_sids_count_list, offset, None), limit))
+        sap_sid_counts = sap_sid_counts.where(host_sap_sids.c.sap_sids.regexp_match(search, flags="i"))
+    sap_sid_counts = sap_sid_counts.subquery("sap_sid_counts")
+
+    order = [sap_sid_counts.c.count.desc(), sap_sid_counts.c.value.collate("C").asc()]
+    rows, query_count = _fetch_counts_page(sap_sid_counts, order, limit, offset)
+
+    sap_sids_list = [{"value": row.value, "count": row.count} for row in rows]
     return sap_sids_list, query_count
 
 
@@ -804,9 +1033,7 @@ def get_sparse_system_profile(
 
     all_filters = host_id_list_filter(host_id_list) + rbac_permissions_filter(rbac_filter)
 
-    query_base = (
-        db.session.query(Host).outerjoin(HostGroupAssoc).outerjoin(Group).filter(Host.org_id == identity.org_id)
-    )
+    query_base = db.session.query(Host).filter(Host.org_id == identity.org_id)
     if needs_static_join:
         query_base = query_base.outerjoin(HostStaticSystemProfile)
     if needs_dynamic_join:
@@ -814,7 +1041,10 @@ def get_sparse_system_profile(
 
     base_query = _find_hosts_entities_query(query=query_base, columns=columns, identity=identity)
 
-    sp_query = base_query.filter(*all_filters).order_by(*params_to_order_by(param_order_by, param_order_how))
+    ordering = params_to_order_by(param_order_by, param_order_how)
+    sp_query = (
+        _join_referenced_group_tables(base_query, *all_filters, *ordering).filter(*all_filters).order_by(*ordering)
+    )
 
     query_results = sp_query.paginate(page=page, per_page=per_page, error_out=True)
     db.session.close()
@@ -947,7 +1177,9 @@ def get_hosts_to_export(
     except SQLAlchemyError as e:  # Most likely ObjectDeletedError, but catching all DB errors
         raise InventoryException(title="DB Error", detail=str(e)) from e
 
-    db.session.close()
+    finally:
+        # The export is streamed, so the consumer may stop iterating early (e.g. when the upload fails)
+        db.session.close()
 
 
 def _get_group_name_order_post_kessel(order_how):
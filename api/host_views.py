@@ -11,6 +11,7 @@ from api import api_operation
 from api import flask_json_response
 from api import metrics
 from api.host_query import staleness_timestamps
+from api.host_query_db import HostListCursor
 from api.host_query_db import get_host_list_for_views
 from api.staleness_query import get_staleness_obj
 from app.auth import get_current_identity
@@ -96,7 +97,7 @@ def _fetch_app_data_for_hosts(host_ids: list, org_id: str, fields: dict | None =
     return result
 
 
-def _build_host_view_response(total, page, per_page, host_list, fields=None):
+def _build_host_view_response(total, page, per_page, host_list, fields=None, next_cursor=None, total_mode=None):
     """Build the response for the hosts-view endpoint."""
     timestamps = staleness_timestamps()
     identity = get_current_identity()
@@ -111,13 +112,18 @@ def _build_host_view_response(total, page, per_page, host_list, fields=None):
         host_data["app_data"] = app_data_map.get(str(host.id), {})
         results.append(host_data)
 
-    return {
+    response = {
         "total": total,
         "count": len(results),
         "page": page,
         "per_page": per_page,
         "results": results,
     }
+    if total_mode:
+        response["total_mode"] = total_mode
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 @api_operation
@@ -148,6 +154,8 @@ def get_host_views(  # noqa: PLR0913, PLR0917
     filter=None,
     fields=None,
     rbac_filter=None,
+    cursor=None,
+    total_mode=None,
 ):
     """
     Get hosts with aggregated application data.
@@ -172,10 +180,14 @@ def get_host_views(  # noqa: PLR0913, PLR0917
     """
     total = 0
     host_list = ()
+    next_cursor = None
 
     try:
+        if cursor:
+            cursor = HostListCursor.decode(cursor)
+            page = cursor.page
         # Unified function handles both standard and app field sorting
-        host_list, total = get_host_list_for_views(
+        host_list, total, next_cursor, total_mode = get_host_list_for_views(
             display_name=display_name,
             fqdn=fqdn,
             hostname_or_id=hostname_or_id,
@@ -200,11 +212,15 @@ def get_host_views(  # noqa: PLR0913, PLR0917
             filter=filter,
             fields=None,
             rbac_filter=rbac_filter,
+            cursor=cursor,
+            total_mode=total_mode,
         )
     except ValueError as e:
         log_get_host_list_failed(logger)
         flask.abort(400, str(e))
 
-    json_data = _build_host_view_response(total, page, per_page, host_list, fields)
+    json_data = _build_host_view_response(
+        total, page, per_page, host_list, fields, next_cursor.encode() if next_cursor else None, total_mode
+    )
 
     return flask_json_response(json_data)
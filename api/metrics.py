@@ -12,3 +12,31 @@ outbound_http_response_time = Histogram(
     ["dependency"],
 )
 api_cached_systems_hit = Counter("inventory_api_cached_systems_hit_count", "The total amount of system cache hits")
+kessel_rpc_response_time = Histogram(
+    "inventory_kessel_rpc_response_time_seconds",
+    "Time spent waiting for a Kessel Inventory API RPC to complete",
+    ["rpc"],
+)
+kessel_decision_cache_hit = Counter(
+    "inventory_kessel_decision_cache_hit_count", "The total amount of Kessel decisions served from cache"
+)
+kessel_decision_cache_miss = Counter(
+    "inventory_kessel_decision_cache_miss_count", "The total amount of Kessel decisions not found in cache"
+)
+rbac_permission_cache_hit = Counter(
+    "inventory_rbac_permission_cache_hit_count",
+    "The total amount of RBAC permission lookups served without calling RBAC",
+    ["tier"],
+)
+rbac_permission_cache_miss = Counter(
+    "inventory_rbac_permission_cache_miss_count", "The total amount of RBAC permission lookups that called RBAC"
+)
+host_count_cache_hit = Counter(
+    "inventory_host_count_cache_hit_count", "The total amount of host list totals served from cache"
+)
+host_count_cache_miss = Counter(
+    "inventory_host_count_cache_miss_count", "The total amount of host list totals not found in cache"
+)
+host_list_total_mode = Counter(
+    "inventory_host_list_total_mode_count", "The total amount of host list totals, by how they were counted", ["mode"]
+)
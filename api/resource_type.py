@@ -14,7 +14,7 @@ from app.instrumentation import log_get_group_list_succeeded
 from app.instrumentation import log_get_resource_type_list_failed
 from app.instrumentation import log_get_resource_type_list_succeeded
 from app.logging import get_logger
-from lib.group_repository import serialize_group
+from lib.group_repository import serialize_group_list
 from lib.middleware import rbac
 
 logger = get_logger(__name__)
@@ -66,7 +66,5 @@ def get_resource_type_groups_list(
 
     log_get_group_list_succeeded(logger, group_list)
     identity = get_current_identity()
-    serialized_groups = [
-        serialize_group(group, identity.org_id, getattr(identity, "account_number", None)) for group in group_list
-    ]
+    serialized_groups = serialize_group_list(group_list, identity.org_id, getattr(identity, "account_number", None))
     return flask_json_response(build_paginated_resource_list_response(total, page, per_page, serialized_groups))
@@ -45,7 +45,7 @@ from app.serialization import serialize_staleness_to_dict
 from app.staleness_serialization import AttrDict
 from app.staleness_serialization import get_sys_default_staleness_api
 from lib.db import session_guard
-from lib.host_repository import host_exists
+from lib.host_repository import get_existing_host_ids
 from lib.host_repository import host_query
 from lib.middleware import access
 from lib.staleness import add_staleness
@@ -164,8 +164,12 @@ def _update_hosts_staleness_async(identity: Identity, app: Flask, staleness_dict
                     # events for hosts that were deleted between our DB commit and the
                     # event production, which would cause downstream consumers to see
                     # an update after a delete (ghost host race condition).
+                    existing_host_ids = get_existing_host_ids(
+                        ((identity.org_id, host_id) for _, _, host_id in list_of_events_params),
+                        session=hosts_query.session,
+                    )
                     for event, headers, host_id in list_of_events_params:
-                        if host_exists(host_id, org_id=identity.org_id, session=hosts_query.session):
+                        if host_id in existing_host_ids:
                             app.event_producer.write_event(event, host_id, headers, wait=True)
                         else:
                             logger.warning(
@@ -234,6 +234,9 @@ class Config:
         )
         self.api_cache_max_thread_pool_workers = int(os.getenv("INVENTORY_CACHE_THREAD_POOL_MAX_WORKERS", "5"))
         self.staleness_cache_timeout = int(os.getenv("STALENESS_CACHE_TIMEOUT_SECONDS", "3600"))
+        self.api_rbac_permissions_cache_enabled = (
+            os.environ.get("INVENTORY_API_RBAC_PERMISSIONS_CACHE_ENABLED", "false").lower() == "true"
+        )
         self.redis_socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "3"))
         self.redis_socket_connect_timeout = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS", "3"))
 
@@ -250,6 +253,21 @@ class Config:
         self.bypass_kessel = os.environ.get("BYPASS_KESSEL", "false").lower() == "true"
         self.rbac_retries = os.environ.get("RBAC_RETRIES", 2)
         self.rbac_timeout = os.environ.get("RBAC_TIMEOUT", 10)
+        self.rbac_pool_maxsize = int(os.environ.get("RBAC_POOL_MAXSIZE", "10"))
+        # 0 disables caching of RBAC v1 permission lookups
+        self.rbac_permission_cache_ttl = int(os.environ.get("RBAC_PERMISSION_CACHE_TTL_SECONDS", "0"))
+        self.rbac_permission_cache_max_size = int(os.environ.get("RBAC_PERMISSION_CACHE_MAX_SIZE", "10000"))
+        # 0 disables the process-wide cache of serialized ungrouped groups, kept across ingress batches
+        self.ungrouped_group_cache_ttl = int(os.environ.get("UNGROUPED_GROUP_CACHE_TTL_SECONDS", "0"))
+        self.ungrouped_workspace_create_workers = int(os.environ.get("UNGROUPED_WORKSPACE_CREATE_WORKERS", "8"))
+        # Maintain group_host_counts and order groups by host_count from it
+        self.group_host_counts_table_enabled = (
+            os.environ.get("GROUP_HOST_COUNTS_TABLE_ENABLED", "false").lower() == "true"
+        )
+        # How host lists count their total when the request doesn't say: "exact", "cached" or "estimate"
+        self.host_list_total_mode = os.environ.get("HOST_LIST_TOTAL_MODE", "exact").lower()
+        self.host_count_cache_ttl = int(os.environ.get("HOST_COUNT_CACHE_TTL_SECONDS", "30"))
+        self.host_count_cache_max_size = int(os.environ.get("HOST_COUNT_CACHE_MAX_SIZE", "10000"))
 
         self.kessel_auth_client_id = os.environ.get("KESSEL_AUTH_CLIENT_ID")
         self.kessel_auth_client_secret = os.environ.get("KESSEL_AUTH_CLIENT_SECRET")
@@ -258,6 +276,10 @@ class Config:
         )
         self.kessel_auth_enabled = os.environ.get("KESSEL_AUTH_ENABLED", "false").lower() == "true"
         self.kessel_insecure = os.environ.get("KESSEL_INSECURE", "true").lower() == "true"
+        self.kessel_max_concurrent_checks = int(os.environ.get("KESSEL_MAX_CONCURRENT_CHECKS", "20"))
+        # 0 disables caching of Kessel decisions
+        self.kessel_decision_cache_ttl = int(os.environ.get("KESSEL_DECISION_CACHE_TTL_SECONDS", "0"))
+        self.kessel_decision_cache_max_size = int(os.environ.get("KESSEL_DECISION_CACHE_MAX_SIZE", "50000"))
 
         self.bypass_unleash = os.environ.get("BYPASS_UNLEASH", "false").lower() == "true"
         self.unleash_refresh_interval = int(os.environ.get("UNLEASH_REFRESH_INTERVAL", "15"))
@@ -359,18 +381,39 @@ class Config:
 
         self.use_sub_man_id_for_host_id = os.environ.get("USE_SUBMAN_ID", "false").lower() == "true"
         self.host_delete_chunk_size = int(os.getenv("HOST_DELETE_CHUNK_SIZE", "1000"))
+        self.host_delete_flush_timeout = float(os.getenv("HOST_DELETE_FLUSH_TIMEOUT_SECONDS", "300"))
+        # How the reaper and the stale host notification job apply the org staleness: "per_org" builds one
+        # filter per org with custom staleness, "join" joins the hosts against the staleness table in SQL
+        self.staleness_job_query_mode = os.getenv("STALENESS_JOB_QUERY_MODE", "per_org").lower()
+        self.host_update_flush_timeout = float(os.getenv("HOST_UPDATE_FLUSH_TIMEOUT_SECONDS", "300"))
         self.script_chunk_size = int(os.getenv("SCRIPT_CHUNK_SIZE", "500"))
+        # The host synchronizer splits the orgs into SYNCHRONIZER_SHARD_COUNT hash ranges, one per run.
+        # Each run syncs the shard SYNCHRONIZER_SHARD_INDEX; when it is empty, pods of an indexed Kubernetes
+        # Job get their shard from JOB_COMPLETION_INDEX.
+        self.synchronizer_shard_count = int(os.getenv("SYNCHRONIZER_SHARD_COUNT", "1"))
+        self.synchronizer_shard_index = int(
+            os.getenv("SYNCHRONIZER_SHARD_INDEX") or os.getenv("JOB_COMPLETION_INDEX") or "0"
+        )
+        self.synchronizer_flush_timeout = float(os.getenv("SYNCHRONIZER_FLUSH_TIMEOUT_SECONDS", "300"))
         self.export_svc_batch_size = int(os.getenv("EXPORT_SVC_BATCH_SIZE", "500"))
         self.rebuild_events_time_limit = int(os.getenv("REBUILD_EVENTS_TIME_LIMIT", "3600"))  # 1 hour
+        self.rebuild_events_batch_size = int(os.getenv("REBUILD_EVENTS_BATCH_SIZE", "10000"))
         self.sp_authorized_users = os.getenv("SP_AUTHORIZED_USERS", "tuser@redhat.com").split()
         self.mq_db_batch_max_messages = int(os.getenv("MQ_DB_BATCH_MAX_MESSAGES", "1"))
         self.mq_db_batch_max_seconds = float(os.getenv("MQ_DB_BATCH_MAX_SECONDS", "0.5"))
+        # Write the new hosts of an ingress batch with multi-row INSERTs instead of the ORM unit of work
+        self.mq_bulk_insert_new_hosts = os.getenv("MQ_BULK_INSERT_NEW_HOSTS", "false").lower() == "true"
+        # Apply check-ins whose content didn't change since the host's last full update as check-ins only
+        self.mq_heartbeat_fast_path = os.getenv("MQ_HEARTBEAT_FAST_PATH", "false").lower() == "true"
         self.outbox_use_batched_queries = os.environ.get("OUTBOX_USE_BATCHED_QUERIES", "false").lower() == "true"
 
         self.s3_access_key_id = os.getenv("S3_AWS_ACCESS_KEY_ID")
         self.s3_secret_access_key = os.getenv("S3_AWS_SECRET_ACCESS_KEY")
         self.s3_bucket = os.getenv("S3_AWS_BUCKET")
         self.dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
+        # How the duplicate hosts remover finds duplicates: "per_host" searches the matching hosts of every host,
+        # "in_memory" loads the ID facts of the org once and runs the same searches on them in memory
+        self.duplicate_hosts_algorithm = os.getenv("DUPLICATE_HOSTS_ALGORITHM", "per_host").lower()
 
         self.sp_fields_to_log = os.getenv("SP_FIELDS_TO_LOG", "").split(",")
 
@@ -497,6 +540,11 @@ class Config:
             self.logger.info("RBAC Endpoint: %s", self.rbac_endpoint)
             self.logger.info("RBAC Retry Times: %s", self.rbac_retries)
             self.logger.info("RBAC Timeout Seconds: %s", self.rbac_timeout)
+            self.logger.info("RBAC Permission Cache TTL Seconds: %s", self.rbac_permission_cache_ttl)
+            self.logger.info("Ungrouped Group Cache TTL Seconds: %s", self.ungrouped_group_cache_ttl)
+            self.logger.info("Group Host Counts Table Enabled: %s", self.group_host_counts_table_enabled)
+            self.logger.info("Host List Total Mode: %s", self.host_list_total_mode)
+            self.logger.info("Host Count Cache TTL Seconds: %s", self.host_count_cache_ttl)
 
             self.logger.info("Kessel Bypassed: %s", self.bypass_kessel)
             self.logger.info("Kessel is running in %s mode.", "INSECURE" if self.kessel_insecure else "SECURE")
@@ -18,6 +18,7 @@ from app.models.constants import ProviderType
 from app.models.database import db
 from app.models.database import migrate
 from app.models.group import Group
+from app.models.group_host_count import GroupHostCount
 from app.models.host import Host
 from app.models.host import LimitedHost
 from app.models.host_app_data import HostAppDataAdvisor
@@ -28,6 +29,7 @@ from app.models.host_app_data import HostAppDataRemediations
 from app.models.host_app_data import HostAppDataVulnerability
 from app.models.host_group_assoc import HostGroupAssoc
 from app.models.host_inventory_metadata import HostInventoryMetadata
+from app.models.job_checkpoint import JobCheckpoint
 from app.models.outbox import Outbox
 from app.models.schemas import CanonicalFactsSchema
 from app.models.schemas import DiskDeviceSchema
@@ -77,10 +79,12 @@ __all__ = [
     "LimitedHost",
     "Host",
     "Group",
+    "GroupHostCount",
     "HostGroupAssoc",
     "Outbox",
     "Staleness",
     "HostInventoryMetadata",
+    "JobCheckpoint",
     "HostAppDataAdvisor",
     "HostAppDataCompliance",
     "HostAppDataMalware",
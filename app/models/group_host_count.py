@@ -0,0 +1,30 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.constants import INVENTORY_SCHEMA
+from app.models.database import db
+
+
+# Materialized number of hosts per group, used to order groups by host_count without aggregating
+# hosts_groups and hosts. Only maintained when GROUP_HOST_COUNTS_TABLE_ENABLED is set: the group
+# membership writes adjust it, and the host reaper recomputes it from the non-culled hosts.
+class GroupHostCount(db.Model):
+    __tablename__ = "group_host_counts"
+    __table_args__ = (
+        Index("idx_group_host_counts_org_id_host_count", "org_id", "host_count"),
+        {"schema": INVENTORY_SCHEMA},
+    )
+
+    def __init__(self, group_id, org_id, host_count=0):
+        self.group_id = group_id
+        self.org_id = org_id
+        self.host_count = host_count
+
+    group_id = db.Column(
+        UUID(as_uuid=True),
+        ForeignKey(f"{INVENTORY_SCHEMA}.groups.id", name="fk_group_host_counts_on_groups", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    org_id = db.Column(db.String(36), nullable=False)
+    host_count = db.Column(db.Integer, nullable=False, default=0)
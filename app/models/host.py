@@ -1,3 +1,5 @@
+import hashlib
+import json
 import uuid
 from contextlib import suppress
 from datetime import datetime
@@ -7,7 +9,9 @@ from flask import current_app
 from sqlalchemy import String
 from sqlalchemy import case
 from sqlalchemy import cast
+from sqlalchemy import event
 from sqlalchemy import func
+from sqlalchemy import inspect
 from sqlalchemy import orm
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
@@ -203,10 +207,13 @@ class LimitedHost(db.Model, HostTypeDeriver):
         # Make a copy and migrate legacy workload fields to workloads.* for the normalized tables
         # This ensures backward compatibility: legacy fields in input are converted to workloads.*
         # before being written to the new system_profiles_dynamic.workloads column
-        system_profile_copy = deepcopy(input_system_profile)
-        data_wrapper = {"system_profile": system_profile_copy}
-        LimitedHostSchema._migrate_and_remove_legacy_workloads_fields(data_wrapper)
-        migrated_profile = data_wrapper["system_profile"]
+        # Profiles loaded by LimitedHostSchema were already migrated, so they are used without the copy
+        if LimitedHostSchema._has_legacy_workloads_fields(input_system_profile):
+            data_wrapper = {"system_profile": deepcopy(input_system_profile)}
+            LimitedHostSchema._migrate_and_remove_legacy_workloads_fields(data_wrapper)
+            migrated_profile = data_wrapper["system_profile"]
+        else:
+            migrated_profile = input_system_profile
 
         # Transform and validate the data
         static_data, dynamic_data = validate_and_transform(str(self.org_id), str(self.id), migrated_profile)
@@ -273,6 +280,8 @@ class Host(LimitedHost):
     reporter = db.Column(db.String(255), nullable=False)
     per_reporter_staleness = db.Column(JSONB, nullable=False)
     display_name_reporter = db.Column(db.String(255))
+    # Digest of the input host of the last full update from the MQ, see compute_content_digest
+    content_digest = db.Column(db.String(64))
 
     def __init__(
         self,
@@ -399,6 +408,34 @@ class Host(LimitedHost):
         self._update_per_reporter_staleness(input_host.reporter)
         self._update_staleness_timestamps()
 
+    def check_in(self, reporter: str) -> None:
+        """Apply a check-in whose content is the same as the last full update's, see compute_content_digest."""
+        self._update_last_check_in_date()
+        self._update_per_reporter_staleness(reporter)
+        self._update_staleness_timestamps()
+
+    def compute_content_digest(self) -> str:
+        """
+        Digest of everything Host.update applies from this host, when it is the input host.
+
+        Host.update is idempotent, so as long as nothing else changed the host since it was updated with an
+        input host, updating it with another input host with the same digest would only change its check-in
+        and staleness. Any other change to the fields covered here clears the stored digest.
+        """
+        from app.serialization import build_system_profile_from_normalized
+
+        content = {
+            "display_name": self.display_name,
+            "ansible_host": self.ansible_host,
+            "org_id": self.org_id,
+            "reporter": self.reporter,
+            "canonical_facts": {field: getattr(self, field, None) for field in CANONICAL_FACTS_FIELDS},
+            "facts": self.facts,
+            "tags": self.tags,
+            "system_profile": build_system_profile_from_normalized(self),
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
     def patch(self, patch_data):
         logger.debug("patching host (id=%s) with data: %s", self.id, patch_data)
 
@@ -550,6 +587,8 @@ class Host(LimitedHost):
 
     def update_system_profile(self, input_system_profile: dict):
         logger.debug("Updating host's (id=%s) system profile", self.id)
+        # The system profile lives in other tables, so the before_update listener doesn't see it change
+        self.content_digest = None
 
         try:
             self._add_or_update_normalized_system_profiles(input_system_profile)
@@ -621,3 +660,28 @@ class Host(LimitedHost):
             f"<Host id='{self.id}' account='{self.account}' org_id='{self.org_id}' display_name='{self.display_name}' "
             f"insights_id='{self.insights_id}'>"
         )
+
+
+# Fields that Host.update writes from its input host, covered by Host.content_digest
+CONTENT_DIGEST_FIELDS = (
+    "display_name",
+    "display_name_reporter",
+    "ansible_host",
+    "facts",
+    "tags",
+    "org_id",
+    "reporter",
+)
+
+
+# Event handler callback: registered with SQLAlchemy, not called directly
+@event.listens_for(Host, "before_update", propagate=True)
+def _clear_stale_content_digest(mapper, connection, host: Host):  # noqa: ARG001
+    """Clear the content digest when a host is changed by anything but the update that set the digest."""
+    inspected = inspect(host)
+    if inspected.attrs.content_digest.history.has_changes():
+        return
+    if any(
+        inspected.attrs[field].history.has_changes() for field in (*CONTENT_DIGEST_FIELDS, *CANONICAL_FACTS_FIELDS)
+    ):
+        host.content_digest = None
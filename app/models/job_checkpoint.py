@@ -0,0 +1,20 @@
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.constants import INVENTORY_SCHEMA
+from app.models.database import db
+from app.models.utils import _time_now
+
+
+# Position of a resumable job run, saved after each chunk the job completes. An interrupted run leaves its
+# checkpoint behind, so the next run continues after the last completed chunk instead of starting over.
+class JobCheckpoint(db.Model):
+    __tablename__ = "job_checkpoints"
+    __table_args__ = ({"schema": INVENTORY_SCHEMA},)
+
+    def __init__(self, name, position):
+        self.name = name
+        self.position = position
+
+    name = db.Column(db.String(128), primary_key=True)
+    position = db.Column(JSONB, nullable=False)
+    modified_on = db.Column(db.DateTime(timezone=True), default=_time_now, onupdate=_time_now, nullable=False)
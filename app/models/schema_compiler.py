@@ -0,0 +1,192 @@
+import numbers
+import re
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import unquote
+
+from jsonschema.validators import Draft4Validator
+
+# Compiles a Draft 4 JSON Schema into nested Python predicates that only answer "is this instance valid?".
+# It is much faster than jsonschema's interpreter, which re-dispatches every keyword and builds a child
+# validator for every descent, but it reports no errors: callers run the jsonschema validator again when
+# the predicate fails, so the error messages stay the same.
+
+Check = Callable[[Any], bool]
+
+_TYPE_CHECKS: dict[str, Check] = {
+    "array": lambda instance: isinstance(instance, list),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": lambda instance: isinstance(instance, int) and not isinstance(instance, bool),
+    "null": lambda instance: instance is None,
+    "number": lambda instance: isinstance(instance, numbers.Number) and not isinstance(instance, bool),
+    "object": lambda instance: isinstance(instance, dict),
+    "string": lambda instance: isinstance(instance, str),
+}
+
+# Keywords that don't descend into subschemas; jsonschema's own implementation is reused for them.
+_DELEGATED_KEYWORDS = ("maxItems", "maxProperties", "minItems", "minProperties", "multipleOf", "uniqueItems")
+
+
+class SchemaNotCompilable(Exception):
+    pass
+
+
+def compile_schema(validator: Draft4Validator) -> Check:
+    """
+    Compile the validator's schema into a predicate equivalent to validator.is_valid.
+
+    Raises SchemaNotCompilable for anything but a Draft 4 validator, non-local $refs and keywords
+    that aren't supported; callers should use the jsonschema validator for those schemas.
+    """
+    if type(validator) is not Draft4Validator:
+        raise SchemaNotCompilable(f"{type(validator).__name__} is not supported")
+    return _SchemaCompiler(validator).compile(validator.schema)
+
+
+class _SchemaCompiler:
+    def __init__(self, validator: Draft4Validator):
+        self._validator = validator
+        self._root = validator.schema
+        # $refs are compiled once and can be recursive, so each one is compiled into a cell first
+        self._refs: dict[str, list[Check]] = {}
+
+    def compile(self, schema: dict) -> Check:
+        if not isinstance(schema, dict):
+            raise SchemaNotCompilable(f"{schema!r} is not a schema object")
+        if "$ref" in schema:
+            # Draft 4 ignores the keywords next to a $ref
+            return self._compile_ref(schema["$ref"])
+        if "id" in schema and schema is not self._root:
+            raise SchemaNotCompilable("nested resolution scopes are not supported")
+
+        checks = [self._compile_keyword(keyword, value, schema) for keyword, value in schema.items()]
+        checks = [check for check in checks if check is not None]
+        if not checks:
+            return lambda _instance: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda instance: all(check(instance) for check in checks)
+
+    def _compile_ref(self, ref: str) -> Check:
+        if ref not in self._refs:
+            cell: list[Check] = []
+            self._refs[ref] = cell
+            cell.append(self.compile(self._resolve(ref)))
+        cell = self._refs[ref]
+        return lambda instance: cell[0](instance)
+
+    def _resolve(self, ref: str) -> dict:
+        if ref == "#":
+            return self._root
+        if not ref.startswith("#/"):
+            raise SchemaNotCompilable(f"{ref} is not a local reference")
+
+        document = self._root
+        for part in ref[2:].split("/"):
+            part = unquote(part).replace("~1", "/").replace("~0", "~")
+            if isinstance(document, list):
+                part = int(part)
+            try:
+                document = document[part]
+            except (KeyError, IndexError, TypeError) as error:
+                raise SchemaNotCompilable(f"{ref} can't be resolved") from error
+        return document
+
+    def _compile_keyword(self, keyword: str, value: Any, schema: dict) -> Check | None:  # noqa: C901, PLR0911, PLR0912
+        if keyword not in Draft4Validator.VALIDATORS:
+            # Annotations (description, example, x-*) and the Draft 4 exclusive* modifiers
+            return None
+
+        if keyword == "type":
+            types = [value] if isinstance(value, str) else value
+            if any(type_name not in _TYPE_CHECKS for type_name in types):
+                raise SchemaNotCompilable(f"unknown type in {value!r}")
+            type_checks = [_TYPE_CHECKS[type_name] for type_name in types]
+            if len(type_checks) == 1:
+                return type_checks[0]
+            return lambda instance: any(check(instance) for check in type_checks)
+
+        if keyword == "properties":
+            property_checks = [(name, self.compile(subschema)) for name, subschema in value.items()]
+            return lambda instance: (
+                not isinstance(instance, dict)
+                or all(check(instance[name]) for name, check in property_checks if name in instance)
+            )
+
+        if keyword == "additionalProperties":
+            if "patternProperties" in schema:
+                raise SchemaNotCompilable("additionalProperties with patternProperties is not supported")
+            known = frozenset(schema.get("properties", {}))
+            if value is True:
+                return None
+            if value is False:
+                return lambda instance: not isinstance(instance, dict) or known.issuperset(instance)
+            additional_check = self.compile(value)
+            return lambda instance: (
+                not isinstance(instance, dict)
+                or all(additional_check(item) for name, item in instance.items() if name not in known)
+            )
+
+        if keyword == "items":
+            if not isinstance(value, dict):
+                raise SchemaNotCompilable("tuple items are not supported")
+            item_check = self.compile(value)
+            return lambda instance: not isinstance(instance, list) or all(item_check(item) for item in instance)
+
+        if keyword == "required":
+            required = tuple(value)
+            return lambda instance: not isinstance(instance, dict) or all(name in instance for name in required)
+
+        if keyword == "maxLength":
+            return lambda instance: not isinstance(instance, str) or len(instance) <= value
+
+        if keyword == "minLength":
+            return lambda instance: not isinstance(instance, str) or len(instance) >= value
+
+        if keyword == "pattern":
+            search = re.compile(value).search
+            return lambda instance: not isinstance(instance, str) or search(instance) is not None
+
+        if keyword in ("minimum", "maximum"):
+            is_number = _TYPE_CHECKS["number"]
+            if keyword == "minimum":
+                exclusive = schema.get("exclusiveMinimum", False)
+                in_range = (lambda number: number > value) if exclusive else (lambda number: number >= value)
+            else:
+                exclusive = schema.get("exclusiveMaximum", False)
+                in_range = (lambda number: number < value) if exclusive else (lambda number: number <= value)
+            return lambda instance: not is_number(instance) or in_range(instance)
+
+        if keyword == "enum":
+            if not all(isinstance(option, str) for option in value):
+                raise SchemaNotCompilable("only string enums are supported")
+            options = frozenset(value)
+            return lambda instance: isinstance(instance, str) and instance in options
+
+        if keyword == "format":
+            format_checker = self._validator.format_checker
+            if format_checker is None or value not in format_checker.checkers:
+                return None
+            return lambda instance: format_checker.conforms(instance, value)
+
+        if keyword == "oneOf":
+            option_checks = [self.compile(subschema) for subschema in value]
+            return lambda instance: sum(1 for check in option_checks if check(instance)) == 1
+
+        if keyword == "anyOf":
+            option_checks = [self.compile(subschema) for subschema in value]
+            return lambda instance: any(check(instance) for check in option_checks)
+
+        if keyword == "allOf":
+            option_checks = [self.compile(subschema) for subschema in value]
+            return lambda instance: all(check(instance) for check in option_checks)
+
+        if keyword == "not":
+            negated_check = self.compile(value)
+            return lambda instance: not negated_check(instance)
+
+        if keyword in _DELEGATED_KEYWORDS:
+            validator, implementation = self._validator, Draft4Validator.VALIDATORS[keyword]
+            return lambda instance: next(implementation(validator, value, instance, schema), None) is None
+
+        raise SchemaNotCompilable(f"{keyword} is not supported")
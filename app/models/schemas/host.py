@@ -2,7 +2,6 @@ from copy import deepcopy
 from functools import lru_cache
 
 from jsonschema import ValidationError as JsonSchemaValidationError
-from jsonschema.validators import Draft4Validator
 from marshmallow import Schema as MarshmallowSchema
 from marshmallow import ValidationError as MarshmallowValidationError
 from marshmallow import fields
@@ -128,9 +127,9 @@ class LimitedHostSchema(CanonicalFactsSchema):
         super().__init__(*args, **kwargs)
         cls = type(self)
         if not hasattr(cls, "system_profile_normalizer"):
-            cls.system_profile_normalizer = SystemProfileNormalizer()
+            cls.system_profile_normalizer = SystemProfileNormalizer.for_spec()
         if system_profile_schema:
-            self.system_profile_normalizer = SystemProfileNormalizer(system_profile_schema=system_profile_schema)
+            self.system_profile_normalizer = SystemProfileNormalizer.for_spec(system_profile_schema)
 
     @validates("tags")
     def validate_tags(self, tags, data_key):  # noqa: ARG002, required for marshmallow validator functions
@@ -172,11 +171,11 @@ class LimitedHostSchema(CanonicalFactsSchema):
         return True
 
     @staticmethod
-    def _normalize_system_profile(normalize, data):
+    def _normalize_system_profile(normalize, data, copy=True):
         if "system_profile" not in data:
             return data
 
-        system_profile = deepcopy(data["system_profile"])
+        system_profile = deepcopy(data["system_profile"]) if copy else data["system_profile"]
         normalize(system_profile)
         return {**data, "system_profile": system_profile}
 
@@ -368,6 +367,35 @@ class LimitedHostSchema(CanonicalFactsSchema):
         if "nested_field" in config:
             LimitedHostSchema._remove_nested_field(system_profile, config["nested_field"])
 
+    @staticmethod
+    def _has_legacy_workloads_fields(system_profile):
+        """
+        Whether _migrate_and_remove_legacy_workloads_fields would change the system profile.
+
+        Args:
+            system_profile: System profile dictionary
+
+        Returns:
+            False when the system profile can be used as it is, without migrating it
+        """
+        workloads = system_profile.get("workloads")
+        if "workloads" in system_profile and (not isinstance(workloads, dict) or not workloads):
+            return True
+
+        for config in LimitedHostSchema.WORKLOAD_MIGRATION_CONFIG.values():
+            if any(flat_field in system_profile for flat_field in config.get("flat_fields", ())):
+                return True
+
+            # Mirrors _remove_nested_field, which also drops a parent object left empty
+            *parents, field = config["nested_field"].split(".")
+            current = system_profile
+            for part in parents:
+                current = current.get(part) if isinstance(current, dict) else None
+            if isinstance(current, dict) and (field in current or (parents and not current)):
+                return True
+
+        return False
+
     @staticmethod
     def _migrate_and_remove_legacy_workloads_fields(data):
         """
@@ -441,16 +469,14 @@ class LimitedHostSchema(CanonicalFactsSchema):
 
     @post_load
     def filter_system_profile_keys(self, data, **kwargs):
-        return self._normalize_system_profile(self.system_profile_normalizer.filter_keys, data)
+        # The loaded system profile is made of the copy coerce_system_profile_types took, so it can be
+        # filtered in place
+        return self._normalize_system_profile(self.system_profile_normalizer.filter_keys, data, copy=False)
 
     @validates("system_profile")
     def system_profile_is_valid(self, system_profile, data_key):  # noqa: ARG002, required for marshmallow validator functions
-        _p = _get_schemas_package()
-
         try:
-            _p.jsonschema_validate(
-                system_profile, self.system_profile_normalizer.schema, format_checker=Draft4Validator.FORMAT_CHECKER
-            )
+            self.system_profile_normalizer.validate(system_profile)
         except JsonSchemaValidationError as error:
             raise MarshmallowValidationError(f"System profile does not conform to schema.\n{error}") from error
 
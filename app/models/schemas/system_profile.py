@@ -57,6 +57,6 @@ class NetworkInterfaceSchema(MarshmallowSchema):
     type = fields.Str(validate=marshmallow_validate.Length(max=18))
 
 
-_normalizer = SystemProfileNormalizer()
+_normalizer = SystemProfileNormalizer.for_spec()
 HostStaticSystemProfileSchema = _normalizer.create_static_schema()
 HostDynamicSystemProfileSchema = _normalizer.create_dynamic_schema()
@@ -1,11 +1,15 @@
+import threading
 from collections import namedtuple
 from datetime import UTC
 from enum import Enum
+from functools import cached_property
 from os.path import join
 from typing import Any
 
 from connexion.utils import coerce_type
 from jsonschema import RefResolver
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 from marshmallow import EXCLUDE
 from marshmallow import Schema as MarshmallowSchema
 from marshmallow import fields
@@ -13,15 +17,26 @@ from marshmallow import fields as marshmallow_fields
 from marshmallow import validate as marshmallow_validate
 from yaml import safe_load
 
+from app.logging import get_logger
 from app.models.constants import SPECIFICATION_DIR
 from app.models.constants import SYSTEM_PROFILE_SPECIFICATION_FILE
+from app.models.schema_compiler import SchemaNotCompilable
+from app.models.schema_compiler import compile_schema
 from app.validators import verify_uuid_format
 
+logger = get_logger(__name__)
+
 # Lazy: importing app.models.schemas.system_profile at import time can deadlock with this module
 # (see HostStatic/HostDynamic schema build at the end of that module).
 _system_profile_schemas: Any = None
 _nested_array_ref_name_to_class: dict[str, Any] | None = None
 
+# Normalizers shared by the whole process, keyed by the id of the spec they were built from (the file name for
+# the bundled spec). The spec is kept in the entry so that its id can't be reused by another object.
+_normalizers_by_spec: dict[int | str, tuple[dict | None, "SystemProfileNormalizer"]] = {}
+_normalizers_lock = threading.Lock()
+MAX_CACHED_NORMALIZERS = 8
+
 
 def _get_system_profile_schemas_module() -> Any:
     global _system_profile_schemas
@@ -74,12 +89,54 @@ class SystemProfileNormalizer:
 
         self.schema = {**system_profile_spec, "$ref": "#/$defs/SystemProfile"}
         self._resolver = RefResolver.from_schema(system_profile_spec)
+        self._schema_objects: dict[int, tuple[dict, SystemProfileNormalizer.Schema]] = {}
+
+    @classmethod
+    def for_spec(cls, system_profile_schema=None):
+        """
+        Return the process-wide normalizer for a system profile spec, building it on first use.
+
+        Without a spec, this is the normalizer for the bundled system_profile.spec.yaml.
+        """
+        key = id(system_profile_schema) if system_profile_schema else SYSTEM_PROFILE_SPECIFICATION_FILE
+        with _normalizers_lock:
+            entry = _normalizers_by_spec.get(key)
+            if entry is None or entry[0] is not system_profile_schema:
+                if len(_normalizers_by_spec) >= MAX_CACHED_NORMALIZERS:
+                    del _normalizers_by_spec[next(iter(_normalizers_by_spec))]
+                entry = (system_profile_schema, cls(system_profile_schema=system_profile_schema))
+                _normalizers_by_spec[key] = entry
+            return entry[1]
+
+    @cached_property
+    def validator(self):
+        # Checking the schema, building the validator and resolving its $refs happen once, not per payload
+        validator_class = validator_for(self.schema)
+        validator_class.check_schema(self.schema)
+        return validator_class(self.schema, format_checker=validator_class.FORMAT_CHECKER)
+
+    @cached_property
+    def _is_valid(self):
+        try:
+            return compile_schema(self.validator)
+        except SchemaNotCompilable as error:
+            logger.info(f"System profile schema is validated without compiling it: {error}")
+            return self.validator.is_valid
+
+    def validate(self, payload):
+        """Validate a system profile like jsonschema.validate does, raising the same best-match error."""
+        # Valid payloads only go through the compiled checks; the validator reports the errors of the rest
+        if self._is_valid(payload):
+            return
+        error = best_match(self.validator.iter_errors(payload))
+        if error is not None:
+            raise error
 
     def filter_keys(self, payload, schema_dict=None):
         if schema_dict is None:
             schema_dict = self._system_profile_definition()
 
-        schema_obj = self.Schema.from_dict(schema_dict, self._resolver)
+        schema_obj = self._schema_object(schema_dict)
         if schema_obj.schema_type == self.Schema.Types.object:
             self._object_filter(schema_obj, payload)
         elif schema_obj.schema_type == self.Schema.Types.array:
@@ -90,6 +147,14 @@ class SystemProfileNormalizer:
             schema_dict = self._system_profile_definition()
         coerce_type(schema_dict, payload, self.SOME_ARBITRARY_STRING)
 
+    def _schema_object(self, schema_dict):
+        # The schema dicts belong to the spec, so resolving each one ($ref included) once is enough
+        entry = self._schema_objects.get(id(schema_dict))
+        if entry is None or entry[0] is not schema_dict:
+            entry = (schema_dict, self.Schema.from_dict(schema_dict, self._resolver))
+            self._schema_objects[id(schema_dict)] = entry
+        return entry[1]
+
     def _system_profile_definition(self):
         return self.schema["$defs"]["SystemProfile"]
 
@@ -105,6 +170,9 @@ class SystemProfileNormalizer:
     def _array_filter(self, schema, payload):
         if not schema.items or type(payload) is not list:
             return
+        # Only objects have keys to filter, so arrays of scalars (installed_packages) aren't walked
+        if self._schema_object(schema.items).schema_type is None:
+            return
 
         for value in payload:
             self.filter_keys(value, schema.items)
@@ -12,9 +12,16 @@ logger = get_logger(__name__)
 PRIMARY_KEY_FIELDS = ["org_id", "host_id"]
 
 # Use x-dynamic markers from YAML schema to determine field categorization
-_normalizer = SystemProfileNormalizer()
+_normalizer = SystemProfileNormalizer.for_spec()
 STATIC_FIELDS = list(_normalizer.get_static_fields())
 DYNAMIC_FIELDS = list(_normalizer.get_dynamic_fields())
+_STATIC_FIELD_SET = frozenset(STATIC_FIELDS)
+_DYNAMIC_FIELD_SET = frozenset(DYNAMIC_FIELDS)
+
+# Loading doesn't keep any state in the schema, and building them (and their nested schemas) for every
+# host costs more than loading a typical system profile
+_static_schema = HostStaticSystemProfileSchema()
+_dynamic_schema = HostDynamicSystemProfileSchema()
 
 
 def split_system_profile_data(system_profile_data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
@@ -36,9 +43,9 @@ def split_system_profile_data(system_profile_data: dict[str, Any]) -> tuple[dict
     for key, value in system_profile_data.items():
         if value is None:
             pass
-        elif key in STATIC_FIELDS:
+        elif key in _STATIC_FIELD_SET:
             static_data[key] = value
-        elif key in DYNAMIC_FIELDS:
+        elif key in _DYNAMIC_FIELD_SET:
             dynamic_data[key] = value
         # Workaround until we transition workloads fields usage
         elif key in WORKLOADS_FIELDS or "sap" in key:
@@ -54,18 +61,11 @@ def map_system_profile_fields(
 ) -> tuple[dict[str, Any], dict[str, Any]]:
     static_data, dynamic_data = system_profile_data
 
+    # Only the fields of each table, without walking every field the tables have
     mapped_data_static = {"org_id": org_id, "host_id": host_id}
+    mapped_data_static.update((field, value) for field, value in static_data.items() if field in _STATIC_FIELD_SET)
     mapped_data_dynamic = {"org_id": org_id, "host_id": host_id}
-
-    # Add all static fields
-    for field in STATIC_FIELDS:
-        if field in static_data:
-            mapped_data_static[field] = static_data[field]
-
-    # Add all dynamic fields
-    for field in DYNAMIC_FIELDS:
-        if field in dynamic_data:
-            mapped_data_dynamic[field] = dynamic_data[field]
+    mapped_data_dynamic.update((field, value) for field, value in dynamic_data.items() if field in _DYNAMIC_FIELD_SET)
 
     return mapped_data_static, mapped_data_dynamic
 
@@ -93,12 +93,8 @@ def validate_and_transform(
     # Map to table schemas
     static_mapped, dynamic_mapped = map_system_profile_fields(org_id, host_id, (static_data, dynamic_data))
 
-    # Validate using schemas
-    static_schema = HostStaticSystemProfileSchema()
-    dynamic_schema = HostDynamicSystemProfileSchema()
-
     # This will raise ValidationError if data is invalid
-    validated_static = static_schema.load(static_mapped)
-    validated_dynamic = dynamic_schema.load(dynamic_mapped)
+    validated_static = _static_schema.load(static_mapped)
+    validated_dynamic = _dynamic_schema.load(dynamic_mapped)
 
     return validated_static, validated_dynamic
@@ -15,12 +15,38 @@ def _encode_headers(headers):
     return [(hk, (hv or "").encode("utf-8")) for hk, hv in headers.items()]
 
 
+class DeliveryReport:
+    """Tracks the delivery of events produced without waiting, keyed by the event key."""
+
+    def __init__(self):
+        self.pending: set[str] = set()
+        self.failed: set[str] = set()
+
+    def track(self, key: str):
+        self.pending.add(key)
+
+    def resolve(self, key: str, error):
+        self.pending.discard(key)
+        if error:
+            self.failed.add(key)
+
+
 class MessageDetails:
-    def __init__(self, topic: str, event: str, headers: list[tuple], key: str):
+    def __init__(
+        self,
+        topic: str,
+        event: str,
+        headers: list[tuple],
+        key: str,
+        delivery_report: DeliveryReport | None = None,
+        report_key: str | None = None,
+    ):
         self.event = event
         self.headers = headers
         self.key = key
         self.topic = topic
+        self.delivery_report = delivery_report
+        self.report_key = report_key
 
     def on_delivered(self, error, message):
         message_to_send = None
@@ -33,6 +59,9 @@ class MessageDetails:
             produced_message_size.observe(len(str(message).encode("utf-8")))
             message_produced(logger, message, self.headers)
 
+        if self.delivery_report is not None:
+            self.delivery_report.resolve(self.report_key, error)
+
 
 class NullEventProducer:
     # ruff: noqa: ARG002
@@ -42,7 +71,7 @@ class NullEventProducer:
         logger.info("Starting NullEventProducer() - Kafka operations disabled in replica cluster")
         self.mq_topic = topic
 
-    def write_event(self, event, key, headers, *, wait=False):
+    def write_event(self, event, key, headers, *, wait=False, delivery_report=None):
         logger.debug(
             "NullEventProducer: Skipping event production in replica cluster. Topic: %s, key: %s", self.mq_topic, key
         )
@@ -50,6 +79,9 @@ class NullEventProducer:
     def flush(self):
         pass
 
+    def flush_delivery_report(self, delivery_report, timeout):
+        return set()
+
     def close(self):
         logger.debug("NullEventProducer: Closing (no-op)")
 
@@ -60,7 +92,7 @@ class EventProducer:
         self._kafka_producer = KafkaProducer({"bootstrap.servers": config.bootstrap_servers, **config.kafka_producer})
         self.mq_topic = topic
 
-    def write_event(self, event, key, headers, *, wait=False):
+    def write_event(self, event, key, headers, *, wait=False, delivery_report=None):
         logger.debug("Topic: %s, key: %s, event: %s, headers: %s", self.mq_topic, key, event, headers)
 
         k = key.encode("utf-8") if key else None
@@ -69,7 +101,9 @@ class EventProducer:
         topic = self.mq_topic
 
         try:
-            messageDetails = MessageDetails(topic, v, h, k)
+            messageDetails = MessageDetails(topic, v, h, k, delivery_report, key)
+            if delivery_report is not None:
+                delivery_report.track(key)
 
             self._kafka_producer.produce(topic, v, k, callback=messageDetails.on_delivered, headers=h)
             if wait:
@@ -87,6 +121,17 @@ class EventProducer:
     def flush(self):
         self._kafka_producer.flush()
 
+    def flush_delivery_report(self, delivery_report, timeout):
+        """
+        Flush once for a whole batch of events written with the given DeliveryReport.
+        Returns the keys of the events that failed or were still undelivered when the timeout ran out.
+        """
+        remaining = self._kafka_producer.flush(timeout)
+        undelivered = set(delivery_report.failed)
+        if remaining:
+            undelivered |= delivery_report.pending
+        return undelivered
+
     def close(self):
         self._kafka_producer.flush()
 
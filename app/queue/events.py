@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
+from collections.abc import Callable
 from datetime import UTC
 from datetime import datetime
 from enum import Enum
 
 from marshmallow import Schema
 from marshmallow import fields
+from marshmallow import utils as marshmallow_utils
 from sqlalchemy.orm.exc import DetachedInstanceError
 
 from app.logging import threadctx
@@ -86,6 +89,75 @@ class HostDeleteEvent(Schema):
     metadata = fields.Nested(HostEventMetadataSchema())
 
 
+# Encoding
+#
+# The events are built from hosts serialize_host already converted to JSON types, so dumping them with the
+# schemas above only walks and validates that data again. Instead, each event schema is compiled once into
+# plain converters for its dump fields, which build the same dict as Schema.dump. The dict is rendered by
+# the json module, like Schema.dumps does, so the events are byte for byte the same.
+
+_MISSING = object()
+
+
+def _text(value):
+    return value if value is None or type(value) is str else marshmallow_utils.ensure_text_type(value)
+
+
+def _optional(convert: Callable) -> Callable:
+    return lambda value: None if value is None else convert(value)
+
+
+def _field_encoder(field: fields.Field) -> Callable:
+    if isinstance(field, fields.Nested):
+        if field.many:
+            raise TypeError(f"Nested event field {field.name} with many=True isn't supported.")
+        return _optional(_schema_encoder(field.schema))
+    if isinstance(field, fields.List):
+        encode_item = _field_encoder(field.inner)
+        return _optional(lambda value: [encode_item(item) for item in value])
+    if isinstance(field, fields.Dict):
+        if field.key_field or field.value_field:
+            raise TypeError(f"Dict event field {field.name} with keys or values fields isn't supported.")
+        return _optional(dict)
+    if isinstance(field, fields.UUID):
+        return _optional(str)
+    if isinstance(field, fields.String):
+        return _text
+    if isinstance(field, fields.DateTime):
+        data_format = field.format or field.DEFAULT_FORMAT
+        format_func = field.SERIALIZATION_FUNCS.get(data_format)
+        return _optional(format_func or (lambda value: value.strftime(data_format)))
+    if type(field) in (fields.Boolean, fields.Raw):
+        return lambda value: value
+    raise TypeError(f"Event field {field.name} of type {type(field).__name__} isn't supported.")
+
+
+def _schema_encoder(schema: Schema) -> Callable[[object], dict]:
+    encoders = tuple(
+        (name, field.data_key or name, _field_encoder(field)) for name, field in schema.dump_fields.items()
+    )
+
+    def encode(obj):
+        if isinstance(obj, dict):
+            get = obj.get
+        else:
+
+            def get(name, default):
+                return getattr(obj, name, default)
+
+        encoded = {}
+        for name, key, encode_value in encoders:
+            value = get(name, _MISSING)
+            if value is not _MISSING:
+                encoded[key] = encode_value(value)
+        return encoded
+
+    return encode
+
+
+EVENT_ENCODERS = {schema: _schema_encoder(schema()) for schema in (HostCreateUpdateEvent, HostDeleteEvent)}
+
+
 def extract_system_profile_fields_for_headers(host: Host) -> tuple[str | None, str | None, str]:
     """
     Extract system profile fields for event headers from host.
@@ -176,8 +248,7 @@ def build_event(event_type, host, **kwargs):
     with event_serialization_time.labels(event_type.name).time():
         build = EVENT_TYPE_MAP[event_type]
         schema, event = build(event_type, host, **kwargs)
-        result = schema().dumps(event)
-        return result
+        return json.dumps(EVENT_ENCODERS[schema](event))
 
 
 def operation_results_to_event_type(results) -> EventType:
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
 from http import HTTPStatus
+from itertools import chain
 from uuid import UUID
 
 from requests import Response
@@ -19,12 +23,15 @@ from app.exceptions import InventoryException
 from app.logging import get_logger
 from lib import metrics
 from lib.middleware import resolve_permission
-from utils.json_to_csv import json_arr_to_csv
+from utils.json_to_csv import iter_json_to_csv
 
 logger = get_logger(__name__)
 
 HEADER_CONTENT_TYPE = {"json": "application/json; charset=utf-8", "csv": "text/csv; charset=utf-8"}
 
+# Size of the chunks sent with chunked transfer encoding when uploading an export
+EXPORT_UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def extract_export_svc_data(export_svc_data: dict) -> tuple[str, UUID, str, str, str]:
     exportFormat = export_svc_data["data"]["resource_request"]["format"]
@@ -53,8 +60,8 @@ def build_headers(
     return rbac_request_headers, request_headers
 
 
-def get_host_list(identity: Identity, rbac_filter: dict | None, inventory_config: Config) -> list[dict]:
-    host_data = list(
+def get_host_list(identity: Identity, rbac_filter: dict | None, inventory_config: Config) -> Iterator[dict]:
+    return iter(
         get_hosts_to_export(
             identity,
             rbac_filter=rbac_filter,
@@ -62,8 +69,6 @@ def get_host_list(identity: Identity, rbac_filter: dict | None, inventory_config
         )
     )
 
-    return host_data
-
 
 @metrics.create_export_processing_time.time()
 def create_export(
@@ -94,6 +99,7 @@ def create_export(
     export_service_endpoint = inventory_config.export_service_endpoint
 
     export_created = False
+    host_data = None
     session = Session()
 
     if not allowed:
@@ -124,16 +130,24 @@ def create_export(
 
         logger.info(f"Trying to get data for org_id: {identity.org_id}")
 
-        if host_data:
+        # Peek at the first host to know whether there is anything to upload
+        first_host = next(host_data, None)
+        if first_host is not None:
+            exported_count = 0
+
+            def _count_exported(hosts: Iterable[dict]) -> Iterator[dict]:
+                nonlocal exported_count
+                for host in hosts:
+                    exported_count += 1
+                    yield host
+
             logger.debug(f"Trying to upload data using URL:{request_url}")
-            logger.info(
-                f"{len(host_data)} hosts will be exported (format: {exportFormat}) for org_id {identity.org_id}"
-            )
             response = session.post(
                 url=request_url,
                 headers=request_headers,
-                data=_format_export_data(host_data, exportFormat).encode("utf-8"),
+                data=_export_upload_body(_count_exported(chain([first_host], host_data)), exportFormat),
             )
+            logger.info(f"{exported_count} hosts exported (format: {exportFormat}) for org_id {identity.org_id}")
             _handle_export_response(response, exportUUID, exportFormat)
             export_created = True
         else:
@@ -155,6 +169,9 @@ def create_export(
         _handle_export_error(str(e), 500, request_url, session, request_headers, exportUUID, exportFormat)
         export_created = False
     finally:
+        # Release the DB cursor even if the upload stopped before the whole export was read
+        if isinstance(host_data, Generator):
+            host_data.close()
         session.close()
 
     return export_created
@@ -192,9 +209,47 @@ def _handle_export_response(response: Response, exportUUID: UUID, exportFormat:
         logger.info(f"{response.text} for export ID {str(exportUUID)} in {exportFormat.upper()} format")
 
 
-def _format_export_data(data: list[dict], exportFormat: str) -> str:
+def _iter_json_array(data: Iterable[dict]) -> Iterator[str]:
+    # Produces the same text as json.dumps(list(data)), one host at a time
+    separator = "["
+    for host in data:
+        yield separator
+        yield json.dumps(host)
+        separator = ", "
+    yield "[]" if separator == "[" else "]"
+
+
+def _iter_export_data(data: Iterable[dict], exportFormat: str) -> Iterator[str]:
     if exportFormat == "json":
-        return json.dumps(data)
+        return _iter_json_array(data)
     elif exportFormat == "csv":
-        return json_arr_to_csv(data)
+        return iter_json_to_csv(data)
     raise ValueError(f"Unsupported export format: {exportFormat}")
+
+
+def _encode_in_chunks(parts: Iterable[str], chunk_size: int) -> Iterator[bytes]:
+    buffer = []
+    buffered_size = 0
+    for part in parts:
+        encoded = part.encode("utf-8")
+        buffer.append(encoded)
+        buffered_size += len(encoded)
+        if buffered_size >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered_size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _export_upload_body(data: Iterable[dict], exportFormat: str) -> Iterator[bytes]:
+    """
+    Serialize the hosts incrementally into UTF-8 encoded chunks.
+    Used as a generator request body, so the export is uploaded with chunked transfer encoding
+    and only about one DB batch of hosts is held in memory at a time.
+    """
+    return _encode_in_chunks(_iter_export_data(data, exportFormat), EXPORT_UPLOAD_CHUNK_SIZE)
+
+
+def _format_export_data(data: Iterable[dict], exportFormat: str) -> str:
+    return "".join(_iter_export_data(data, exportFormat))
@@ -5,6 +5,7 @@ import json
 import sys
 import time
 import uuid
+from collections import defaultdict
 from collections.abc import Callable
 from contextlib import suppress
 from copy import deepcopy
@@ -63,6 +64,7 @@ from app.payload_tracker import PayloadTrackerProcessingContext
 from app.payload_tracker import get_payload_tracker
 from app.queue import metrics
 from app.queue.enums import ConsumerApplication
+from app.queue.event_producer import DeliveryReport
 from app.queue.event_producer import EventProducer
 from app.queue.events import HOST_EVENT_TYPE_CREATED
 from app.queue.events import EventType
@@ -73,6 +75,7 @@ from app.queue.events import operation_results_to_event_type
 from app.queue.mq_common import common_message_parser
 from app.queue.notifications import NotificationType
 from app.queue.notifications import send_notification
+from app.serialization import deserialize_canonical_facts
 from app.serialization import deserialize_host
 from app.serialization import remove_null_canonical_facts
 from app.serialization import serialize_host
@@ -88,7 +91,12 @@ from lib.db import session_guard
 from lib.feature_flags import FLAG_INVENTORY_REJECT_RHSM_PAYLOADS
 from lib.feature_flags import get_flag_value
 from lib.group_repository import UngroupedGroupCache
+from lib.host_count_cache import host_count_cache
+from lib.host_repository import CanonicalFactsIndex
+from lib.host_repository import NewHostBulkInsert
+from lib.host_repository import get_existing_host_ids
 from lib.host_repository import host_exists
+from lib.kessel import invalidate_kessel_decisions
 from utils.system_profile_log import extract_host_dict_sp_to_log
 
 logger = get_logger(__name__)
@@ -232,6 +240,9 @@ class HBIMessageConsumerBase:
         """
         raise NotImplementedError("Not implemented in the HBIMessageConsumerBase class")
 
+    def pre_process_batch(self, messages: list) -> None:
+        pass  # No action is taken by default
+
     def post_process_rows(self) -> None:
         pass  # No action is taken by default
 
@@ -302,7 +313,10 @@ class HBIMessageConsumerBase:
                 db.session.no_autoflush,
                 StalenessCache(),
                 UngroupedGroupCache(),
+                CanonicalFactsIndex(),
+                NewHostBulkInsert(),
             ):
+                self.pre_process_batch(valid_messages)
                 for msg in valid_messages:
                     self._process_single_message(msg)
 
@@ -364,6 +378,7 @@ class WorkspaceMessageConsumer(HBIMessageConsumerBase):
         identity = create_mock_identity_with_org_id(org_id)
         identity.account_number = validated_operation_msg["account_number"]
         logger.info(f"Received {operation} message for workspace ID {workspace['id']}")
+        invalidate_kessel_decisions(org_id)
 
         if operation == "create":
             try:
@@ -502,6 +517,25 @@ class HostMessageConsumer(HBIMessageConsumerBase):
 
 
 class IngressMessageConsumer(HostMessageConsumer):
+    def pre_process_batch(self, messages: list) -> None:
+        """
+        Resolve the deduplication candidates of the whole batch with one DB query per org,
+        and the ungrouped groups of all orgs in the batch at once.
+        """
+        canonical_facts_by_org: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        account_by_org: dict[str, str | None] = {}
+        for msg in messages:
+            # Messages that can't be parsed here are skipped; handle_message reports the errors
+            with suppress(KeyError, ValueError, TypeError, AttributeError):
+                host_data = json.loads(msg.value())["data"]
+                if org_id := host_data.get("org_id"):
+                    account_by_org.setdefault(org_id, host_data.get("account"))
+                    canonical_facts_by_org[org_id].append(deserialize_canonical_facts(host_data, all=True))
+
+        if canonical_facts_by_org:
+            host_repository.prefetch_hosts_by_canonical_facts(canonical_facts_by_org)
+            group_repository.prefetch_ungrouped_groups(account_by_org)
+
     def process_message(
         self,
         host_data: dict[str, Any],
@@ -998,31 +1032,78 @@ def parse_operation_message(
         return parsed_operation
 
 
-def sync_event_message(message, session, event_producer):
-    if message["type"] != EventType.delete.name:
-        host_id = message["host"]["id"]
-        query = session.query(Host).filter((Host.org_id == message["host"]["org_id"]) & (Host.id == UUID(host_id)))
-        # If the host doesn't exist in the DB, produce a Delete event.
-        if not query.count():
-            host = deserialize_host({k: v for k, v in message["host"].items() if v}, schema=LimitedHostSchema)
-            host.id = host_id
-            event = build_event(EventType.delete, host)
-            host_type, os_name, bootc_booted = extract_system_profile_fields_for_headers(host)
-            headers = message_headers(
-                EventType.delete,
-                str(host.insights_id),
-                message["host"].get("reporter"),
-                host_type,
-                os_name,
-                bootc_booted,
-            )
-            # add back "wait=True", if needed.
-            event_producer.write_event(event, host.id, headers, wait=True)
+def _sync_delete_event(message_host: dict[str, Any]) -> tuple[str, str, list[tuple]]:
+    """Build the delete event of a host found in the events topic but no longer in the DB."""
+    host = deserialize_host({k: v for k, v in message_host.items() if v}, schema=LimitedHostSchema)
+    host.id = message_host["id"]
+    event = build_event(EventType.delete, host)
+    host_type, os_name, bootc_booted = extract_system_profile_fields_for_headers(host)
+    headers = message_headers(
+        EventType.delete,
+        str(host.insights_id),
+        message_host.get("reporter"),
+        host_type,
+        os_name,
+        bootc_booted,
+    )
+    return event, host.id, headers
+
+
+def sync_event_messages(
+    messages: list[dict[str, Any]], session, event_producer: EventProducer, delivery_report: DeliveryReport
+) -> int:
+    """
+    Produce a delete event for every host of the messages that is no longer in the DB, checking all of them
+    with one query.
 
-    return
+    A host is only checked once per batch, by its last message; when that is a delete event, the topic already
+    has its tombstone. The events are written without waiting and tracked in delivery_report, so the caller
+    flushes once for the whole batch. Returns the number of delete events written.
+    """
+    last_messages = {}
+    for message in messages:
+        try:
+            if message["type"] == EventType.delete.name:
+                host_id = message["id"]
+            else:
+                host_id = message["host"]["id"]
+                # The host is looked up by its org_id, so without one it would always get a delete event
+                if not message["host"].get("org_id"):
+                    logger.error("Unable to process message without org_id", extra={"incoming_message": message})
+                    continue
+            last_messages[str(UUID(host_id))] = message
+        except (KeyError, TypeError, ValueError):
+            logger.exception("Unable to process message", extra={"incoming_message": message})
+
+    hosts_to_check = {
+        host_id: message["host"]
+        for host_id, message in last_messages.items()
+        if message["type"] != EventType.delete.name
+    }
+    existing_host_keys = host_repository.get_existing_host_keys(hosts_to_check, session)
 
+    written = 0
+    for host_id, message_host in hosts_to_check.items():
+        if (message_host["org_id"], host_id) in existing_host_keys:
+            continue
+        try:
+            event, key, headers = _sync_delete_event(message_host)
+        except Exception:
+            logger.exception("Unable to build the delete event", extra={"host_id": host_id})
+            continue
+        event_producer.write_event(event, key, headers, delivery_report=delivery_report)
+        written += 1
+
+    return written
 
-def write_delete_event_message(event_producer: EventProducer, result: OperationResult, initiated_by_frontend: bool):
+
+def write_delete_event_message(
+    event_producer: EventProducer,
+    result: OperationResult,
+    initiated_by_frontend: bool,
+    delivery_report: DeliveryReport | None = None,
+    cached_systems: list[tuple] | None = None,
+):
     event = build_event(
         EventType.delete,
         result.row,
@@ -1038,16 +1119,26 @@ def write_delete_event_message(event_producer: EventProducer, result: OperationR
         os_name,
         bootc_booted,
     )
-    event_producer.write_event(event, str(result.row.id), headers, wait=True)
+    if delivery_report is None:
+        event_producer.write_event(event, str(result.row.id), headers, wait=True)
+    else:
+        # The caller flushes once for the whole batch and checks the report.
+        event_producer.write_event(event, str(result.row.id), headers, delivery_report=delivery_report)
     insights_id = serialize_uuid(result.row.insights_id)
     owner_id = serialize_uuid(result.row.static_system_profile.owner_id) if result.row.static_system_profile else None
-    if insights_id and owner_id:
+    if cached_systems is not None:
+        # The caller invalidates the cached systems of the whole batch at once.
+        cached_systems.append((insights_id, result.row.org_id, owner_id))
+    elif insights_id and owner_id:
         delete_cached_system_keys(insights_id=insights_id, org_id=result.row.org_id, owner_id=owner_id, spawn=True)
     result.success_logger()
 
 
 def write_add_update_event_message(
-    event_producer: EventProducer, notification_event_producer: EventProducer, result: OperationResult
+    event_producer: EventProducer,
+    notification_event_producer: EventProducer,
+    result: OperationResult,
+    existing_host_ids: set[str] | None = None,
 ):
     if result.event_type is None or result.platform_metadata is None:
         # This should never happen, but OperationResult allows None values for these fields.
@@ -1079,7 +1170,12 @@ def write_add_update_event_message(
             bootc_booted,
         )
 
-        if not host_exists(result.row.id, org_id=result.row.org_id, session=db.session):
+        if existing_host_ids is not None:
+            host_still_exists = str(result.row.id) in existing_host_ids
+        else:
+            host_still_exists = host_exists(result.row.id, org_id=result.row.org_id, session=db.session)
+
+        if not host_still_exists:
             logger.warning(f"Skipping event for host {result.row.id}: host no longer exists")
             tracker_ctx._success_status_msg = "skipped – host deleted before event production"
             return
@@ -1117,15 +1213,23 @@ def write_message_batch(
     notification_event_producer: EventProducer,
     processed_rows: list[OperationResult],
 ):
+    # Check which hosts still exist with a single query, instead of one query per produced event
+    existing_host_ids = get_existing_host_ids(
+        (result.row.org_id, result.row.id) for result in processed_rows if result is not None
+    )
+
     for result in processed_rows:
         if result is not None:
             try:
-                write_add_update_event_message(event_producer, notification_event_producer, result)
+                write_add_update_event_message(
+                    event_producer, notification_event_producer, result, existing_host_ids=existing_host_ids
+                )
             except Exception as exc:
                 metrics.ingress_message_handler_failure.inc()
                 logger.exception("Error while producing message", exc_info=exc)
 
     event_producer.flush()
+    host_count_cache.invalidate_orgs({result.row.org_id for result in processed_rows if result is not None})
 
 
 def initialize_thread_local_storage(
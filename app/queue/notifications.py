@@ -259,7 +259,7 @@ def populate_events(base_notification_obj, host_list, extra_fields=None):
     return base_notification_obj
 
 
-def send_notification(notification_event_producer, notification_type, host, **kwargs):
+def send_notification(notification_event_producer, notification_type, host, wait=True, **kwargs):
     notification = build_notification(notification_type, host, **kwargs)
     headers = notification_headers(notification_type)
 
@@ -268,7 +268,7 @@ def send_notification(notification_event_producer, notification_type, host, **kw
         if headers[key] is None:
             del headers[key]
 
-    notification_event_producer.write_event(notification, None, headers, wait=True)
+    notification_event_producer.write_event(notification, None, headers, wait=wait)
 
 
 NOTIFICATION_TYPE_MAP = {
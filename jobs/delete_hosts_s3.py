@@ -5,6 +5,10 @@ import os
 import sys
 from functools import partial
 from logging import Logger
+from queue import Full
+from queue import Queue
+from threading import Event
+from threading import Thread
 
 import boto3
 from botocore.config import Config as BotoConfig
@@ -21,12 +25,19 @@ from jobs.common import excepthook
 from jobs.common import job_setup
 from lib.db import session_guard
 from lib.host_delete import delete_hosts
+from lib.job_checkpoint import clear_checkpoint
+from lib.job_checkpoint import load_checkpoint
+from lib.job_checkpoint import save_checkpoint
 
 PROMETHEUS_JOB = "inventory-delete-hosts-s3"
 LOGGER_NAME = "delete_hosts_s3"
 RUNTIME_ENVIRONMENT = RuntimeEnvironment.JOB
 S3_OBJECT_KEY = "host_ids.csv"
 BATCH_SIZE = int(os.getenv("DELETE_HOSTS_S3_BATCH_SIZE", 500))
+# Batches read ahead of the deletes; bounds the memory used to QUEUE_SIZE * BATCH_SIZE IDs
+QUEUE_SIZE = int(os.getenv("DELETE_HOSTS_S3_QUEUE_SIZE", 4))
+CHECKPOINT_NAME = f"delete_hosts_s3:{S3_OBJECT_KEY}"
+READ_DONE = object()
 SUSPEND_JOB = os.environ.get("SUSPEND_JOB", "true").lower() == "true"
 
 
@@ -99,6 +110,56 @@ def process_batch(
             )
 
 
+def _put(batches: Queue, item, stop: Event):
+    # Block while the queue is full, unless the consumer has stopped taking batches
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=1)
+            return
+        except Full:
+            continue
+
+
+def read_batches(reader, start_row: int, batches: Queue, stop: Event):
+    """
+    Read the Subscription Manager IDs from the CSV reader into batches of BATCH_SIZE and put them in the queue,
+    each with the number of the last row it contains. The rows up to start_row were processed by a previous run
+    and are skipped. The queue ends with READ_DONE, or with the exception that stopped the reading.
+    """
+    try:
+        batch = []
+        row_number = 0
+        for row_number, row in enumerate(reader, start=1):
+            if row_number <= start_row or not row:
+                continue
+            batch.append(row[0])
+            if len(batch) == BATCH_SIZE:
+                _put(batches, (batch, row_number), stop)
+                batch = []
+
+        # If the reader ran out of rows, send that final batch
+        if batch:
+            _put(batches, (batch, row_number), stop)
+        _put(batches, READ_DONE, stop)
+    except Exception as e:
+        _put(batches, e, stop)
+
+
+def _load_start_row(config: Config, logger: Logger, session: Session, etag: str | None) -> int:
+    if config.dry_run:
+        return 0
+
+    checkpoint = load_checkpoint(session, CHECKPOINT_NAME)
+    if not checkpoint:
+        return 0
+    if checkpoint["etag"] != etag:
+        logger.info("Ignoring the checkpoint of a previous run, the CSV file has changed since.")
+        return 0
+
+    logger.info(f"Resuming after row {checkpoint['row']} of the CSV file.")
+    return checkpoint["row"]
+
+
 def run(
     config: Config,
     logger: Logger,
@@ -110,11 +171,16 @@ def run(
     """
     Runs the host deletion job using Subscription Manager IDs from a CSV file in an S3 bucket.
 
-    This function reads Subscription Manager IDs from a CSV file stored in S3, processes them in batches,
+    This function streams Subscription Manager IDs from a CSV file stored in S3, processes them in batches,
     and deletes hosts with only one reporter from the database unless in dry-run mode.
     It logs the results of the deletion process, including counts of deleted, not deleted,
     and not found hosts.
 
+    The file is read in a separate thread, which hands the batches over through a queue of at most
+    QUEUE_SIZE batches, so the memory used doesn't depend on the size of the file. After each batch is
+    deleted, the number of its last row is saved as a checkpoint; a run that stops before the end of the
+    file leaves it behind, and the next run over the same file resumes after it.
+
     Args:
         config (Config): Application configuration object.
         logger (Logger): Logger for logging information.
@@ -122,19 +188,15 @@ def run(
         application (FlaskApp): The Flask application instance.
     """
     with application.app.app_context():
+        stop = Event()
         try:
             logger.info(f"Running host_delete_s3 with batch size {BATCH_SIZE}")
             s3_client = get_s3_client(config)
 
-            # Download the entire CSV file from S3 first
-            logger.info("Downloading CSV file from S3...")
+            logger.info("Streaming CSV file from S3...")
             s3_object = s3_client.get_object(Bucket=config.s3_bucket, Key=S3_OBJECT_KEY)
-            # Download the entire file content
-            csv_content = s3_object["Body"].read().decode("utf-8")
-            logger.info(f"Downloaded CSV file, size: {len(csv_content)} bytes")
-
-            # Create a file-like object from the downloaded content
-            csv_stream = io.StringIO(csv_content)
+            etag = s3_object.get("ETag")
+            csv_stream = io.TextIOWrapper(s3_object["Body"], encoding="utf-8", newline="")
             reader = csv.reader(csv_stream, delimiter="\t")
 
             # Skip the header row
@@ -144,21 +206,21 @@ def run(
                 logger.warning("CSV file is empty.")
                 return
 
-            batch = []
-            for row in reader:
-                if not row:
-                    continue
-                batch.append(row[0])
-                if len(batch) == BATCH_SIZE:
-                    # The batch is now full, so we should process the hosts in the batch.
-                    process_batch(batch, config, logger, session, event_producer, notification_event_producer)
+            start_row = _load_start_row(config, logger, session, etag)
+            batches: Queue = Queue(maxsize=QUEUE_SIZE)
+            Thread(target=read_batches, args=(reader, start_row, batches, stop), daemon=True).start()
 
-                    # Empty the batch and start again
-                    batch = []
+            while (item := batches.get()) is not READ_DONE:
+                if isinstance(item, Exception):
+                    raise item
 
-            # If the reader ran out of rows, process that final batch
-            if batch:
+                batch, last_row = item
                 process_batch(batch, config, logger, session, event_producer, notification_event_producer)
+                if not config.dry_run:
+                    save_checkpoint(session, CHECKPOINT_NAME, {"etag": etag, "row": last_row})
+
+            if not config.dry_run:
+                clear_checkpoint(session, CHECKPOINT_NAME)
 
             logger.info(f"Hosts that were not deleted because they had multiple reporters: {not_deleted_count}")
             logger.info(f"Hosts whose Subscription Manager IDs were not found in the DB: {not_found_count}")
@@ -172,6 +234,7 @@ def run(
         except Exception as e:
             logger.exception(e)
         finally:
+            stop.set()
             s3_client.close()
 
 
@@ -11,12 +11,14 @@ from sqlalchemy import ColumnElement
 from sqlalchemy import and_
 from sqlalchemy import or_
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Query
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import joinedload
 
 from app.auth.identity import Identity
 from app.auth.identity import create_mock_identity_with_org_id
 from app.auth.identity import to_auth_header
+from app.common import inventory_config
 from app.exceptions import ValidationException
 from app.instrumentation import log_host_stale_notification_succeeded
 from app.logging import get_logger
@@ -32,6 +34,8 @@ from jobs.common import excepthook
 from jobs.common import job_setup as stale_host_notification_job_setup
 from lib.host_repository import find_stale_host_sys_default_staleness
 from lib.host_repository import find_stale_hosts
+from lib.host_repository import find_stale_hosts_joined
+from lib.host_repository import staleness_job_query
 from lib.metrics import stale_host_notification_fail_count
 from lib.metrics import stale_host_notification_processing_time
 from lib.metrics import stale_host_notification_success_count
@@ -133,6 +137,18 @@ def _find_stale_hosts(
     return query_filters
 
 
+def _stale_hosts_query(
+    logger: Logger, session: Session, stale_host_timestamp: HostInventoryMetadata, job_start_time: datetime
+) -> Query:
+    if inventory_config().staleness_job_query_mode == "join":
+        logger.debug("Looking for stale hosts using the staleness table join")
+        last_run_secs = _last_run_time_diff_in_sec(stale_host_timestamp, job_start_time)
+        return staleness_job_query(session).filter(find_stale_hosts_joined(session, last_run_secs, job_start_time))
+
+    filter_stale_hosts = _find_stale_hosts(logger, session, stale_host_timestamp, job_start_time)
+    return session.query(Host).filter(or_(False, *filter_stale_hosts))
+
+
 @stale_host_notification_fail_count.count_exceptions()
 def run(
     logger: Logger,
@@ -143,10 +159,8 @@ def run(
 ):
     with application.app.app_context(), stale_host_notification_processing_time.time():
         stale_host_timestamp = _query_or_create_stale_host(session)
-        filter_stale_hosts = _find_stale_hosts(logger, session, stale_host_timestamp, job_start_time)
-
-        query = (
-            session.query(Host).options(joinedload(Host.static_system_profile)).filter(or_(False, *filter_stale_hosts))
+        query = _stale_hosts_query(logger, session, stale_host_timestamp, job_start_time).options(
+            joinedload(Host.static_system_profile)
         )
 
         stale_host_count = query.count()
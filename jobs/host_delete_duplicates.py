@@ -6,7 +6,12 @@ from __future__ import annotations
 
 import os
 import sys
+from collections import defaultdict
 from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from datetime import UTC
+from datetime import datetime
 from functools import partial
 from logging import Logger
 from typing import Any
@@ -15,6 +20,7 @@ from connexion import FlaskApp
 from flask_sqlalchemy.query import Query
 from sqlalchemy.orm import Session
 
+from app.config import COMPOUND_ID_FACTS
 from app.config import Config
 from app.environment import RuntimeEnvironment
 from app.logging import get_logger
@@ -26,6 +32,7 @@ from jobs.common import excepthook
 from jobs.common import job_setup
 from lib.handlers import ShutdownHandler
 from lib.host_delete import delete_hosts
+from lib.host_repository import _normalize_fact_value
 from lib.host_repository import contains_no_incorrect_facts_filter
 from lib.host_repository import extract_immutable_and_id_facts
 from lib.host_repository import matches_at_least_one_canonical_fact_filter
@@ -39,6 +46,17 @@ COLLECTED_METRICS = (delete_duplicate_host_count,)
 RUNTIME_ENVIRONMENT = RuntimeEnvironment.JOB
 SUSPEND_JOB = os.environ.get("SUSPEND_JOB", "true").lower() == "true"
 
+# The columns the in-memory search needs; the hosts themselves are only loaded for deletion
+HOST_FACT_COLUMNS = (
+    Host.id,
+    Host.last_check_in,
+    Host.provider_id,
+    Host.provider_type,
+    Host.subscription_manager_id,
+    Host.insights_id,
+)
+FACT_KEYS = tuple(column.key for column in HOST_FACT_COLUMNS[2:])
+
 
 def find_matching_hosts(canonical_facts: dict[str, Any], query: Query) -> list[Host]:
     immutable_facts, id_facts = extract_immutable_and_id_facts(canonical_facts)
@@ -158,6 +176,130 @@ def delete_duplicate_hosts_by_org_id(
     return deleted_per_org
 
 
+def stream_host_facts(org_id: str, session: Session, chunk_size: int) -> Iterator[Any]:
+    """Yield the ID facts of all hosts of the org, paged by host ID."""
+    query = session.query(*HOST_FACT_COLUMNS).filter(Host.org_id == org_id).order_by(Host.id)
+    page = query.limit(chunk_size).all()
+    while page:
+        yield from page
+        if len(page) < chunk_size:
+            return
+        page = query.filter(Host.id > page[-1].id).limit(chunk_size).all()
+
+
+def _survivor_sort_key(host: Any) -> tuple[bool, datetime]:
+    # Same as ORDER BY last_check_in DESC in find_hosts_by_multiple_facts, where NULLs come first
+    return host.last_check_in is None, host.last_check_in or datetime.min.replace(tzinfo=UTC)
+
+
+def find_duplicate_host_ids(hosts: Sequence[Any], chunk_size: int) -> Iterator[set[str]]:
+    """
+    Yield the IDs of the duplicates among the hosts of one org, one set per chunk of hosts with duplicates.
+
+    Replays delete_duplicate_hosts_by_org_id on facts loaded once, in the order of the hosts. Every host of a
+    chunk searches the hosts find_matching_hosts would find for it: the ones matching its immutable facts if
+    it has any, otherwise the ones matching its first ID fact. All of them but the one that checked in last
+    are duplicates. The facts are looked up in hash indexes built once, and the duplicates of a chunk are left
+    out of the following chunks and searches, as if they had been deleted in between.
+    """
+    facts = [
+        {key: value for key in FACT_KEYS if (value := _normalize_fact_value(key, getattr(host, key))) is not None}
+        for host in hosts
+    ]
+    indexes: dict[str, dict[str, list[int]]] = {key: defaultdict(list) for key in FACT_KEYS}
+    for index, host_facts in enumerate(facts):
+        for key, value in host_facts.items():
+            indexes[key][value].append(index)
+
+    deleted = [False] * len(hosts)
+    position = 0
+    while position < len(hosts):
+        chunk = []
+        while position < len(hosts) and len(chunk) < chunk_size:
+            if not deleted[position]:
+                chunk.append(position)
+            position += 1
+
+        duplicates: set[int] = set()
+        # Hosts searching by the same facts match the same hosts, so those are only searched once per chunk
+        searches: set[frozenset] = set()
+        for index in chunk:
+            immutable_facts, id_facts = extract_immutable_and_id_facts(facts[index])
+            if immutable_facts:
+                search_facts = immutable_facts
+            elif id_facts:
+                search_facts = dict([next(iter(id_facts.items()))])
+            else:
+                continue
+
+            search_key = frozenset(search_facts.items())
+            if search_key in searches:
+                continue
+            searches.add(search_key)
+
+            matching_hosts = {
+                candidate
+                for key, value in search_facts.items()
+                if key not in COMPOUND_ID_FACTS
+                for candidate in indexes[key].get(value, ())
+                if not deleted[candidate]
+                and all(facts[candidate].get(fact, expected) == expected for fact, expected in search_facts.items())
+            }
+            if len(matching_hosts) > 1:
+                survivor = max(matching_hosts, key=lambda candidate: _survivor_sort_key(hosts[candidate]))
+                duplicates.update(matching_hosts - {survivor})
+
+        if duplicates:
+            for index in duplicates:
+                deleted[index] = True
+            yield {hosts[index].id for index in duplicates}
+
+
+def delete_duplicate_hosts_by_org_id_in_memory(
+    org_id: str,
+    *,
+    session: Session,
+    chunk_size: int,
+    logger: Logger,
+    event_producer: EventProducer,
+    notifications_event_producer: EventProducer,
+    interrupt: Callable[[], bool] = lambda: False,
+    dry_run: bool = True,
+) -> int:
+    logger.info(f"Processing org: {org_id}")
+    hosts = list(stream_host_facts(org_id, session, chunk_size))
+    logger.info(f"Loaded the ID facts of {len(hosts)} hosts")
+
+    deleted_per_org = 0
+    for duplicate_host_ids in find_duplicate_host_ids(hosts, chunk_size):
+        if interrupt():
+            break
+        deleted_per_org += delete_batch(
+            duplicate_host_ids,
+            org_id=org_id,
+            session=session,
+            dry_run=dry_run,
+            logger=logger,
+            event_producer=event_producer,
+            notifications_event_producer=notifications_event_producer,
+            chunk_size=chunk_size,
+            interrupt=interrupt,
+        )
+
+    if dry_run:
+        logger.info(f"Found {deleted_per_org} duplicates in org: {org_id}")
+    else:
+        logger.info(f"Deleted {deleted_per_org} duplicates in org: {org_id}")
+
+    return deleted_per_org
+
+
+DELETE_DUPLICATE_HOSTS_BY_ORG_ID = {
+    "per_host": delete_duplicate_hosts_by_org_id,
+    "in_memory": delete_duplicate_hosts_by_org_id_in_memory,
+}
+
+
 def delete_duplicate_hosts(
     session: Session,
     chunk_size: int,
@@ -166,8 +308,10 @@ def delete_duplicate_hosts(
     notifications_event_producer: EventProducer,
     interrupt: Callable[[], bool] = lambda: False,
     dry_run: bool = True,
+    algorithm: str = "per_host",
 ) -> int:
     total_deleted = 0
+    delete_duplicate_hosts_by_org_id_using = DELETE_DUPLICATE_HOSTS_BY_ORG_ID[algorithm]
     org_ids_query = session.query(Host.org_id)
 
     logger.info(f"Total number of hosts in inventory: {session.query(Host).count()}")
@@ -176,7 +320,7 @@ def delete_duplicate_hosts(
     org_id_list = org_ids_query.distinct().order_by(Host.org_id).all()
     for org_id in org_id_list:
         actual_org_id = org_id[0]  # query.distinct() returns a tuple of all queried columns
-        total_deleted += delete_duplicate_hosts_by_org_id(
+        total_deleted += delete_duplicate_hosts_by_org_id_using(
             actual_org_id,
             session=session,
             chunk_size=chunk_size,
@@ -217,6 +361,7 @@ def run(
                 notifications_event_producer,
                 shutdown_handler.shut_down,
                 dry_run=config.dry_run,
+                algorithm=config.duplicate_hosts_algorithm,
             )
 
             if config.dry_run:
@@ -1,5 +1,7 @@
 #!/usr/bin/python3
 import sys
+from datetime import UTC
+from datetime import datetime
 from functools import partial
 
 from sqlalchemy import ColumnElement
@@ -19,8 +21,11 @@ from jobs.common import job_setup as host_reaper_job_setup
 from lib.feature_flags import FLAG_INVENTORY_API_READ_ONLY
 from lib.feature_flags import get_flag_value_and_fallback
 from lib.host_delete import delete_hosts
+from lib.host_repository import find_culled_hosts_joined
 from lib.host_repository import find_hosts_by_staleness_job
 from lib.host_repository import find_hosts_sys_default_staleness
+from lib.host_repository import refresh_group_host_counts
+from lib.host_repository import staleness_job_query
 from lib.metrics import delete_host_count
 from lib.metrics import delete_host_processing_time
 from lib.metrics import host_reaper_fail_count
@@ -73,14 +78,21 @@ def find_hosts_in_state(logger, session, state: list):
     return query_filters
 
 
+def find_hosts_to_delete(config, logger, session):
+    if config.staleness_job_query_mode == "join":
+        logger.debug("Looking for culled hosts using the staleness table join")
+        return staleness_job_query(session).filter(find_culled_hosts_joined(datetime.now(UTC)))
+
+    filter_hosts_to_delete = find_hosts_in_state(logger, session, ["culled"])
+    return session.query(Host).filter(
+        or_(False, *filter_hosts_to_delete),
+    )
+
+
 @host_reaper_fail_count.count_exceptions()
 def run(config, logger, session, event_producer, notification_event_producer, shutdown_handler, application):
     with application.app.app_context():
-        filter_hosts_to_delete = find_hosts_in_state(logger, session, ["culled"])
-
-        query = session.query(Host).filter(
-            or_(False, *filter_hosts_to_delete),
-        )
+        query = find_hosts_to_delete(config, logger, session)
 
         hosts_processed = config.host_delete_chunk_size
         deletions_remaining = query.count()
@@ -105,6 +117,11 @@ def run(config, logger, session, event_producer, notification_event_producer, sh
 
             deletions_remaining -= hosts_processed
 
+        if config.group_host_counts_table_enabled:
+            refreshed_count = refresh_group_host_counts(session)
+            session.commit()
+            logger.info(f"Refreshed the host counts of {refreshed_count} groups")
+
 
 if __name__ == "__main__":
     logger = get_logger(LOGGER_NAME)
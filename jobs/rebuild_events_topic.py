@@ -17,8 +17,9 @@ from app import create_app
 from app.environment import RuntimeEnvironment
 from app.logging import get_logger
 from app.logging import threadctx
+from app.queue.event_producer import DeliveryReport
 from app.queue.event_producer import EventProducer
-from app.queue.host_mq import sync_event_message
+from app.queue.host_mq import sync_event_messages
 from jobs.common import excepthook
 from lib.db import session_guard
 from lib.handlers import ShutdownHandler
@@ -30,6 +31,7 @@ from lib.handlers import register_shutdown
 __all__ = "main"
 
 LOGGER_NAME = "inventory_events_rebuilder"
+FLUSH_TIMEOUT = 300
 
 
 def _init_db(config):
@@ -62,25 +64,30 @@ def run(config, logger, session, consumer, event_producer, shutdown_handler):
             logger.info(f"Event topic rebuild halting after {config.rebuild_events_time_limit} seconds time.")
             exit(0)  # exit as intended
 
-        new_messages = consumer.consume(num_messages=config.script_chunk_size, timeout=10)
+        new_messages = consumer.consume(num_messages=config.rebuild_events_batch_size, timeout=10)
+        parsed_messages = []
+        for message in new_messages:
+            try:
+                parsed_messages.append(json.loads(message.value()))
+            except Exception:
+                logger.exception("Unable to process message", extra={"incoming_message": message.value()})
+
+        delivery_report = DeliveryReport()
         with session_guard(session):
-            for message in new_messages:
-                try:
-                    sync_event_message(json.loads(message.value()), session, event_producer)
-
-                except OperationalError as oe:
-                    """sqlalchemy.exc.OperationalError: This error occurs when an
-                    authentication failure occurs or the DB is not accessible.
-                    """
-                    logger.error(f"Could not access DB {str(oe)}")
-                    sys.exit(3)
-                except Exception:
-                    logger.exception("Unable to process message", extra={"incoming_message": message.value()})
-        try:
-            # pace the events production speed as flush completes sending all buffered records.
-            event_producer._kafka_producer.flush(300)
-        except ProduceError as e:
-            raise ProduceError("ProduceError: Failed to flush produced Kafka messages within 300 seconds") from e
+            try:
+                sync_event_messages(parsed_messages, session, event_producer, delivery_report)
+            except OperationalError as oe:
+                """sqlalchemy.exc.OperationalError: This error occurs when an
+                authentication failure occurs or the DB is not accessible.
+                """
+                logger.error(f"Could not access DB {str(oe)}")
+                sys.exit(3)
+
+        # pace the events production speed as flush completes sending all buffered records.
+        if undelivered := event_producer.flush_delivery_report(delivery_report, FLUSH_TIMEOUT):
+            raise ProduceError(
+                f"ProduceError: Failed to deliver {len(undelivered)} delete events within {FLUSH_TIMEOUT} seconds"
+            )
 
         num_messages = len(new_messages)
         total_messages_processed += num_messages
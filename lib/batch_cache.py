@@ -43,6 +43,15 @@ class ThreadLocalBatchCache:
         if cache is not None:
             cache.pop(key, None)
 
+    @classmethod
+    def values(cls):
+        cache = getattr(cls._local, cls._cache_attr(), None)
+        return list(cache.values()) if cache is not None else []
+
+    @classmethod
+    def is_active(cls):
+        return getattr(cls._local, cls._cache_attr(), None) is not None
+
     @classmethod
     def _create(cls):
         setattr(cls._local, cls._cache_attr(), {})
@@ -1,16 +1,23 @@
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from uuid import UUID
 
+from flask import current_app
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import event
+from sqlalchemy import func
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from api.cache import delete_cached_system_keys
+from api.cache import delete_cached_system_keys_batch
 from api.host_query import staleness_timestamps
 from api.staleness_query import get_staleness_obj
 from app.auth import get_current_identity
 from app.auth.identity import Identity
+from app.auth.identity import create_mock_identity_with_org_id
 from app.auth.identity import to_auth_header
 from app.common import inventory_config
 from app.exceptions import InventoryException
@@ -41,9 +48,10 @@ from app.staleness_serialization import AttrDict
 from lib.batch_cache import ThreadLocalBatchCache
 from lib.db import raw_db_connection
 from lib.db import session_guard
+from lib.host_repository import adjust_group_host_counts
+from lib.host_repository import get_existing_host_ids
 from lib.host_repository import get_host_counts_batch
 from lib.host_repository import get_host_list_by_id_list_from_db
-from lib.host_repository import host_exists
 from lib.host_repository import host_query
 from lib.metrics import delete_group_count
 from lib.metrics import delete_group_processing_time
@@ -55,11 +63,61 @@ from lib.middleware import rbac_create_ungrouped_hosts_workspace
 
 logger = get_logger(__name__)
 
+# Session.info key of the orgs whose ungrouped group was created in the session's current transaction
+UNCOMMITTED_UNGROUPED_ORG_IDS = "uncommitted_ungrouped_org_ids"
+
 
 class UngroupedGroupCache(ThreadLocalBatchCache):
     """Batch-scoped cache for ungrouped group lookups, keyed by org_id."""
 
 
+class SerializedUngroupedGroupCache:
+    """Process-wide cache of serialized ungrouped groups, keyed by org_id.
+
+    Unlike UngroupedGroupCache, entries outlive the batch: ungrouped group IDs almost never change.
+    Entries expire after ungrouped_group_cache_ttl seconds (0 disables the cache), and are dropped
+    when this process creates, updates or deletes an ungrouped group of the org. Callers get copies,
+    so the cached dicts are never mutated through a host's groups.
+    """
+
+    _lock = threading.Lock()
+    _entries: dict[str, tuple[float, dict]] = {}
+
+    @classmethod
+    def get(cls, org_id: str) -> dict | None:
+        with cls._lock:
+            entry = cls._entries.get(org_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return deepcopy(entry[1])
+
+    @classmethod
+    def put(cls, org_id: str, serialized_group: dict):
+        ttl = inventory_config().ungrouped_group_cache_ttl
+        if ttl <= 0:
+            return
+        with cls._lock:
+            cls._entries[org_id] = (time.monotonic() + ttl, deepcopy(serialized_group))
+
+    @classmethod
+    def delete(cls, org_id: str):
+        with cls._lock:
+            cls._entries.pop(org_id, None)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+
+
+# Event handler callbacks: registered with SQLAlchemy, not called directly
+@event.listens_for(Session, "after_commit", propagate=True)
+@event.listens_for(Session, "after_rollback", propagate=True)
+def _clear_uncommitted_ungrouped_org_ids(session):
+    """Forget the ungrouped groups created in the transaction once it's committed or rolled back."""
+    session.info.pop(UNCOMMITTED_UNGROUPED_ORG_IDS, None)
+
+
 def _update_hosts_for_group_changes(host_id_list: list[str], group_id_list: list[str], identity: Identity):
     if not host_id_list:
         return [], []
@@ -96,8 +154,9 @@ def _produce_host_update_events(event_producer, serialized_groups, host_list, id
     if not host_list:
         return
 
+    existing_host_ids = get_existing_host_ids((identity.org_id, host.id) for host in host_list)
     for host in host_list:
-        if not host_exists(host.id, org_id=identity.org_id, session=db.session):
+        if str(host.id) not in existing_host_ids:
             logger.warning(f"Skipping group update event for host {host.id}: host no longer exists")
             continue
 
@@ -117,11 +176,14 @@ def _produce_host_update_events(event_producer, serialized_groups, host_list, id
 
 
 def _invalidate_system_cache(host_list: list[Host], identity: Identity):
-    for host in host_list:
-        insights_id = serialize_uuid(host.insights_id)
-        owner_id = serialize_uuid(host.static_system_profile.owner_id) if host.static_system_profile else None
-        if insights_id and owner_id:
-            delete_cached_system_keys(insights_id=insights_id, org_id=identity.org_id, owner_id=owner_id)
+    delete_cached_system_keys_batch(
+        (
+            serialize_uuid(host.insights_id),
+            identity.org_id,
+            serialize_uuid(host.static_system_profile.owner_id) if host.static_system_profile else None,
+        )
+        for host in host_list
+    )
 
 
 def validate_add_host_list_to_group_for_group_create(host_id_list: list[str], group_name: str, org_id: str):
@@ -160,9 +222,16 @@ def _add_hosts_to_group(group_id: str, host_id_list: list[str], org_id: str):
     ids_already_in_this_group = [str(assoc.host_id) for assoc in assoc_query]
 
     # Delete any prior host-group associations, which should now just be to "ungrouped" group
-    HostGroupAssoc.query.filter(
+    prior_assoc_query = HostGroupAssoc.query.filter(
         HostGroupAssoc.org_id == org_id, HostGroupAssoc.host_id.in_(host_id_list), HostGroupAssoc.group_id != group_id
-    ).delete(synchronize_session="fetch")
+    )
+    host_count_deltas = {}
+    if inventory_config().group_host_counts_table_enabled:
+        prior_counts = prior_assoc_query.with_entities(HostGroupAssoc.group_id, func.count()).group_by(
+            HostGroupAssoc.group_id
+        )
+        host_count_deltas = {str(prior_group_id): -count for prior_group_id, count in prior_counts.all()}
+    prior_assoc_query.delete(synchronize_session="fetch")
 
     host_group_assoc = [
         HostGroupAssoc(host_id=host_id, group_id=group_id, org_id=org_id)
@@ -170,6 +239,7 @@ def _add_hosts_to_group(group_id: str, host_id_list: list[str], org_id: str):
         if host_id not in ids_already_in_this_group
     ]
     db.session.add_all(host_group_assoc)
+    adjust_group_host_counts(org_id, {**host_count_deltas, str(group_id): len(host_group_assoc)})
 
     _update_group_update_time(group_id, org_id)
 
@@ -252,9 +322,13 @@ def add_group(
     session: Session | None = None,
 ) -> Group:
     session = session or db.session
+    if ungrouped:
+        SerializedUngroupedGroupCache.delete(org_id)
     new_group = Group(org_id=org_id, name=group_name, account=account, id=group_id, ungrouped=ungrouped)
     session.add(new_group)
     session.flush()
+    if ungrouped:
+        session.info.setdefault(UNCOMMITTED_UNGROUPED_ORG_IDS, set()).add(org_id)
 
     # gets the ID of the group after it has been committed
     return new_group
@@ -390,6 +464,9 @@ def delete_group_list(group_id_list: list[str], identity: Identity, event_produc
             db.session.query(Group).filter(Group.org_id == identity.org_id, Group.id.in_(group_id_list)).all()
         ):
             group_id = group.id
+            if group.ungrouped:
+                UngroupedGroupCache.delete(identity.org_id)
+                SerializedUngroupedGroupCache.delete(identity.org_id)
 
             with delete_group_processing_time.time():
                 if _delete_group(group, identity):
@@ -454,6 +531,7 @@ def _remove_hosts_from_group(group_id, host_id_list, org_id):
             else:
                 log_host_group_delete_failed(logger, assoc.host_id, assoc.group_id, get_control_rule())
 
+    adjust_group_host_counts(org_id, {str(found_group.id): -len(removed_host_ids)})
     _update_group_update_time(group_id, org_id)
 
     return removed_host_ids
@@ -492,6 +570,9 @@ def patch_group(group: Group, patch_data: dict, identity: Identity, event_produc
     removed_serialized_groups = None
     added_serialized_groups = None
 
+    if group.ungrouped:
+        SerializedUngroupedGroupCache.delete(identity.org_id)
+
     with session_guard(db.session):
         # Patch Group data, if provided
         group_patched = group.patch(patch_data)
@@ -605,13 +686,94 @@ def get_or_create_ungrouped_hosts_group_for_identity(identity: Identity) -> Grou
     return group
 
 
+def get_serialized_ungrouped_group_for_identity(identity: Identity) -> dict:
+    """Serialized ungrouped group of the identity's org (without host count), as stored on host records."""
+    serialized_group = SerializedUngroupedGroupCache.get(identity.org_id)
+    if serialized_group is not None:
+        return serialized_group
+
+    group = get_or_create_ungrouped_hosts_group_for_identity(identity)
+    serialized_group = serialize_group(
+        group, identity.org_id, getattr(identity, "account_number", None), with_host_count=False
+    )
+    # A group created in the current transaction is gone if it rolls back, so it's only cached once committed
+    if identity.org_id not in db.session.info.get(UNCOMMITTED_UNGROUPED_ORG_IDS, ()):
+        SerializedUngroupedGroupCache.put(identity.org_id, serialized_group)
+    return serialized_group
+
+
+def _cache_ungrouped_groups(groups: list[Group]) -> set[str]:
+    for group in groups:
+        UngroupedGroupCache.put(group.org_id, group)
+        SerializedUngroupedGroupCache.put(group.org_id, serialize_group(group, group.org_id, with_host_count=False))
+    return {group.org_id for group in groups}
+
+
+def _create_ungrouped_hosts_workspace(app, identity: Identity):
+    with app.app_context():
+        workspace_id = rbac_create_ungrouped_hosts_workspace(identity)
+        wait_for_workspace_event(
+            str(workspace_id),
+            EventType.created,
+            org_id=identity.org_id,
+            timeout=inventory_config().rbac_timeout,
+        )
+
+
+def prefetch_ungrouped_groups(account_by_org_id: dict[str, str | None]) -> None:
+    """
+    Resolve the ungrouped groups of all orgs in an ingress batch up front.
+
+    Existing groups are loaded with a single query. Missing ones are requested from RBAC
+    concurrently, so new orgs in the same batch don't wait on each other's workspace events.
+    Failures are only logged: add_host falls back to get_or_create_ungrouped_hosts_group_for_identity.
+    """
+    org_ids = [
+        org_id
+        for org_id in account_by_org_id
+        if UngroupedGroupCache.get(org_id) is None and SerializedUngroupedGroupCache.get(org_id) is None
+    ]
+    if not org_ids:
+        return
+
+    found = _cache_ungrouped_groups(Group.query.filter(Group.org_id.in_(org_ids), Group.ungrouped.is_(True)).all())
+    missing_org_ids = [org_id for org_id in org_ids if org_id not in found]
+    # Without Kessel the group is a plain insert, which add_host does in the batch transaction
+    if not missing_org_ids or inventory_config().bypass_kessel:
+        return
+
+    identities = []
+    for org_id in missing_org_ids:
+        identity = create_mock_identity_with_org_id(org_id)
+        identity.account_number = account_by_org_id[org_id]
+        identities.append(identity)
+
+    app = current_app._get_current_object()
+    max_workers = min(len(identities), inventory_config().ungrouped_workspace_create_workers)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ungrouped-workspace") as executor:
+        futures = {
+            executor.submit(_create_ungrouped_hosts_workspace, app, identity): identity.org_id
+            for identity in identities
+        }
+    for future, org_id in futures.items():
+        if (exc := future.exception()) is not None:
+            logger.warning(f"Could not create the ungrouped workspace for org_id={org_id}: {exc}")
+
+    _cache_ungrouped_groups(Group.query.filter(Group.org_id.in_(missing_org_ids), Group.ungrouped.is_(True)).all())
+
+
 def get_ungrouped_group(identity: Identity) -> Group:
     ungrouped_group = Group.query.filter(Group.org_id == identity.org_id, Group.ungrouped.is_(True)).one_or_none()
     return ungrouped_group
 
 
 def serialize_group(
-    group: Group | dict, org_id: str, account: str | None = None, *, with_host_count: bool = True
+    group: Group | dict,
+    org_id: str,
+    account: str | None = None,
+    *,
+    with_host_count: bool = True,
+    host_count: int | None = None,
 ) -> dict:
     """
     Serialize a group, optionally including host count.
@@ -623,12 +785,30 @@ def serialize_group(
         account: The account_number (optional, only used for RBAC v2 workspaces)
         with_host_count: When False, skip the host count query (used during MQ ingestion
             where an accurate count is not needed and the query is expensive).
+        host_count: A host count already fetched by the caller, used instead of querying it.
     """
-    if isinstance(group, dict):
-        group_id = group["id"]
+    group_id = group["id"] if isinstance(group, dict) else str(group.id)
+    if host_count is None:
         host_count = get_host_counts_batch(org_id, [group_id])[group_id] if with_host_count else 0
+
+    if isinstance(group, dict):
         return serialize_rbac_workspace_with_host_count(group, org_id, account, host_count)
     else:
-        group_id = str(group.id)
-        host_count = get_host_counts_batch(org_id, [group_id])[group_id] if with_host_count else 0
         return serialize_db_group_with_host_count(group, host_count)
+
+
+def serialize_group_list(group_list: list[Group | dict], org_id: str, account: str | None = None) -> list[dict]:
+    """
+    Serialize a page of groups, fetching the host counts of all of them in one batch query.
+
+    Args:
+        group_list: Group ORM objects (from DB) or dicts (from RBAC v2)
+        org_id: The organization ID
+        account: The account_number (optional, only used for RBAC v2 workspaces)
+    """
+    group_ids = [group["id"] if isinstance(group, dict) else str(group.id) for group in group_list]
+    host_counts = get_host_counts_batch(org_id, group_ids)
+    return [
+        serialize_group(group, org_id, account, host_count=host_counts.get(group_id, 0))
+        for group, group_id in zip(group_list, group_ids, strict=True)
+    ]
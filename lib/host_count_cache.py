@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from api.cache import bump_host_counts_generations
+from api.cache import get_host_counts_generation
+from api.metrics import host_count_cache_hit
+from api.metrics import host_count_cache_miss
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class HostCountCache:
+    """Process-wide cache of host list totals, keyed by org and normalized filter set.
+
+    Entries are bounded (LRU) and expire after a short TTL. Keys include a per-org generation
+    stored in Redis (when the Redis API cache is enabled); ingesting or deleting hosts bumps it,
+    so every pod stops using the totals it cached for that org before the change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+
+    @staticmethod
+    def scope(org_id: str, filter_key: str) -> tuple:
+        return org_id, get_host_counts_generation(org_id), filter_key
+
+    def get(self, key: tuple) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                host_count_cache_miss.inc()
+                return None
+
+            self._entries.move_to_end(key)
+            host_count_cache_hit.inc()
+            return entry[1]
+
+    def put(self, key: tuple, value: int, ttl: int, max_size: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_orgs(self, org_ids: Iterable[str]):
+        org_ids = set(org_ids)
+        if not org_ids:
+            return
+
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in org_ids]:
+                del self._entries[key]
+
+        bump_host_counts_generations(org_ids)
+        logger.debug(f"Host counts invalidated for org_ids={org_ids}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+host_count_cache = HostCountCache()
@@ -8,13 +8,16 @@ from confluent_kafka import KafkaException
 from flask_sqlalchemy.query import Query
 from sqlalchemy.orm import Session
 
+from api.cache import delete_cached_system_keys_batch
 from app.auth.identity import Identity
 from app.auth.identity import to_auth_header
+from app.common import inventory_config
 from app.instrumentation import log_host_delete_succeeded
 from app.logging import get_logger
 from app.models import Host
 from app.models import HostGroupAssoc
 from app.models import deleted_by_this_query
+from app.queue.event_producer import DeliveryReport
 from app.queue.event_producer import EventProducer
 from app.queue.events import EventType
 from app.queue.host_mq import OperationResult
@@ -22,6 +25,7 @@ from app.queue.host_mq import write_delete_event_message
 from app.queue.notifications import NotificationType
 from app.queue.notifications import send_notification
 from lib.db import session_guard
+from lib.host_count_cache import host_count_cache
 from lib.host_kafka import kafka_available
 from lib.metrics import delete_host_count
 from lib.metrics import delete_host_processing_time
@@ -58,11 +62,26 @@ def _send_delete_messages_for_batch(
     notification_event_producer: EventProducer,
     initiated_by_frontend: bool,
 ) -> None:
+    delivery_report = DeliveryReport()
+    cached_systems: list[tuple] = []
     for result in processed_rows:
         if result is not None:
             delete_host_count.inc()
-            write_delete_event_message(event_producer, result, initiated_by_frontend)
-            send_notification(notification_event_producer, NotificationType.system_deleted, vars(result.row))
+            write_delete_event_message(
+                event_producer, result, initiated_by_frontend, delivery_report, cached_systems=cached_systems
+            )
+            send_notification(
+                notification_event_producer, NotificationType.system_deleted, vars(result.row), wait=False
+            )
+
+    # One flush for the whole chunk. If any delete event was not delivered, raise so that the
+    # chunk's DB transaction is rolled back and the hosts get deleted (and produced) again later.
+    failed_keys = event_producer.flush_delivery_report(delivery_report, inventory_config().host_delete_flush_timeout)
+    notification_event_producer.flush()
+    delete_cached_system_keys_batch(cached_systems, spawn=True)
+    if failed_keys:
+        logger.error("Delete events not delivered for hosts: %s", sorted(failed_keys))
+        raise KafkaException(f"{len(failed_keys)} delete events not delivered. Stopping host deletions.")
 
 
 def delete_hosts(
@@ -87,6 +106,9 @@ def delete_hosts(
                 # yield the items in batch_events
                 yield from batch_events
 
+            # Only once the deletions are committed, so the counts cached meanwhile can't include the hosts
+            host_count_cache.invalidate_orgs({result.row.org_id for result in batch_events})
+
         else:
             logger.error("Host batch not deleted because Kafka server not available.")
             raise KafkaException("Kafka server not available. Stopping host deletions.")
@@ -161,6 +161,13 @@ def _track_operation(session, event_type: str, host_id: str):
     return False
 
 
+def track_hosts_created(session, host_ids: list[str]):
+    """Track hosts inserted without the ORM unit of work (e.g. bulk INSERTs), which after_insert doesn't see."""
+    ops = _get_pending_ops(session)
+    tracked = {host_id for event_type, host_id in ops if event_type == "created"}
+    ops.extend(("created", host_id) for host_id in host_ids if host_id not in tracked)
+
+
 # Event handler callback: registered with SQLAlchemy, not called directly
 @event.listens_for(Host, "after_insert", propagate=True)
 def _track_host_created(mapper, connection, host: Host):  # noqa: ARG001
@@ -1,60 +1,184 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Callable
+from collections.abc import Iterable
+from datetime import datetime
+from datetime import timedelta
 from enum import Enum
 from typing import Any
+from uuid import UUID
 
 from flask import current_app
 from flask_sqlalchemy.query import Query
 from sqlalchemy import and_
+from sqlalchemy import any_
+from sqlalchemy import bindparam
 from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import literal
 from sqlalchemy import not_
 from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import BinaryExpression
 from sqlalchemy.sql.elements import BooleanClauseList
+from sqlalchemy.sql.elements import ColumnElement
 
 from api.filtering.db_filters import find_stale_host_in_window
+from api.filtering.db_filters import rbac_permissions_filter
 from api.filtering.db_filters import stale_timestamp_filter
 from api.filtering.db_filters import staleness_to_conditions
 from api.filtering.db_filters import update_query_for_owner_id
 from api.staleness_query import get_staleness_obj
 from app.auth.identity import Identity
+from app.common import inventory_config
 from app.config import COMPOUND_ID_FACTS
 from app.config import COMPOUND_ID_FACTS_MAP
+from app.config import DEFAULT_INSIGHTS_ID
 from app.config import ID_FACTS
 from app.config import ID_FACTS_USE_SUBMAN_ID
 from app.config import IMMUTABLE_ID_FACTS
 from app.exceptions import InventoryException
 from app.logging import get_logger
 from app.models import Group
+from app.models import GroupHostCount
 from app.models import Host
+from app.models import HostDynamicSystemProfile
 from app.models import HostGroupAssoc
+from app.models import HostStaticSystemProfile
 from app.models import LimitedHost
+from app.models import Staleness
 from app.models import db
+from app.models.utils import _time_now
 from app.serialization import build_system_profile_from_normalized
 from app.serialization import serialize_canonical_facts
 from app.serialization import serialize_staleness_to_dict
 from app.staleness_serialization import get_sys_default_staleness
 from app.staleness_states import HostStalenessStatesDbFilters
 from lib import metrics
+from lib.batch_cache import ThreadLocalBatchCache
+from lib.host_outbox_events import track_hosts_created
 
 __all__ = (
     "AddHostResult",
+    "CanonicalFactsIndex",
     "extract_immutable_and_id_facts",
     "add_host",
     "multiple_canonical_facts_host_query",
     "create_new_host",
     "find_existing_host",
     "find_non_culled_hosts",
+    "get_existing_host_ids",
     "update_existing_host",
     "host_query",
+    "prefetch_hosts_by_canonical_facts",
 )
 
 AddHostResult = Enum("AddHostResult", ("created", "updated"))
 
+# ID facts stored in UUID columns; their values are compared in canonical UUID form, the same way PostgreSQL does.
+UUID_ID_FACTS = ("insights_id",)
+
 logger = get_logger(__name__)
 
 
+class CanonicalFactsIndex(ThreadLocalBatchCache):
+    """Batch-scoped index of deduplication candidates, keyed by org_id.
+
+    Populated once per MQ batch by prefetch_hosts_by_canonical_facts(), so that
+    find_existing_host() can match hosts in memory instead of querying the DB per ID fact.
+    """
+
+
+class _OrgCanonicalFactsIndex:
+    """Hash indexes of the hosts of a single org that share at least one prefetched ID fact value.
+
+    Matching is done against a snapshot of each host's facts taken when the hosts were loaded,
+    so the results are the same as those of multiple_canonical_facts_host_query() at that time.
+    """
+
+    def __init__(self, prefetched_facts: dict[str, set[str]]):
+        self.prefetched_facts = prefetched_facts
+        self._hosts_by_fact: dict[str, dict[str, list[tuple[Host, dict[str, Any]]]]] = {
+            fact: defaultdict(list) for fact in prefetched_facts
+        }
+
+    def add(self, host: Host) -> None:
+        snapshot = {
+            key: _normalize_fact_value(key, getattr(host, key, None)) for key in (*ID_FACTS, *COMPOUND_ID_FACTS)
+        }
+        snapshot["modified_on"] = host.modified_on
+        for fact, hosts_by_value in self._hosts_by_fact.items():
+            if (value := snapshot[fact]) is not None:
+                hosts_by_value[value].append((host, snapshot))
+
+    def covers(self, canonical_facts: dict[str, Any]) -> bool:
+        """Return True when all the facts used to look up candidates were prefetched."""
+        return all(
+            _normalize_fact_value(key, value) in self.prefetched_facts.get(key, ())
+            for key, value in canonical_facts.items()
+            if key not in COMPOUND_ID_FACTS
+        )
+
+    def find(self, canonical_facts: dict[str, Any]) -> Host | None:
+        normalized_facts = {key: _normalize_fact_value(key, value) for key, value in canonical_facts.items()}
+        candidates = {}
+        for key, value in normalized_facts.items():
+            if key in COMPOUND_ID_FACTS:
+                continue
+            for host, snapshot in self._hosts_by_fact[key].get(value, ()):
+                candidates[id(host)] = (host, snapshot)
+
+        matching = [
+            (host, snapshot)
+            for host, snapshot in candidates.values()
+            if all(snapshot[key] is None or snapshot[key] == value for key, value in normalized_facts.items())
+        ]
+        if not matching:
+            return None
+        # Same ordering as the DB query: the most recently modified host wins
+        return max(matching, key=lambda match: match[1]["modified_on"])[0]
+
+
+class NewHostBulkInsert(ThreadLocalBatchCache):
+    """Batch-scoped staging of brand-new hosts, keyed by host ID.
+
+    Only active when mq_bulk_insert_new_hosts is enabled. While active, add_host() stages the hosts
+    it creates (and their ungrouped group ID) instead of adding them to the session, and when the
+    batch completes without an error they are written with one multi-row INSERT per table.
+    Staged hosts stay in memory until then, so later messages of the batch can still update them.
+    """
+
+    def __enter__(self):
+        if inventory_config().mq_bulk_insert_new_hosts:
+            self._create()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            if exc_type is None:
+                insert_staged_new_hosts()
+        finally:
+            self._clear()
+        return False
+
+
+def _normalize_fact_value(key: str, value: Any) -> str | None:
+    if value is None:
+        return None
+    if key in UUID_ID_FACTS:
+        try:
+            return str(value if isinstance(value, UUID) else UUID(str(value)))
+        except ValueError:
+            return None
+    return str(value)
+
+
 def add_host(
     input_host: Host,
     identity: Identity,
@@ -74,8 +198,7 @@ def add_host(
      https://inscope.corp.redhat.com/docs/default/Component/consoledot-pages/services/inventory/#expected-message-format
     """
     # Import here to avoid circular import
-    from lib.group_repository import get_or_create_ungrouped_hosts_group_for_identity
-    from lib.group_repository import serialize_group
+    from lib.group_repository import get_serialized_ungrouped_group_for_identity
 
     if operation_args is None:
         operation_args = {}
@@ -89,10 +212,8 @@ def add_host(
         # If the list of existing hosts was not provided, or the match was not found, try querying DB
         matched_host = find_existing_host(identity, canonical_facts)
 
-    group = get_or_create_ungrouped_hosts_group_for_identity(identity)
-    input_host.groups = [
-        serialize_group(group, identity.org_id, getattr(identity, "account_number", None), with_host_count=False)
-    ]
+    serialized_group = get_serialized_ungrouped_group_for_identity(identity)
+    input_host.groups = [serialized_group]
 
     if matched_host:
         defer_to_reporter = operation_args.get("defer_to_reporter")
@@ -103,9 +224,11 @@ def add_host(
                 update_system_profile = False
 
         return update_existing_host(matched_host, input_host, update_system_profile)
+    elif NewHostBulkInsert.is_active():
+        return stage_new_host(input_host, UUID(serialized_group["id"]))
     else:
         # create a new host group association for the host
-        assoc = HostGroupAssoc(input_host.id, group.id, identity.org_id)
+        assoc = HostGroupAssoc(input_host.id, UUID(serialized_group["id"]), identity.org_id)
         db.session.add(assoc)
 
         return create_new_host(input_host)
@@ -194,6 +317,12 @@ def _find_host_by_multiple_facts_in_db_or_in_memory(
             )
         return existing_hosts[0] if existing_hosts else None
 
+    org_index = CanonicalFactsIndex.get(identity.org_id)
+    if org_index is not None and org_index.covers(canonical_facts):
+        _check_compound_id_facts(canonical_facts)
+        with metrics.find_host_by_facts_in_index.time():
+            return org_index.find(canonical_facts)
+
     with metrics.find_host_by_facts_in_db.time():
         return (
             multiple_canonical_facts_host_query(identity, canonical_facts, restrict_to_owner_id=False)
@@ -239,6 +368,38 @@ def multiple_canonical_facts_host_query_in_memory(
     return _query
 
 
+@metrics.prefetch_hosts_by_facts_in_db.time()
+def prefetch_hosts_by_canonical_facts(canonical_facts_by_org: dict[str, list[dict[str, Any]]]) -> None:
+    """
+    Load the deduplication candidates of a whole MQ batch into the CanonicalFactsIndex.
+
+    Runs one query per org, matching any of the ID fact values present in the batch. Values that
+    are not prefetched (for example because they are not valid) are looked up in the DB as before.
+    Must be called within a CanonicalFactsIndex context.
+    """
+    id_fields = ID_FACTS_USE_SUBMAN_ID if current_app.config["USE_SUBMAN_ID"] else ID_FACTS
+
+    for org_id, canonical_facts_list in canonical_facts_by_org.items():
+        prefetched_facts: dict[str, set[str]] = {fact: set() for fact in id_fields}
+        for canonical_facts in canonical_facts_list:
+            for fact in id_fields:
+                if (value := _normalize_fact_value(fact, canonical_facts.get(fact))) is not None:
+                    prefetched_facts[fact].add(value)
+
+        prefetched_facts = {fact: values for fact, values in prefetched_facts.items() if values}
+        if not prefetched_facts:
+            continue
+
+        query = host_query(org_id).filter(
+            or_(*(getattr(Host, fact).in_(values) for fact, values in prefetched_facts.items()))
+        )
+        org_index = _OrgCanonicalFactsIndex(prefetched_facts)
+        for host in find_non_culled_hosts(query).all():
+            org_index.add(host)
+
+        CanonicalFactsIndex.put(org_id, org_index)
+
+
 def find_hosts_by_staleness_job(staleness_types, org_id):
     logger.debug("find_hosts_by_staleness(%s)", staleness_types)
     staleness_obj = serialize_staleness_to_dict(get_staleness_obj(org_id))
@@ -271,6 +432,67 @@ def find_hosts_sys_default_staleness(staleness_types):
     return or_(False, *staleness_conditions)
 
 
+def _staleness_offset(staleness_field: str) -> ColumnElement:
+    """
+    The org's staleness offset as an SQL interval, read from the staleness table joined to the hosts.
+
+    Orgs without custom staleness have no staleness row, and COALESCE falls back to the system default.
+    """
+    default_seconds = get_sys_default_staleness()[staleness_field]
+    return literal(timedelta(seconds=1)) * func.coalesce(getattr(Staleness, staleness_field), default_seconds)
+
+
+def _staleness_offset_bounds(session: Session, staleness_field: str) -> tuple[timedelta, timedelta]:
+    """The shortest and the longest staleness offset any org uses, custom or default."""
+    column = getattr(Staleness, staleness_field)
+    default_seconds = get_sys_default_staleness()[staleness_field]
+    shortest, longest = session.query(func.min(column), func.max(column)).one()
+    return (
+        timedelta(seconds=min(default_seconds, shortest if shortest is not None else default_seconds)),
+        timedelta(seconds=max(default_seconds, longest if longest is not None else default_seconds)),
+    )
+
+
+def staleness_job_query(session: Session) -> Query:
+    """Host query joined to the org staleness, for the filters computing the org staleness in SQL."""
+    return session.query(Host).outerjoin(Staleness, Staleness.org_id == Host.org_id)
+
+
+def find_culled_hosts_joined(now: datetime) -> ColumnElement:
+    """
+    Culled hosts of all orgs, for a query from staleness_job_query.
+
+    The deletion_timestamp precomputed from the org staleness is used whenever the host has one, the same way
+    the API decides whether a host is culled, so those hosts are found with an index scan on deletion_timestamp.
+    Hosts without it are compared against the culling threshold computed from the joined staleness.
+    """
+    return or_(
+        Host.deletion_timestamp <= now,
+        and_(
+            Host.deletion_timestamp.is_(None),
+            Host.last_check_in <= literal(now) - _staleness_offset("conventional_time_to_delete"),
+        ),
+    )
+
+
+def find_stale_hosts_joined(session: Session, last_run_secs: int, job_start_time: datetime) -> ColumnElement:
+    """
+    Hosts of all orgs that went stale since the last run, for a query from staleness_job_query.
+
+    The window is the one of find_stale_host_in_window, computed from the joined staleness. It is also bounded
+    by the shortest and the longest stale offset in use, so that the last_check_in index can narrow the scan.
+    """
+    shortest, longest = _staleness_offset_bounds(session, "conventional_time_to_stale")
+    last_run = timedelta(seconds=last_run_secs)
+    stale_timestamp = literal(job_start_time) - _staleness_offset("conventional_time_to_stale")
+    return and_(
+        Host.last_check_in <= job_start_time - shortest,
+        Host.last_check_in > job_start_time - longest - last_run,
+        Host.last_check_in <= stale_timestamp,
+        Host.last_check_in > stale_timestamp - last_run,
+    )
+
+
 def _excluded_hosts_filter():
     """Filter matching hosts that should be excluded from active counts.
 
@@ -286,10 +508,17 @@ def find_non_culled_hosts(query: Query) -> Query:
     return query.filter(not_(_excluded_hosts_filter()))
 
 
+def _content_digest(input_host: Host) -> str | None:
+    if not inventory_config().mq_heartbeat_fast_path:
+        return None
+    return input_host.compute_content_digest()
+
+
 @metrics.new_host_commit_processing_time.time()
 def create_new_host(input_host: Host) -> tuple[Host, AddHostResult]:
     logger.debug("Creating a new host")
 
+    input_host.content_digest = _content_digest(input_host)
     input_host.save()
 
     metrics.create_host_count.inc()
@@ -298,6 +527,78 @@ def create_new_host(input_host: Host) -> tuple[Host, AddHostResult]:
     return input_host, AddHostResult.created
 
 
+def stage_new_host(input_host: Host, group_id: UUID) -> tuple[Host, AddHostResult]:
+    logger.debug("Staging a new host for bulk insert")
+
+    input_host.content_digest = _content_digest(input_host)
+    NewHostBulkInsert.put(str(input_host.id), (input_host, group_id))
+
+    metrics.create_host_count.inc()
+    logger.debug("Staged host (uncommitted):%s", input_host)
+
+    return input_host, AddHostResult.created
+
+
+def _column_values(instance: Any) -> dict[str, Any]:
+    # Read the loaded state directly: going through the instrumented attributes costs more than the INSERT
+    columns = instance.__table__.columns
+    return {key: value for key, value in vars(instance).items() if value is not None and key in columns}
+
+
+def _insert_rows(model: type, rows: list[dict[str, Any]]) -> None:
+    # One statement for all the rows, with only the columns that any of them sets
+    keys = set().union(*rows)
+    db.session.execute(insert(model.__table__), [{key: row.get(key) for key in keys} for row in rows])
+
+
+def insert_staged_new_hosts() -> int:
+    """
+    Write the hosts staged by NewHostBulkInsert with multi-row INSERTs into hosts, system_profiles_static,
+    system_profiles_dynamic and hosts_groups, in the current transaction.
+
+    The column defaults applied by a flush are set on the staged objects first, so the in-memory hosts
+    that the batch serializes into events match the inserted rows. The after_insert outbox listener
+    doesn't fire for Core INSERTs, so the hosts are registered for their "created" outbox entries here.
+    """
+    staged = NewHostBulkInsert.values()
+    if not staged:
+        return 0
+
+    now = _time_now()
+    host_rows, static_rows, dynamic_rows, assoc_rows = [], [], [], []
+    for host, group_id in staged:
+        host._cleanup_tags()
+        host.created_on = host.created_on or now
+        host.modified_on = host.modified_on or now
+        host.insights_id = host.insights_id or DEFAULT_INSIGHTS_ID
+        if not host.display_name or host.display_name == str(host.id):
+            host.display_name = host.fqdn or str(host.id)
+
+        host_rows.append(_column_values(host))
+        for profile, rows in (
+            (host.static_system_profile, static_rows),
+            (host.dynamic_system_profile, dynamic_rows),
+        ):
+            if profile is not None:
+                profile.org_id, profile.host_id = host.org_id, host.id
+                rows.append(_column_values(profile))
+        assoc_rows.append({"host_id": host.id, "group_id": group_id, "org_id": host.org_id})
+
+    with metrics.new_host_bulk_insert_processing_time.time():
+        for model, rows in (
+            (Host, host_rows),
+            (HostStaticSystemProfile, static_rows),
+            (HostDynamicSystemProfile, dynamic_rows),
+            (HostGroupAssoc, assoc_rows),
+        ):
+            if rows:
+                _insert_rows(model, rows)
+
+    track_hosts_created(db.session, [str(host.id) for host, _ in staged])
+    logger.debug("Bulk inserted %d new hosts", len(host_rows))
+    return len(host_rows)
+
+
 @metrics.update_host_commit_processing_time.time()
 def update_existing_host(
     existing_host: Host, input_host: Host, update_system_profile: bool
@@ -305,7 +606,15 @@ def update_existing_host(
     logger.debug("Updating an existing host")
     logger.debug(f"existing host = {existing_host}")
 
-    existing_host.update(input_host, update_system_profile)
+    content_digest = _content_digest(input_host) if update_system_profile else None
+    if content_digest is not None and content_digest == existing_host.content_digest:
+        # Nothing changed since the last full update, only record the check-in
+        existing_host.check_in(input_host.reporter)
+        metrics.update_host_path_count.labels("heartbeat").inc()
+    else:
+        existing_host.update(input_host, update_system_profile)
+        existing_host.content_digest = content_digest
+        metrics.update_host_path_count.labels("full").inc()
 
     metrics.update_host_count.inc()
     logger.debug("Updated host (uncommitted):%s", existing_host)
@@ -393,19 +702,9 @@ def get_host_list_by_id_list_from_db(host_id_list, identity, rbac_filter=None, c
         Host.org_id == identity.org_id,
         Host.id.in_(host_id_list),
     ]
-    if rbac_filter and "groups" in rbac_filter:
-        rbac_group_filters = [HostGroupAssoc.group_id.in_(rbac_filter["groups"])]
-        if None in rbac_filter["groups"]:
-            rbac_group_filters.extend(
-                [
-                    HostGroupAssoc.group_id.is_(None),
-                    Group.ungrouped.is_(True),
-                ]
-            )
-
-        filters += (or_(*rbac_group_filters),)
+    filters += rbac_permissions_filter(rbac_filter)
 
-    query = Host.query.outerjoin(HostGroupAssoc).outerjoin(Group).filter(*filters).group_by(Host.id, Host.org_id)
+    query = Host.query.filter(*filters)
     if columns:
         query = query.with_entities(*columns)
     return find_non_culled_hosts(update_query_for_owner_id(identity, query))
@@ -498,21 +797,31 @@ def get_group_ids_ordered_by_host_count(
     # Query from Group table, not HostGroupAssoc, to include empty groups
     total = db.session.query(func.count(Group.id)).filter(Group.org_id == org_id).scalar() or 0
 
-    # Query to get group_ids ordered by host count
-    # Start from Group table with LEFT OUTER JOINs to include groups with 0 hosts
-    # Build staleness filter that includes NULL hosts (groups with no hosts)
-    host_staleness_states_filters = HostStalenessStatesDbFilters()
-
-    query = (
-        db.session.query(Group.id.label("group_id"), func.count(Host.id).label("host_count"))
-        .outerjoin(HostGroupAssoc)
-        .outerjoin(Host)
-        .filter(Group.org_id == org_id)
-        # Include groups with no hosts (Host.id IS NULL) OR groups with non-culled hosts
-        # This ensures empty groups still appear in results with host_count = 0
-        .filter(or_(Host.id.is_(None), not_(host_staleness_states_filters.culled())))
-        .group_by(Group.id)
-    )
+    if inventory_config().group_host_counts_table_enabled:
+        # Read the materialized counts; groups without a row yet have no hosts added since it was enabled
+        query = (
+            db.session.query(
+                Group.id.label("group_id"), func.coalesce(GroupHostCount.host_count, 0).label("host_count")
+            )
+            .outerjoin(GroupHostCount, GroupHostCount.group_id == Group.id)
+            .filter(Group.org_id == org_id)
+        )
+    else:
+        # Query to get group_ids ordered by host count
+        # Start from Group table with LEFT OUTER JOINs to include groups with 0 hosts
+        # Build staleness filter that includes NULL hosts (groups with no hosts)
+        host_staleness_states_filters = HostStalenessStatesDbFilters()
+
+        query = (
+            db.session.query(Group.id.label("group_id"), func.count(Host.id).label("host_count"))
+            .outerjoin(HostGroupAssoc)
+            .outerjoin(Host)
+            .filter(Group.org_id == org_id)
+            # Include groups with no hosts (Host.id IS NULL) OR groups with non-culled hosts
+            # This ensures empty groups still appear in results with host_count = 0
+            .filter(or_(Host.id.is_(None), not_(host_staleness_states_filters.culled())))
+            .group_by(Group.id)
+        )
 
     # Order by host count (default DESC for host_count ordering)
     # Groups with 0 hosts will have host_count = 0
@@ -531,6 +840,67 @@ def get_group_ids_ordered_by_host_count(
     return group_ids, total
 
 
+def adjust_group_host_counts(org_id: str, deltas: dict[str, int]) -> None:
+    """
+    Apply host membership changes to the materialized group_host_counts, when it is enabled.
+
+    Args:
+        org_id: Organization ID
+        deltas: Dictionary mapping group_id -> number of hosts added (negative when removed)
+    """
+    if not inventory_config().group_host_counts_table_enabled:
+        return
+
+    for group_id, delta in deltas.items():
+        if not delta:
+            continue
+
+        statement = pg_insert(GroupHostCount).values(group_id=group_id, org_id=org_id, host_count=max(delta, 0))
+        statement = statement.on_conflict_do_update(
+            index_elements=[GroupHostCount.group_id],
+            set_={"host_count": func.greatest(GroupHostCount.host_count + delta, 0)},
+        )
+        db.session.execute(statement)
+
+
+def refresh_group_host_counts(session: Session | None = None, org_ids: list[str] | None = None) -> int:
+    """
+    Recompute group_host_counts from hosts_groups, counting the hosts get_host_counts_batch counts.
+
+    Corrects the counts for hosts that got culled, and for membership changes that don't adjust them
+    (new hosts added to the ungrouped group, host deletions).
+
+    Args:
+        session: Session to run the statement in, db.session by default
+        org_ids: Only recompute the groups of these organizations (all groups when None)
+
+    Returns:
+        Number of groups whose count was written
+    """
+    session = session or db.session
+    counts = (
+        select(Group.id, Group.org_id, func.count(Host.id))
+        .outerjoin(HostGroupAssoc, and_(HostGroupAssoc.group_id == Group.id, HostGroupAssoc.org_id == Group.org_id))
+        .outerjoin(
+            Host,
+            and_(
+                Host.id == HostGroupAssoc.host_id,
+                Host.org_id == HostGroupAssoc.org_id,
+                not_(_excluded_hosts_filter()),
+            ),
+        )
+        .group_by(Group.id, Group.org_id)
+    )
+    if org_ids is not None:
+        counts = counts.filter(Group.org_id.in_(org_ids))
+
+    statement = pg_insert(GroupHostCount).from_select(["group_id", "org_id", "host_count"], counts)
+    statement = statement.on_conflict_do_update(
+        index_elements=[GroupHostCount.group_id], set_={"host_count": statement.excluded.host_count}
+    )
+    return session.execute(statement).rowcount
+
+
 # Ensures that the query is filtered by org_id
 def host_query(
     org_id: str,
@@ -542,3 +912,35 @@ def host_exists(host_id, org_id, session=None):
     """Return True when a specific host row still exists in the database."""
     session = session or db.session
     return session.query(Host.id).filter(Host.id == host_id, Host.org_id == org_id).first() is not None
+
+
+def get_existing_host_keys(host_ids: Iterable[Any], session=None) -> set[tuple[str, str]]:
+    """
+    Return the (org_id, host_id) pairs of the hosts with the given IDs that exist in the database.
+
+    The IDs are sent as a single array parameter (``WHERE id = ANY(:ids)``), so the statement stays the same
+    for any number of hosts.
+    """
+    host_ids = [host_id if isinstance(host_id, UUID) else UUID(str(host_id)) for host_id in host_ids]
+    if not host_ids:
+        return set()
+
+    session = session or db.session
+    ids = bindparam("ids", host_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+    rows = session.query(Host.org_id, Host.id).filter(Host.id == any_(ids)).all()
+    return {(org_id, str(host_id)) for org_id, host_id in rows}
+
+
+def get_existing_host_ids(host_keys: Iterable[tuple[str, Any]], session=None) -> set[str]:
+    """
+    Return the IDs of the hosts that still exist in the database, checked in a single query.
+
+    host_keys are (org_id, host_id) pairs, so the lookup can be used for hosts from multiple orgs.
+    """
+    host_keys = list(host_keys)
+    if not host_keys:
+        return set()
+
+    session = session or db.session
+    rows = session.query(Host.id).filter(tuple_(Host.org_id, Host.id).in_(host_keys)).all()
+    return {str(host_id) for (host_id,) in rows}
@@ -1,9 +1,13 @@
+import zlib
+
 from confluent_kafka.error import KafkaException
 from confluent_kafka.error import ProduceError
+from sqlalchemy.orm import selectinload
 
 from app.culling import Timestamps
 from app.logging import get_logger
 from app.models import Host
+from app.queue.event_producer import DeliveryReport
 from app.queue.events import EventType
 from app.queue.events import build_event
 from app.queue.events import extract_system_profile_fields_for_headers
@@ -13,7 +17,10 @@ from app.serialization import serialize_host
 from app.serialization import serialize_staleness_to_dict
 from app.staleness_serialization import get_sys_default_staleness
 from lib.group_repository import get_group_using_host_id
-from lib.host_repository import host_exists
+from lib.host_repository import get_existing_host_ids
+from lib.job_checkpoint import clear_checkpoint
+from lib.job_checkpoint import load_checkpoint
+from lib.job_checkpoint import save_checkpoint
 from lib.metrics import synchronize_host_count
 
 logger = get_logger(__name__)
@@ -21,91 +28,136 @@ logger = get_logger(__name__)
 __all__ = ("synchronize_hosts", "sync_group_data")
 
 
+def _org_shard(org_id: str, shard_count: int) -> int:
+    # crc32 is stable across processes, unlike hash(); its range is split into shard_count equal hash ranges
+    return zlib.crc32(org_id.encode()) * shard_count >> 32
+
+
 def synchronize_hosts(
     select_hosts_query, select_staleness_query, event_producer, chunk_size, config, interrupt=lambda: False
 ):
-    num_synchronized = 0
+    """
+    Produce an update event for every host of the orgs in this pod's shard.
+
+    The orgs are processed in org_id order and their hosts in chunks in host ID order. Each chunk is produced
+    without waiting and flushed once, then its position is saved as a checkpoint. A run that is interrupted, or
+    stopped by a chunk whose events were not all delivered, leaves the checkpoint of the last delivered chunk
+    behind and the next run of the same shard continues after it.
+    """
+    shard_index, shard_count = config.synchronizer_shard_index, config.synchronizer_shard_count
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Synchronizer shard {shard_index} is out of range for {shard_count} shards.")
+
+    session = select_hosts_query.session
+    checkpoint_name = f"host_synchronizer:{shard_index}/{shard_count}"
+    checkpoint = load_checkpoint(session, checkpoint_name)
     custom_staleness_dict = {
         staleness.org_id: serialize_staleness_to_dict(staleness) for staleness in select_staleness_query.all()
     }
 
     # Get all distinct org_ids from the base query
     org_ids_query = select_hosts_query.with_entities(Host.org_id).distinct().order_by(Host.org_id)
+    if checkpoint:
+        logger.info(f"Resuming host synchronization from checkpoint {checkpoint}")
+        org_ids_query = org_ids_query.filter(Host.org_id >= checkpoint["org_id"])
+    org_ids = [org_id for (org_id,) in org_ids_query if _org_shard(org_id, shard_count) == shard_index]
 
-    for (org_id,) in org_ids_query:
+    num_synchronized = 0
+    for org_id in org_ids:
         if interrupt():
-            break
+            return num_synchronized
 
         logger.info(f"Synchronizing hosts for org_id: {org_id}")
+        after_host_id = checkpoint["host_id"] if checkpoint and checkpoint["org_id"] == org_id else None
         org_synchronized = _synchronize_hosts_for_org(
             select_hosts_query.filter(Host.org_id == org_id),
-            custom_staleness_dict,
+            org_id,
+            custom_staleness_dict.get(org_id) or get_sys_default_staleness(config),
             event_producer,
             chunk_size,
             config,
             interrupt,
+            checkpoint_name,
+            after_host_id,
         )
         num_synchronized += org_synchronized
         logger.info(f"Completed org_id {org_id}: {org_synchronized} hosts synchronized")
 
+    if not interrupt():
+        clear_checkpoint(session, checkpoint_name)
     return num_synchronized
 
 
-def _synchronize_hosts_for_org(org_hosts_query, custom_staleness_dict, event_producer, chunk_size, config, interrupt):
-    query = org_hosts_query.order_by(Host.id)
-    host_list = query.limit(chunk_size).all()
+def _synchronize_hosts_for_org(
+    org_hosts_query, org_id, staleness, event_producer, chunk_size, config, interrupt, checkpoint_name, after_host_id
+):
+    # The system profiles are serialized for every host, load them with one query per chunk
+    query = org_hosts_query.options(
+        selectinload(Host.static_system_profile), selectinload(Host.dynamic_system_profile)
+    ).order_by(Host.id)
+    timestamps = Timestamps.from_config(config)
     num_synchronized = 0
 
-    while len(host_list) > 0 and not interrupt():
-        events_to_produce = []
-        for host in host_list:
-            staleness = None
-            try:
-                staleness = custom_staleness_dict[host.org_id]
-            except KeyError:
-                staleness = get_sys_default_staleness(config)
-
-            serialized_host = serialize_host(host, Timestamps.from_config(config), staleness=staleness)
-            event = build_event(EventType.updated, serialized_host)
-            host_type, os_name, bootc_booted = extract_system_profile_fields_for_headers(host)
-            headers = message_headers(
-                EventType.updated,
-                str(host.insights_id),
-                host.reporter,
-                host_type,
-                os_name,
-                bootc_booted,
-            )
-            events_to_produce.append((event, headers, str(host.id)))
-
-        for event, headers, host_id in events_to_produce:
-            if not host_exists(host_id, org_id=host_list[0].org_id, session=query.session):
-                logger.warning(f"Skipping sync event for host {host_id}: host no longer exists")
-                continue
-            # in case of a failed update event, event_producer logs the message.
-            # Workaround to solve: https://issues.redhat.com/browse/RHINENG-4856
-            try:
-                event_producer.write_event(event, host_id, headers, wait=True)
-                synchronize_host_count.inc()
-                logger.info("Synchronized host: %s", host_id)
-
-                num_synchronized += 1
-            except (ProduceError, KafkaException):
-                logger.error(f"Failed to synchronize host: {host_id} because of {ProduceError.code}")
-                continue
-
-        try:
-            # pace the events production speed as flush completes sending all buffered records.
-            event_producer._kafka_producer.flush(300)
-        except ProduceError as e:
-            raise ProduceError(f"ProduceError: Kafka failure to flush {chunk_size} records within 300 seconds") from e
+    while not interrupt():
+        # keyset pagination within the same org_id partition
+        chunk_query = query.filter(Host.id > after_host_id) if after_host_id else query
+        host_list = chunk_query.limit(chunk_size).all()
+        if not host_list:
+            break
 
-        # load next chunk using keyset pagination within the same org_id partition
-        host_list = query.filter(Host.id > host_list[-1].id).limit(chunk_size).all()
+        num_synchronized += _produce_host_events(
+            host_list, org_id, staleness, timestamps, event_producer, config.synchronizer_flush_timeout, query.session
+        )
+        after_host_id = str(host_list[-1].id)
+        save_checkpoint(query.session, checkpoint_name, {"org_id": org_id, "host_id": after_host_id})
 
     return num_synchronized
 
 
+def _produce_host_events(host_list, org_id, staleness, timestamps, event_producer, flush_timeout, session):
+    # Hosts deleted since the chunk was read don't get an event; checked with a single query
+    existing_host_ids = get_existing_host_ids(((org_id, host.id) for host in host_list), session=session)
+    delivery_report = DeliveryReport()
+    produced_host_ids = []
+
+    for host in host_list:
+        host_id = str(host.id)
+        if host_id not in existing_host_ids:
+            logger.warning(f"Skipping sync event for host {host_id}: host no longer exists")
+            continue
+
+        serialized_host = serialize_host(host, timestamps, staleness=staleness)
+        event = build_event(EventType.updated, serialized_host)
+        host_type, os_name, bootc_booted = extract_system_profile_fields_for_headers(host)
+        headers = message_headers(
+            EventType.updated,
+            str(host.insights_id),
+            host.reporter,
+            host_type,
+            os_name,
+            bootc_booted,
+        )
+        # in case of a failed update event, event_producer logs the message.
+        # Workaround to solve: https://issues.redhat.com/browse/RHINENG-4856
+        try:
+            event_producer.write_event(event, host_id, headers, delivery_report=delivery_report)
+            produced_host_ids.append(host_id)
+        except (ProduceError, KafkaException) as e:
+            logger.error(f"Failed to synchronize host: {host_id} because of {e}")
+
+    # One flush for the whole chunk, which also paces the production speed
+    failed_host_ids = event_producer.flush_delivery_report(delivery_report, flush_timeout)
+    if failed_host_ids:
+        # Raised before the chunk is checkpointed, so the next run starts over from this chunk
+        raise ProduceError(
+            f"Failed to synchronize hosts of org_id {org_id}, events not delivered: {sorted(failed_host_ids)}"
+        )
+
+    synchronize_host_count.inc(len(produced_host_ids))
+    logger.info(f"Synchronized {len(produced_host_ids)} hosts of org_id {org_id}")
+    return len(produced_host_ids)
+
+
 def sync_group_data(session, chunk_size, interrupt=lambda: False):
     num_updated = 0
     num_failed = 0
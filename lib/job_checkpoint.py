@@ -0,0 +1,34 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.logging import get_logger
+from app.models import JobCheckpoint
+from app.models.utils import _time_now
+
+logger = get_logger(__name__)
+
+__all__ = ("load_checkpoint", "save_checkpoint", "clear_checkpoint")
+
+
+def load_checkpoint(session: Session, name: str) -> dict | None:
+    checkpoint = session.get(JobCheckpoint, name)
+    return checkpoint.position if checkpoint else None
+
+
+def save_checkpoint(session: Session, name: str, position: dict) -> None:
+    """Save the position of a job run and commit it, so it survives the run being interrupted."""
+    statement = pg_insert(JobCheckpoint).values(name=name, position=position, modified_on=_time_now())
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[JobCheckpoint.name],
+            set_={"position": statement.excluded.position, "modified_on": statement.excluded.modified_on},
+        )
+    )
+    session.commit()
+    logger.debug("Saved checkpoint %s: %s", name, position)
+
+
+def clear_checkpoint(session: Session, name: str) -> None:
+    """Remove the checkpoint of a completed job run, so the next run starts from the beginning."""
+    session.query(JobCheckpoint).filter(JobCheckpoint.name == name).delete()
+    session.commit()
@@ -1,3 +1,5 @@
+import time
+
 import grpc
 from grpc import StatusCode
 from kessel.auth import OAuth2ClientCredentials
@@ -15,12 +17,14 @@ from kessel.inventory.v1beta2.check_for_update_response_pb2 import CheckForUpdat
 from kessel.inventory.v1beta2.check_response_pb2 import CheckResponse
 from kessel.rbac.v2 import list_workspaces
 
+from api.metrics import kessel_rpc_response_time
 from app.auth.identity import Identity
 from app.auth.rbac import KesselPermission
 from app.config import Config
 from app.logging import get_logger
 from lib.feature_flags import FLAG_INVENTORY_KESSEL_FORCE_SINGLE_CHECKS_FOR_BULK
 from lib.feature_flags import get_flag_value
+from lib.kessel_decision_cache import kessel_decision_cache
 
 logger = get_logger(__name__)
 
@@ -45,6 +49,9 @@ class Kessel:
 
         self.inventory_svc, self.channel = client_builder.build()
         self.timeout = getattr(config, "kessel_timeout", 10.0)  # Default 10 second timeout
+        self.max_concurrent_checks = config.kessel_max_concurrent_checks
+        self.decision_cache_ttl = config.kessel_decision_cache_ttl
+        self.decision_cache_max_size = config.kessel_decision_cache_max_size
 
     def _handle_grpc_error(self, e: grpc.RpcError, operation: str) -> bool:
         """Handle gRPC errors with appropriate logging and fallback behavior."""
@@ -84,29 +91,38 @@ class Kessel:
             },
         )
         try:
+            if not ids:
+                # No specific IDs - this shouldn't happen in normal Check flow
+                logger.warning("Kessel.check called with empty ID list")
+                return False, []
+
             # Build the subject reference (the user making the request)
             subject_ref = principal_from_rh_identity(current_identity._asdict())
+            scope = self._decision_scope(current_identity, subject_ref)
+            pending_ids = self._ids_without_cached_decision(scope, "Check", permission, ids)
 
-            if len(ids) == 1:
+            if len(pending_ids) == 1:
                 # Single resource check
-                result = self._check_single_resource(subject_ref, permission, str(ids[0]))
-                logger.debug(f"Kessel.check: single resource check result={result}", extra={"resource_id": ids[0]})
-                unauthorized_ids = [] if result else [str(ids[0])]
-                return result, unauthorized_ids
-            elif len(ids) > 1:
+                result = self._check_single_resource(subject_ref, permission, pending_ids[0])
+                logger.debug(
+                    f"Kessel.check: single resource check result={result}", extra={"resource_id": pending_ids[0]}
+                )
+                unauthorized_ids = [] if result else [pending_ids[0]]
+            elif len(pending_ids) > 1:
                 # Bulk check - all resources must be accessible
                 result, unauthorized_ids = self._check_bulk_resources(
-                    subject_ref, permission, [str(id) for id in ids], current_identity.org_id
+                    subject_ref, permission, pending_ids, current_identity.org_id
                 )
                 logger.debug(
                     f"Kessel.check: bulk resource check result={result}",
-                    extra={"ids_count": len(ids), "unauthorized_ids": unauthorized_ids},
+                    extra={"ids_count": len(pending_ids), "unauthorized_ids": unauthorized_ids},
                 )
-                return result, unauthorized_ids
             else:
-                # No specific IDs - this shouldn't happen in normal Check flow
-                logger.warning("Kessel.check called with empty ID list")
-                return False, []
+                logger.debug("Kessel.check: all decisions served from cache", extra={"ids_count": len(ids)})
+                result, unauthorized_ids = True, []
+
+            self._cache_allowed_decisions(scope, "Check", permission, pending_ids, unauthorized_ids)
+            return result, unauthorized_ids
 
         except grpc.RpcError as e:
             return self._handle_grpc_error(e, "Check"), [str(id) for id in ids]
@@ -136,29 +152,37 @@ class Kessel:
             },
         )
         try:
+            if not ids:
+                # No specific IDs - this shouldn't happen in normal check_for_update flow
+                logger.warning("Kessel.check_for_update called with empty ID list")
+                return False, []
+
             # Build the subject reference (the user making the request)
             subject_ref = principal_from_rh_identity(current_identity._asdict())
+            scope = self._decision_scope(current_identity, subject_ref)
+            pending_ids = self._ids_without_cached_decision(scope, "CheckForUpdate", permission, ids)
 
-            if len(ids) == 1:
+            if len(pending_ids) == 1:
                 # Single resource update check
-                result = self._check_single_resource_for_update(subject_ref, permission, ids[0])
+                result = self._check_single_resource_for_update(subject_ref, permission, pending_ids[0])
                 logger.debug(
-                    f"Kessel.check_for_update: single resource check result={result}", extra={"resource_id": ids[0]}
+                    f"Kessel.check_for_update: single resource check result={result}",
+                    extra={"resource_id": pending_ids[0]},
                 )
-                unauthorized_ids = [] if result else [str(ids[0])]
-                return result, unauthorized_ids
-            elif len(ids) > 1:
+                unauthorized_ids = [] if result else [pending_ids[0]]
+            elif len(pending_ids) > 1:
                 # Bulk update check - all resources must be updatable
-                result, unauthorized_ids = self._check_bulk_resources_for_update(subject_ref, permission, ids)
+                result, unauthorized_ids = self._check_bulk_resources_for_update(subject_ref, permission, pending_ids)
                 logger.debug(
                     f"Kessel.check_for_update: bulk resource check result={result}",
-                    extra={"ids_count": len(ids), "unauthorized_ids": unauthorized_ids},
+                    extra={"ids_count": len(pending_ids), "unauthorized_ids": unauthorized_ids},
                 )
-                return result, unauthorized_ids
             else:
-                # No specific IDs - this shouldn't happen in normal check_for_update flow
-                logger.warning("Kessel.check_for_update called with empty ID list")
-                return False, []
+                logger.debug("Kessel.check_for_update: all decisions served from cache", extra={"ids_count": len(ids)})
+                result, unauthorized_ids = True, []
+
+            self._cache_allowed_decisions(scope, "CheckForUpdate", permission, pending_ids, unauthorized_ids)
+            return result, unauthorized_ids
 
         except grpc.RpcError as e:
             return self._handle_grpc_error(e, "check_for_update"), [str(id) for id in ids]
@@ -166,6 +190,51 @@ class Kessel:
             logger.error(f"Kessel check_for_update failed: {str(e)}", exc_info=True)
             return False, [str(id) for id in ids]
 
+    def _decision_scope(
+        self, current_identity: Identity, subject_ref: subject_reference_pb2.SubjectReference
+    ) -> tuple | None:
+        """Cache key prefix for the subject's decisions, or None if the decision cache is disabled."""
+        if self.decision_cache_ttl <= 0:
+            return None
+        return kessel_decision_cache.scope(current_identity.org_id, subject_ref.resource.resource_id)
+
+    def _ids_without_cached_decision(
+        self, scope: tuple | None, rpc: str, permission: KesselPermission, ids: list
+    ) -> list[str]:
+        resource_ids = [str(id) for id in ids]
+        if scope is None:
+            return resource_ids
+
+        resource_type = permission.resource_type.name
+        return [
+            resource_id
+            for resource_id in resource_ids
+            if not kessel_decision_cache.get((*scope, rpc, permission.resource_permission, resource_type, resource_id))
+        ]
+
+    def _cache_allowed_decisions(
+        self,
+        scope: tuple | None,
+        rpc: str,
+        permission: KesselPermission,
+        resource_ids: list[str],
+        unauthorized_ids: list[str],
+    ):
+        # Only grants are cached; denials (and errors, which fail closed) are always checked again
+        if scope is None:
+            return
+
+        resource_type = permission.resource_type.name
+        unauthorized = set(unauthorized_ids)
+        for resource_id in resource_ids:
+            if resource_id not in unauthorized:
+                kessel_decision_cache.put(
+                    (*scope, rpc, permission.resource_permission, resource_type, resource_id),
+                    True,
+                    self.decision_cache_ttl,
+                    self.decision_cache_max_size,
+                )
+
     def _build_object_reference(
         self, permission: KesselPermission, resource_id: str
     ) -> resource_reference_pb2.ResourceReference:
@@ -189,7 +258,8 @@ class Kessel:
             object=self._build_object_reference(permission, resource_id),
         )
 
-        response: CheckResponse = self.inventory_svc.Check(request, timeout=self.timeout)
+        with kessel_rpc_response_time.labels("Check").time():
+            response: CheckResponse = self.inventory_svc.Check(request, timeout=self.timeout)
         logger.debug(f"Kessel.check: single resource check response={response}", extra={"resource_id": resource_id})
         return response.allowed == allowed_pb2.Allowed.ALLOWED_TRUE
 
@@ -231,7 +301,8 @@ class Kessel:
         ]
 
         bulk_request = check_bulk_request_pb2.CheckBulkRequest(items=items)
-        response: CheckBulkResponse = self.inventory_svc.CheckBulk(bulk_request, timeout=self.timeout)
+        with kessel_rpc_response_time.labels("CheckBulk").time():
+            response: CheckBulkResponse = self.inventory_svc.CheckBulk(bulk_request, timeout=self.timeout)
         logger.debug(f"Kessel.check: bulk resource check response={response}", extra={"resource_ids": resource_ids})
 
         # Check that all resources are present in the response
@@ -263,23 +334,42 @@ class Kessel:
 
         return len(unauthorized_ids) == 0, unauthorized_ids
 
-    def _check_single_resource_for_update(
+    def _build_update_check_request(
         self, subject_ref: subject_reference_pb2.SubjectReference, permission: KesselPermission, resource_id: str
-    ) -> bool:
-        """Check update permission for a single resource."""
+    ) -> check_request_pb2.CheckRequest:
         if permission.resource_permission == "view":
             logger.error("_check_single_resource_for_update called with 'view' permission")
             raise ValueError("Update check cannot be performed with 'view' permission")
 
-        request = check_request_pb2.CheckRequest(
+        return check_request_pb2.CheckRequest(
             subject=subject_ref,
             relation=permission.resource_permission,
             object=self._build_object_reference(permission, resource_id),
         )
 
-        response: CheckForUpdateResponse = self.inventory_svc.CheckForUpdate(request, timeout=self.timeout)
+    def _check_single_resource_for_update(
+        self, subject_ref: subject_reference_pb2.SubjectReference, permission: KesselPermission, resource_id: str
+    ) -> bool:
+        """Check update permission for a single resource."""
+        request = self._build_update_check_request(subject_ref, permission, resource_id)
+
+        with kessel_rpc_response_time.labels("CheckForUpdate").time():
+            response: CheckForUpdateResponse = self.inventory_svc.CheckForUpdate(request, timeout=self.timeout)
         return response.allowed == allowed_pb2.Allowed.ALLOWED_TRUE
 
+    def _check_single_resource_for_update_future(
+        self, subject_ref: subject_reference_pb2.SubjectReference, permission: KesselPermission, resource_id: str
+    ) -> grpc.Future:
+        """Start an update permission check for a single resource without waiting for the response."""
+        request = self._build_update_check_request(subject_ref, permission, resource_id)
+
+        started_at = time.perf_counter()
+        future = self.inventory_svc.CheckForUpdate.future(request, timeout=self.timeout)
+        future.add_done_callback(
+            lambda _: kessel_rpc_response_time.labels("CheckForUpdate").observe(time.perf_counter() - started_at)
+        )
+        return future
+
     def _check_bulk_resources_for_update(
         self,
         subject_ref: subject_reference_pb2.SubjectReference,
@@ -288,17 +378,31 @@ class Kessel:
     ) -> tuple[bool, list[str]]:
         """Check update permissions for multiple resources. All must be updatable.
 
+        CheckBulk doesn't support CheckForUpdate, so the single resource checks are sent
+        concurrently, at most max_concurrent_checks in flight at a time.
+
         Returns:
             tuple[bool, list[str]]: (all_allowed, list_of_unauthorized_resource_ids)
         """
         if not resource_ids:
             raise ValueError("resource_ids can't be empty")
 
-        # CheckBulk doesn't support CheckForUpdate, so we iterate over single resource checks
         unauthorized_ids = []
-        for resource_id in resource_ids:
-            if not self._check_single_resource_for_update(subject_ref, permission, resource_id):
-                unauthorized_ids.append(resource_id)
+        for start in range(0, len(resource_ids), self.max_concurrent_checks):
+            window = resource_ids[start : start + self.max_concurrent_checks]
+            futures = [
+                self._check_single_resource_for_update_future(subject_ref, permission, resource_id)
+                for resource_id in window
+            ]
+            try:
+                for resource_id, future in zip(window, futures, strict=True):
+                    response: CheckForUpdateResponse = future.result()
+                    if response.allowed != allowed_pb2.Allowed.ALLOWED_TRUE:
+                        unauthorized_ids.append(resource_id)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
 
         return len(unauthorized_ids) == 0, unauthorized_ids
 
@@ -316,14 +420,23 @@ class Kessel:
         )
 
         subject_ref = principal_from_rh_identity(current_identity._asdict())
+        scope = self._decision_scope(current_identity, subject_ref)
+        cache_key = (*scope, "ListAllowedWorkspaces", relation) if scope is not None else None
+        if cache_key is not None and (workspaces := kessel_decision_cache.get(cache_key)) is not None:
+            return list(workspaces)
 
         try:
-            stream = list_workspaces(self.inventory_svc, subject=subject_ref, relation=relation)
-            workspaces = [workspace.object.resource_id for workspace in stream]
+            with kessel_rpc_response_time.labels("ListAllowedWorkspaces").time():
+                stream = list_workspaces(self.inventory_svc, subject=subject_ref, relation=relation)
+                workspaces = [workspace.object.resource_id for workspace in stream]
             logger.debug(
                 "ListAllowedWorkspaces: successfully retrieved workspaces",
                 extra={"workspace_count": len(workspaces), "workspaces": workspaces[:10] if workspaces else []},
             )
+            if cache_key is not None:
+                kessel_decision_cache.put(
+                    cache_key, tuple(workspaces), self.decision_cache_ttl, self.decision_cache_max_size
+                )
             return workspaces
         except grpc.RpcError as e:
             logger.error(
@@ -350,6 +463,11 @@ class Kessel:
             logger.info("Kessel gRPC channel closed")
 
 
+def invalidate_kessel_decisions(org_id: str):
+    """Drop the cached Kessel decisions of an org, e.g. after one of its workspaces changed."""
+    kessel_decision_cache.invalidate_org(org_id)
+
+
 def init_kessel(config: Config, app):
     kessel_client = Kessel(config)
     app.extensions["Kessel"] = kessel_client
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from api.cache import bump_kessel_decisions_generation
+from api.cache import get_kessel_decisions_generation
+from api.metrics import kessel_decision_cache_hit
+from api.metrics import kessel_decision_cache_miss
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class KesselDecisionCache:
+    """Process-wide cache of Kessel authorization decisions, per subject.
+
+    Entries are bounded (LRU) and expire after a short TTL. Keys include a per-org generation
+    stored in Redis (when the Redis API cache is enabled); workspace events bump it, so every pod
+    stops using the decisions it cached for that org before the event.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    @staticmethod
+    def scope(org_id: str, subject_id: str) -> tuple:
+        return org_id, get_kessel_decisions_generation(org_id), subject_id
+
+    def get(self, key: tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                kessel_decision_cache_miss.inc()
+                return None
+
+            self._entries.move_to_end(key)
+            kessel_decision_cache_hit.inc()
+            return entry[1]
+
+    def put(self, key: tuple, value: Any, ttl: int, max_size: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_org(self, org_id: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == org_id]:
+                del self._entries[key]
+
+        bump_kessel_decisions_generation(org_id)
+        logger.debug(f"Kessel decisions invalidated for org_id={org_id}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+kessel_decision_cache = KesselDecisionCache()
@@ -12,6 +12,14 @@ find_host_by_facts_in_memory = Summary(
     "inventory_find_host_by_facts_in_memory_processing_seconds",
     "Time spent looking for existing host by canonical facts in memory (during MQ batch processing)",
 )
+find_host_by_facts_in_index = Summary(
+    "inventory_find_host_by_facts_in_index_processing_seconds",
+    "Time spent looking for existing host by canonical facts in the prefetched MQ batch index",
+)
+prefetch_hosts_by_facts_in_db = Summary(
+    "inventory_prefetch_hosts_by_facts_in_db_processing_seconds",
+    "Time spent loading the deduplication candidates of a whole MQ batch from db",
+)
 new_host_commit_processing_time = Summary(
     "inventory_new_host_commit_seconds", "Time spent committing a new host to the database"
 )
@@ -19,7 +27,15 @@ update_host_commit_processing_time = Summary(
     "inventory_update_host_commit_seconds", "Time spent committing a update host to the database"
 )
 create_host_count = Counter("inventory_create_host_count", "The total amount of hosts created")
+new_host_bulk_insert_processing_time = Summary(
+    "inventory_new_host_bulk_insert_seconds", "Time spent bulk inserting the new hosts of an MQ batch"
+)
 update_host_count = Counter("inventory_update_host_count", "The total amount of hosts updated")
+update_host_path_count = Counter(
+    "inventory_update_host_path_count",
+    "The total amount of hosts updated, by whether it was a full update or only a heartbeat check-in",
+    ["path"],
+)
 delete_host_count = Counter("inventory_delete_host_count", "The total amount of hosts deleted")
 delete_host_processing_time = Summary(
     "inventory_delete_host_commit_seconds", "Time spent deleting hosts from the database"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import inspect
+import threading
 from functools import partial
 from functools import wraps
 from http import HTTPStatus
@@ -40,6 +41,7 @@ from lib.feature_flags import FLAG_INVENTORY_API_READ_ONLY
 from lib.feature_flags import FLAG_RBAC_WORKSPACES
 from lib.feature_flags import get_flag_value
 from lib.kessel import get_kessel_client
+from lib.rbac_permission_cache import rbac_permission_cache
 
 logger = get_logger(__name__)
 
@@ -85,6 +87,31 @@ def get_rbac_private_url() -> str:
     return inventory_config().rbac_endpoint + RBAC_PRIVATE_UNGROUPED_ROUTE
 
 
+_rbac_session: Session | None = None
+_rbac_session_lock = threading.Lock()
+
+
+def _get_rbac_session() -> Session:
+    """Shared RBAC HTTP session, so connections are pooled and kept alive between requests."""
+    global _rbac_session
+
+    if _rbac_session is None:
+        with _rbac_session_lock:
+            if _rbac_session is None:
+                config = inventory_config()
+                retry_config = Retry(total=config.rbac_retries, backoff_factor=1, status_forcelist=RETRY_STATUSES)
+                session = Session()
+                adapter = HTTPAdapter(
+                    max_retries=retry_config,
+                    pool_connections=1,
+                    pool_maxsize=config.rbac_pool_maxsize,
+                )
+                session.mount(config.rbac_endpoint, adapter)
+                _rbac_session = session
+
+    return _rbac_session
+
+
 def _build_rbac_request_headers(identity_header: str | None = None, request_id_header: str | None = None) -> dict:
     request_headers = {
         IDENTITY_HEADER: identity_header or request.headers[IDENTITY_HEADER],
@@ -119,9 +146,7 @@ def _execute_rbac_http_request(  # type: ignore[return]
     Returns:
         Parsed JSON response data from the RBAC endpoint
     """
-    request_session = Session()
-    retry_config = Retry(total=inventory_config().rbac_retries, backoff_factor=1, status_forcelist=RETRY_STATUSES)
-    request_session.mount(rbac_endpoint, HTTPAdapter(max_retries=retry_config))
+    request_session = _get_rbac_session()
     timeout = inventory_config().rbac_timeout
 
     try:
@@ -174,8 +199,6 @@ def _execute_rbac_http_request(  # type: ignore[return]
     except Exception as e:
         rbac_failure(logger, e)
         abort(503, "Failed to reach RBAC endpoint, request cannot be fulfilled")
-    finally:
-        request_session.close()
 
 
 def rbac_get_request_using_endpoint_and_headers(
@@ -196,15 +219,37 @@ def rbac_get_request_using_endpoint_and_headers(
     )
 
 
-def get_rbac_permissions(app: str, request_header: dict):
-    if inventory_config().bypass_rbac:
-        return None
-
+def _fetch_rbac_permissions(app: str, request_header: dict):
     resp_data = rbac_get_request_using_endpoint_and_headers(get_rbac_url(app), request_header)
     logger.debug("Fetched RBAC Data", extra={"resp_data": resp_data})
     return resp_data["data"]
 
 
+def _rbac_principal(identity: Identity) -> str | None:
+    if identity.identity_type == IdentityType.USER:
+        return getattr(identity, "user", {}).get("username")
+    if identity.identity_type == IdentityType.SERVICE_ACCOUNT:
+        return getattr(identity, "service_account", {}).get("client_id")
+    return None
+
+
+def get_rbac_permissions(app: str, request_header: dict, identity: Identity | None = None):
+    config = inventory_config()
+    if config.bypass_rbac:
+        return None
+
+    principal = _rbac_principal(identity) if identity else None
+    if not principal or config.rbac_permission_cache_ttl <= 0:
+        return _fetch_rbac_permissions(app, request_header)
+
+    return rbac_permission_cache.get_or_load(
+        (principal, identity.org_id, app),
+        partial(_fetch_rbac_permissions, app, request_header),
+        config.rbac_permission_cache_ttl,
+        config.rbac_permission_cache_max_size,
+    )
+
+
 # Determine whether the request should be allowed, strictly according to the given permissions.
 # If any of these match, the endpoint should at least be allowed (but may have filtered results).
 def _is_request_allowed_by_permission(
@@ -289,7 +334,7 @@ def get_rbac_filter(
     g.access_control_rule = "RBAC"
     logger.debug("access_control_rule set")
 
-    rbac_data = get_rbac_permissions(permission_base, rbac_request_headers)
+    rbac_data = get_rbac_permissions(permission_base, rbac_request_headers, identity)
     allowed = False  # Determines whether the endpoint can be accessed at all
     allowed_group_ids = set()  # If populated, limits the allowed resources to specific group IDs
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from api.cache import get_cached_rbac_permissions
+from api.cache import set_cached_rbac_permissions
+from api.metrics import rbac_permission_cache_hit
+from api.metrics import rbac_permission_cache_miss
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RbacPermissionCache:
+    """Process-wide cache of RBAC v1 permission lists, keyed by (principal, org_id, permission_base).
+
+    L1: bounded in-process LRU with a TTL.
+    L2: Redis (optional, shared between pods), see api.cache.
+
+    Concurrent misses for the same key are coalesced, so only one of them calls RBAC.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple, Future] = {}
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any], ttl: int, max_size: int) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                rbac_permission_cache_hit.labels("memory").inc()
+                return entry[1]
+
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+
+        if not is_leader:
+            rbac_permission_cache_hit.labels("in_flight").inc()
+            return future.result()
+
+        try:
+            value = self._load(key, loader, ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            self._put(key, value, ttl, max_size)
+            return value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _load(key: tuple, loader: Callable[[], Any], ttl: int) -> Any:
+        value = get_cached_rbac_permissions(key)
+        if value is not None:
+            rbac_permission_cache_hit.labels("redis").inc()
+            return value
+
+        rbac_permission_cache_miss.inc()
+        value = loader()
+        if value is not None:
+            set_cached_rbac_permissions(key, value, ttl)
+        return value
+
+    def _put(self, key: tuple, value: Any, ttl: int, max_size: int):
+        if value is None:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+
+rbac_permission_cache = RbacPermissionCache()
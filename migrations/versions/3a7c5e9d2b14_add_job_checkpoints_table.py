@@ -0,0 +1,33 @@
+"""Add job_checkpoints table
+
+Revision ID: 3a7c5e9d2b14
+Revises: 9b4e2f7a6c31
+Create Date: 2026-10-18
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.models.constants import INVENTORY_SCHEMA
+
+# revision identifiers, used by Alembic.
+revision = "3a7c5e9d2b14"
+down_revision = "9b4e2f7a6c31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_checkpoints",
+        sa.Column("name", sa.String(length=128), primary_key=True),
+        sa.Column("position", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("modified_on", sa.DateTime(timezone=True), nullable=False),
+        schema=INVENTORY_SCHEMA,
+    )
+
+
+def downgrade():
+    op.drop_table("job_checkpoints", schema=INVENTORY_SCHEMA)
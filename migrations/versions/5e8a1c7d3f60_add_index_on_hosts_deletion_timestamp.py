@@ -0,0 +1,37 @@
+"""Add index on deletion_timestamp for hosts table
+
+This index serves the host reaper when STALENESS_JOB_QUERY_MODE is "join": the hosts with a precomputed
+deletion_timestamp are found with a range scan on it, and the ones without it with an IS NULL scan.
+
+Revision ID: 5e8a1c7d3f60
+Revises: 3a7c5e9d2b14
+Create Date: 2026-10-18
+
+"""
+
+from utils.partitioned_table_index_helper import create_partitioned_table_index
+from utils.partitioned_table_index_helper import drop_partitioned_table_index
+
+# revision identifiers, used by Alembic.
+revision = "5e8a1c7d3f60"
+down_revision = "3a7c5e9d2b14"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_hosts_deletion_timestamp"
+
+
+def upgrade():
+    create_partitioned_table_index(
+        table_name="hosts",
+        index_name=INDEX_NAME,
+        index_definition="(deletion_timestamp)",
+    )
+
+
+def downgrade():
+    drop_partitioned_table_index(
+        table_name="hosts",
+        index_name=INDEX_NAME,
+        if_exists=True,
+    )
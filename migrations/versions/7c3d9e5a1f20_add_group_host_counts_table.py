@@ -0,0 +1,48 @@
+"""Add group_host_counts table
+
+Revision ID: 7c3d9e5a1f20
+Revises: 41e07d4c1092
+Create Date: 2026-10-18
+
+The table starts empty. Once GROUP_HOST_COUNTS_TABLE_ENABLED is set, the next host reaper run
+populates it for every group.
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.models.constants import INVENTORY_SCHEMA
+
+# revision identifiers, used by Alembic.
+revision = "7c3d9e5a1f20"
+down_revision = "41e07d4c1092"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "group_host_counts",
+        sa.Column(
+            "group_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey(f"{INVENTORY_SCHEMA}.groups.id", name="fk_group_host_counts_on_groups", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("org_id", sa.String(length=36), nullable=False),
+        sa.Column("host_count", sa.Integer(), nullable=False, server_default="0"),
+        schema=INVENTORY_SCHEMA,
+    )
+    op.create_index(
+        "idx_group_host_counts_org_id_host_count",
+        "group_host_counts",
+        ["org_id", "host_count"],
+        schema=INVENTORY_SCHEMA,
+    )
+
+
+def downgrade():
+    op.drop_index("idx_group_host_counts_org_id_host_count", table_name="group_host_counts", schema=INVENTORY_SCHEMA)
+    op.drop_table("group_host_counts", schema=INVENTORY_SCHEMA)
@@ -0,0 +1,24 @@
+"""Add content_digest column to hosts
+
+Revision ID: 9b4e2f7a6c31
+Revises: 7c3d9e5a1f20
+Create Date: 2026-10-18
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b4e2f7a6c31"
+down_revision = "7c3d9e5a1f20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("hosts", sa.Column("content_digest", sa.String(length=64), nullable=True), schema="hbi")
+
+
+def downgrade():
+    op.drop_column("hosts", "content_digest", schema="hbi")
@@ -167,6 +167,7 @@ def mq_create_deleted_hosts(mq_create_or_update_host):
 @pytest.fixture(scope="function")
 def kafka_producer(mocker):
     kafka_producer = mocker.patch("app.queue.event_producer.KafkaProducer")
+    kafka_producer.return_value.flush.return_value = 0
     yield kafka_producer
 
 
@@ -5,6 +5,7 @@ import math
 import types
 from base64 import b64encode
 from collections.abc import Callable
+from collections.abc import Iterable
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
@@ -709,7 +710,10 @@ def assert_resource_types_pagination(
     assert links["last"] == f"{expected_path_base}?per_page={expected_per_page}&page={expected_number_of_pages}"
 
 
-def mocked_export_post(_self: Any, url: str, *, data: bytes, **_: Any) -> Response:
+def mocked_export_post(_self: Any, url: str, *, data: bytes | Iterable[bytes], **_: Any) -> Response:
+    # Exports are uploaded with a generator body; consume it the way requests would
+    if not isinstance(data, (bytes, str)):
+        data = b"".join(data)
     # This will raise UnicodeDecodeError if not correctly encoded or AttributeError if data is str
     data.decode("utf-8")
     response = Response()
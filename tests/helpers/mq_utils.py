@@ -48,12 +48,18 @@ class MockEventProducer:
         self._kafka_producer = Mock()
         self._kafka_producer.flush = Mock(return_value=True)
 
-    def write_event(self, event, key, headers, wait=False):
+    def write_event(self, event, key, headers, wait=False, delivery_report=None):  # noqa: ARG002
         self.event = event
         self.key = key
         self.headers = headers
         self.wait = wait
 
+    def flush(self):
+        pass
+
+    def flush_delivery_report(self, delivery_report, timeout):  # noqa: ARG002
+        return set()
+
 
 class FakeMessage:
     def __init__(self, error=None, message=None, headers=None):
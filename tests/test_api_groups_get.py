@@ -4,7 +4,13 @@ from urllib.parse import urlparse
 import pytest
 from requests.exceptions import ConnectionError
 from requests.exceptions import Timeout
+from sqlalchemy import update
 
+from app.models import GroupHostCount
+from app.models import db
+from lib import group_repository
+from lib.host_repository import get_group_ids_ordered_by_host_count
+from lib.host_repository import refresh_group_host_counts
 from lib.middleware import HIDE_WORKSPACE_TYPES
 from tests.helpers.api_utils import GROUP_READ_PROHIBITED_RBAC_RESPONSE_FILES
 from tests.helpers.api_utils import GROUP_URL
@@ -1351,3 +1357,35 @@ def test_get_groups_rbac_v2_malformed_workspace_response(mocker, api_get):
     assert "RBAC service returned malformed workspace data" in response_data["detail"]
     assert "missing required field" in response_data["detail"]
     assert "upstream service issue" in response_data["detail"]
+
+
+def test_sort_by_host_count_from_group_host_counts_table(inventory_config, db_create_group_with_hosts, api_get):
+    inventory_config.group_host_counts_table_enabled = True
+    group_id_list = [str(db_create_group_with_hosts(f"group{idx}", idx).id) for idx in range(4)]
+    refresh_group_host_counts()
+    db.session.commit()
+
+    # The ordering comes from the materialized counts, not from aggregating the hosts
+    db.session.execute(update(GroupHostCount).where(GroupHostCount.group_id == group_id_list[0]).values(host_count=10))
+    db.session.commit()
+
+    response_status, response_data = api_get(build_groups_url(query="?order_by=host_count&order_how=DESC"))
+
+    assert_response_status(response_status, 200)
+    assert [group["id"] for group in response_data["results"]] == [group_id_list[0], *reversed(group_id_list[1:])]
+    assert [group["host_count"] for group in response_data["results"]] == [0, 3, 2, 1]
+    assert get_group_ids_ordered_by_host_count(USER_IDENTITY["org_id"], 10, 1, "DESC") == (
+        [group_id_list[0], *reversed(group_id_list[1:])],
+        4,
+    )
+
+
+def test_get_groups_by_id_fetches_host_counts_once(db_create_group_with_hosts, api_get, mocker):
+    group_id_list = [str(db_create_group_with_hosts(f"group_{idx}", idx).id) for idx in range(3)]
+    get_host_counts_batch = mocker.spy(group_repository, "get_host_counts_batch")
+
+    response_status, response_data = api_get(GROUP_URL + "/" + ",".join(group_id_list))
+
+    assert_response_status(response_status, 200)
+    get_host_counts_batch.assert_called_once()
+    assert [group["host_count"] for group in response_data["results"]] == [0, 1, 2]
@@ -9,7 +9,10 @@ import pytest
 from dateutil.parser import parse
 
 from app.exceptions import ResourceNotFoundException
+from app.models import Group
+from app.models import GroupHostCount
 from app.models import Host
+from lib.host_repository import refresh_group_host_counts
 from tests.helpers.api_utils import GROUP_URL
 from tests.helpers.api_utils import GROUP_WRITE_PROHIBITED_RBAC_RESPONSE_FILES
 from tests.helpers.api_utils import assert_response_status
@@ -848,3 +851,40 @@ def test_get_hosts_from_group_with_kessel_feature_flag(
     assert response_status == 200
     assert response_data["total"] == 1
     assert len(response_data["results"]) == 1
+
+
+def test_group_host_counts_follow_group_membership(
+    inventory_config,
+    db_create_group,
+    db_create_host,
+    db_create_host_group_assoc,
+    api_add_hosts_to_group,
+    api_remove_hosts_from_group,
+    event_producer,
+    mocker,
+):
+    mocker.patch.object(event_producer, "write_event")
+    inventory_config.group_host_counts_table_enabled = True
+
+    group1_id = db_create_group("test_group").id
+    group2_id = db_create_group("test_group2").id
+    host_id_list = [str(db_create_host().id) for _ in range(3)]
+    db_create_host_group_assoc(host_id_list[2], group2_id)
+    refresh_group_host_counts()
+
+    def _host_counts():
+        return {str(row.group_id): row.host_count for row in GroupHostCount.query.all()}
+
+    assert _host_counts() == {str(group1_id): 0, str(group2_id): 1}
+
+    # Moving the host out of group2 decrements it
+    response_status, _ = api_add_hosts_to_group(group1_id, host_id_list)
+    assert_response_status(response_status, 200)
+    assert _host_counts() == {str(group1_id): 3, str(group2_id): 0}
+
+    # Removed hosts go to the ungrouped group, which is counted too
+    response_status, _ = api_remove_hosts_from_group(group1_id, host_id_list[:2])
+    assert_response_status(response_status, 204)
+    host_counts = _host_counts()
+    ungrouped_id = str(Group.query.filter(Group.ungrouped.is_(True)).one().id)
+    assert host_counts == {str(group1_id): 1, str(group2_id): 0, ungrouped_id: 2}
@@ -302,6 +302,37 @@ class TestHostViewFilters:
         assert response_data["per_page"] == 2
         assert len(response_data["results"]) == 2
 
+    def test_cursor_pagination(self, api_get, db_create_multiple_hosts):
+        """Following next_cursor should read the same hosts as the page offsets."""
+        db_create_multiple_hosts(how_many=5)
+
+        _, all_hosts = api_get(build_host_view_url(query="?per_page=5"))
+
+        host_ids = []
+        response_status, response_data = api_get(build_host_view_url(query="?per_page=2"))
+        while True:
+            assert_response_status(response_status, 200)
+            assert response_data["total"] == 5
+            host_ids += [host["id"] for host in response_data["results"]]
+            if "next_cursor" not in response_data:
+                break
+            response_status, response_data = api_get(
+                build_host_view_url(query=f"?per_page=2&cursor={response_data['next_cursor']}")
+            )
+
+        assert response_data["page"] == 3
+        assert host_ids == [host["id"] for host in all_hosts["results"]]
+
+    def test_cursor_not_supported_for_app_data_ordering(self, api_get, db_create_multiple_hosts):
+        """App data orderings can't be paginated by cursor, so they don't return one."""
+        db_create_multiple_hosts(how_many=3)
+
+        url = build_host_view_url(query="?per_page=2&order_by=vulnerability:critical_cves")
+        response_status, response_data = api_get(url)
+
+        assert_response_status(response_status, 200)
+        assert "next_cursor" not in response_data
+
     def test_ordering_by_display_name(self, api_get, db_create_host):
         """Ordering by display_name should work."""
         db_create_host(extra_data={"display_name": "z-host.example.com"})
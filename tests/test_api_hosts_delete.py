@@ -524,6 +524,66 @@ def test_delete_with_callback_receiving_error(
     )
 
 
+def test_delete_flushes_once_per_chunk(
+    mocker,
+    event_producer,
+    notification_event_producer,
+    db_create_multiple_hosts,
+    api_delete_host,
+    db_get_hosts,
+    inventory_config,
+):
+    mocker.patch("lib.host_delete.kafka_available")
+    inventory_config.host_delete_chunk_size = 3
+    hosts = db_create_multiple_hosts(how_many=3)
+    host_id_list = [str(host.id) for host in hosts]
+
+    response_status, _ = api_delete_host(",".join(host_id_list))
+
+    assert_response_status(response_status, expected_status=200)
+    assert db_get_hosts(host_id_list).count() == 0
+    assert event_producer._kafka_producer.produce.call_count == 3
+    event_producer._kafka_producer.flush.assert_called_once_with(inventory_config.host_delete_flush_timeout)
+    notification_event_producer._kafka_producer.flush.assert_called_once()
+
+
+def test_delete_rolls_back_chunk_with_undelivered_events(
+    mocker,
+    event_producer,
+    notification_event_producer,  # noqa: ARG001
+    db_create_multiple_hosts,
+    api_delete_host,
+    db_get_hosts,
+    inventory_config,
+):
+    mocker.patch("lib.host_delete.kafka_available")
+    inventory_config.host_delete_chunk_size = 3
+    hosts = db_create_multiple_hosts(how_many=3)
+    host_id_list = [str(host.id) for host in hosts]
+    produced_callbacks = []
+
+    def _produce(*args, callback, **kwargs):  # noqa: ARG001
+        produced_callbacks.append(callback)
+
+    def _flush(timeout):  # noqa: ARG001
+        error = mock.MagicMock()
+        for index, callback in enumerate(produced_callbacks):
+            callback(error if index == 1 else None, mock.MagicMock())
+        return 0
+
+    event_producer._kafka_producer.produce.side_effect = _produce
+    event_producer._kafka_producer.flush.side_effect = _flush
+    mocker.patch("app.queue.event_producer.message_not_produced")
+    invalidate_orgs = mocker.patch("lib.host_delete.host_count_cache.invalidate_orgs")
+
+    response_status, _ = api_delete_host(",".join(host_id_list))
+
+    assert_response_status(response_status, expected_status=500)
+    assert db_get_hosts(host_id_list).count() == 3
+    assert event_producer._kafka_producer.produce.call_count == 3
+    invalidate_orgs.assert_not_called()
+
+
 @pytest.mark.usefixtures("event_producer_mock", "notification_event_producer_mock")
 def test_delete_host_that_belongs_to_group_success(
     db_create_group,
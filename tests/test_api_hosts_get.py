@@ -12,7 +12,14 @@ import pytest
 from pytest_mock import MockerFixture
 from pytest_subtests import SubTests
 
+from api.filtering.db_filters import _is_table_already_joined
+from api.filtering.db_filters import query_filters
+from api.host_query_db import _join_referenced_group_tables
+from api.host_query_db import params_to_order_by
+from app.auth.identity import Identity
 from app.exceptions import IdsNotFoundError
+from app.models import HostGroupAssoc
+from app.models import db
 from app.models.host import Host
 from tests.helpers.api_utils import HOST_READ_ALLOWED_RBAC_RESPONSE_FILES
 from tests.helpers.api_utils import HOST_READ_PROHIBITED_RBAC_RESPONSE_FILES
@@ -965,6 +972,38 @@ def test_query_group_id_nonexistent_uuid(api_get, db_create_group_with_hosts):
     assert response_data["results"] == []
 
 
+def test_query_host_in_multiple_groups_is_not_repeated(
+    db_create_group, db_create_host, db_create_host_group_assoc, api_get
+):
+    """Test that a host matching several of the filtered groups is returned and counted once."""
+    group1 = db_create_group("test_group_1")
+    group2 = db_create_group("test_group_2")
+    host_id = db_create_host().id
+    db_create_host_group_assoc(host_id, group1.id)
+    db_create_host_group_assoc(host_id, group2.id)
+
+    for query in (f"?group_id={group1.id}&group_id={group2.id}", "?group_name=test_group_1&group_name=test_group_2"):
+        response_status, response_data = api_get(build_hosts_url(query=query))
+
+        assert response_status == 200
+        assert response_data["total"] == 1
+        assert [result["id"] for result in response_data["results"]] == [str(host_id)]
+
+
+def test_host_list_query_joins_groups_only_when_referenced(flask_app):  # noqa: ARG001
+    identity = Identity(USER_IDENTITY)
+    group_filters, query_base = query_filters(
+        group_name=["test_group"], rbac_filter={"groups": [None]}, identity=identity
+    )
+    assert not _is_table_already_joined(
+        _join_referenced_group_tables(query_base, *group_filters, *params_to_order_by("group_name", "ASC")),
+        HostGroupAssoc,
+    )
+
+    assoc_filter = HostGroupAssoc.group_id.is_(None)
+    assert _is_table_already_joined(_join_referenced_group_tables(query_base, assoc_filter), HostGroupAssoc)
+
+
 def test_query_hosts_filter_updated_start_end(mq_create_or_update_host, api_get):
     host_list = [mq_create_or_update_host(minimal_host(insights_id=generate_uuid())) for _ in range(3)]
 
@@ -1193,6 +1232,100 @@ def test_get_hosts_order_by_operating_system(mq_create_or_update_host, api_get,
         assert ordered_insights_ids[index] == response_data["results"][index]["insights_id"]
 
 
+def _read_hosts_by_cursor(api_get, query):
+    host_ids = []
+    response_status, response_data = api_get(build_hosts_url(query=query))
+    while True:
+        assert response_status == 200
+        host_ids += [host["id"] for host in response_data["results"]]
+        if "next_cursor" not in response_data:
+            return host_ids, response_data
+        response_status, response_data = api_get(
+            build_hosts_url(query=f"{query}&cursor={response_data['next_cursor']}")
+        )
+
+
+@pytest.mark.parametrize(
+    "order_query",
+    (
+        "",
+        "&order_by=updated&order_how=ASC",
+        "&order_by=display_name",
+        "&order_by=display_name&order_how=DESC",
+        "&order_by=last_check_in&order_how=ASC",
+        "&order_by=last_check_in&order_how=DESC",
+    ),
+)
+def test_get_hosts_cursor_pagination_matches_offset_pagination(db_create_host, api_get, order_query):
+    # Repeated display names and check-in times make the tie-breakers matter
+    hosts = [db_create_host(extra_data={"display_name": f"host-{index % 3}"}) for index in range(7)]
+    Host.query.filter(Host.id.in_([host.id for host in hosts[:4]])).update({"last_check_in": hosts[0].last_check_in})
+    db.session.commit()
+
+    _, all_hosts = api_get(build_hosts_url(query=f"?per_page=100{order_query}"))
+    host_ids, last_page = _read_hosts_by_cursor(api_get, f"?per_page=3{order_query}")
+
+    assert host_ids == [host["id"] for host in all_hosts["results"]]
+    assert last_page["page"] == 3
+    assert last_page["total"] == 7
+
+
+def test_get_hosts_cursor_pagination_doesnt_count_again(db_create_host, api_get):
+    for _ in range(3):
+        db_create_host()
+
+    response_status, response_data = api_get(build_hosts_url(query="?per_page=2"))
+    assert response_status == 200
+    assert response_data["total"] == 3
+
+    # The count of the first page is carried over by the cursor
+    db_create_host()
+    response_status, response_data = api_get(
+        build_hosts_url(query=f"?per_page=2&cursor={response_data['next_cursor']}")
+    )
+    assert response_status == 200
+    assert response_data["total"] == 3
+    assert response_data["page"] == 2
+
+
+def test_get_hosts_no_cursor_on_last_page(db_create_host, api_get):
+    for _ in range(2):
+        db_create_host()
+
+    response_status, response_data = api_get(build_hosts_url(query="?per_page=2"))
+
+    assert response_status == 200
+    assert "next_cursor" not in response_data
+
+
+@pytest.mark.parametrize("order_by", ("group_name", "operating_system"))
+def test_get_hosts_no_cursor_for_unsupported_ordering(db_create_host, api_get, order_by):
+    for _ in range(3):
+        db_create_host()
+
+    response_status, response_data = api_get(build_hosts_url(query=f"?per_page=2&order_by={order_by}"))
+
+    assert response_status == 200
+    assert "next_cursor" not in response_data
+
+
+def test_get_hosts_invalid_cursor(db_create_host, api_get, subtests):
+    for _ in range(3):
+        db_create_host()
+    _, response_data = api_get(build_hosts_url(query="?per_page=2"))
+    cursor = response_data["next_cursor"]
+
+    for query in (
+        "?cursor=not-a-cursor",
+        f"?cursor={cursor[:-4]}",
+        f"?cursor={cursor}&order_by=display_name",
+        f"?cursor={cursor}&order_by=group_name",
+    ):
+        with subtests.test(query=query):
+            response_status, _ = api_get(build_hosts_url(query=query))
+            assert response_status == 400
+
+
 @pytest.mark.parametrize("num_hosts_to_query", (1, 3))
 @pytest.mark.parametrize("order_by", ("updated", "display_name", "group_name", "operating_system", "last_check_in"))
 @pytest.mark.parametrize("order_how", ("ASC", "DESC"))
@@ -9,6 +9,7 @@ from unittest.mock import patch
 import pytest
 
 from app.auth.identity import from_auth_header
+from app.models import db
 from app.queue.event_producer import MessageDetails
 from app.serialization import deserialize_canonical_facts
 from app.serialization import serialize_canonical_facts
@@ -335,6 +336,34 @@ def test_patch_by_namespace_on_multiple_hosts_produces_multiple_update_events(
     assert event_producer.write_event.call_count == 2
 
 
+def test_patch_on_multiple_hosts_commits_and_flushes_once(
+    event_producer, inventory_config, db_create_multiple_hosts, api_patch, mocker
+):
+    created_hosts = db_create_multiple_hosts(how_many=3)
+    commit = mocker.spy(db.session, "commit")
+
+    response_status, _ = api_patch(build_hosts_url(host_list_or_id=created_hosts), {"display_name": "patched"})
+
+    assert_response_status(response_status, expected_status=200)
+    commit.assert_called_once()
+    assert event_producer._kafka_producer.produce.call_count == 3
+    event_producer._kafka_producer.flush.assert_called_once_with(inventory_config.host_update_flush_timeout)
+
+
+def test_patch_reports_undelivered_update_events_per_host(event_producer, db_create_multiple_hosts, api_patch, caplog):
+    created_hosts = db_create_multiple_hosts(how_many=2, extra_data={"facts": DB_FACTS})
+    # Nothing gets delivered before the flush times out
+    event_producer._kafka_producer.flush.return_value = 2
+
+    facts_url = build_facts_url(host_list_or_id=created_hosts, namespace=DB_FACTS_NAMESPACE)
+    response_status, _ = api_patch(facts_url, DB_NEW_FACTS)
+
+    assert_response_status(response_status, expected_status=200)
+    assert "Update events not delivered for hosts" in caplog.text
+    for host in created_hosts:
+        assert str(host.id) in caplog.text
+
+
 @pytest.mark.parametrize(
     "patched_function,error",
     (
@@ -15,7 +15,10 @@ from app.logging import get_logger
 from app.models import Host
 from app.models import ProviderType
 from app.utils import HostWrapper
+from lib import host_repository
+from lib.host_repository import CanonicalFactsIndex
 from lib.host_repository import find_existing_host
+from lib.host_repository import prefetch_hosts_by_canonical_facts
 from tests.helpers.db_utils import assert_host_exists_in_db
 from tests.helpers.db_utils import assert_host_missing_from_db
 from tests.helpers.db_utils import db_host
@@ -511,3 +514,47 @@ def test_deduplication_culled_host(
     updated_host = mq_create_or_update_host(minimal_host(**canonical_facts, reporter="puptoo"))
     assert str(updated_host.id) != str(created_host.id)
     assert_host_exists_in_db(updated_host.id, canonical_facts)
+
+
+def test_find_existing_host_in_prefetched_index_matches_db(db_create_host: Callable[..., Host], mocker):
+    """The batch index must pick the same host as the per-fact DB queries, with the same priorities."""
+    provider_id, subman_id, insights_id = generate_uuid(), generate_uuid(), generate_uuid()
+    aws_host = db_create_host(
+        host=minimal_db_host(provider_id=provider_id, provider_type=ProviderType.AWS.value, insights_id=insights_id)
+    )
+    subman_host = db_create_host(host=minimal_db_host(subscription_manager_id=subman_id))
+    ibm_host = db_create_host(
+        host=minimal_db_host(
+            provider_id=generate_uuid(), provider_type=ProviderType.IBM.value, insights_id=insights_id
+        )
+    )
+
+    search_facts_list = [
+        {"provider_id": provider_id, "provider_type": ProviderType.AWS.value},
+        {"provider_id": provider_id, "provider_type": ProviderType.IBM.value},
+        {"provider_id": provider_id, "provider_type": ProviderType.AWS.value, "subscription_manager_id": subman_id},
+        {"subscription_manager_id": subman_id, "insights_id": insights_id},
+        {"subscription_manager_id": subman_id.upper()},
+        {"insights_id": insights_id},
+        {"insights_id": generate_uuid()},
+    ]
+    identity = Identity(SYSTEM_IDENTITY)
+    expected = [find_existing_host(identity, search_facts) for search_facts in search_facts_list]
+    assert [host.id if host else None for host in expected] == [
+        aws_host.id,
+        None,
+        aws_host.id,
+        subman_host.id,
+        None,
+        ibm_host.id,
+        None,
+    ]
+
+    db_query_spy = mocker.spy(host_repository, "multiple_canonical_facts_host_query")
+    with CanonicalFactsIndex():
+        prefetch_hosts_by_canonical_facts({identity.org_id: search_facts_list[:-1]})
+        found = [find_existing_host(identity, search_facts) for search_facts in search_facts_list]
+
+    assert found == expected
+    # Only the facts that were not prefetched fall back to the DB query
+    assert db_query_spy.call_count == 1
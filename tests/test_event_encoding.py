@@ -0,0 +1,82 @@
+import json
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+from uuid import uuid4
+
+import pytest
+
+from app.logging import threadctx
+from app.queue import events
+from app.queue.events import EVENT_ENCODERS
+from app.queue.events import EventType
+from app.queue.events import build_event
+from app.queue.events import host_create_update_event
+from app.queue.events import host_delete_event
+from tests.helpers.db_utils import db_host
+from tests.helpers.test_utils import generate_uuid
+
+GOLDEN_DATA_DIR = Path(__file__).parent / "helpers" / "event-golden-data"
+GOLDEN_CASES = sorted(path.name.removesuffix(".event.json") for path in GOLDEN_DATA_DIR.glob("*.event.json"))
+
+
+def _golden_event(case):
+    golden = json.loads((GOLDEN_DATA_DIR / f"{case}.event.json").read_text())
+    event = golden["event"]
+    event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+    return getattr(events, golden["schema"]), event
+
+
+@pytest.mark.parametrize("case", GOLDEN_CASES)
+def test_events_match_golden_files(case):
+    schema, event = _golden_event(case)
+    expected = (GOLDEN_DATA_DIR / f"{case}.expected.json").read_text()
+
+    assert json.dumps(EVENT_ENCODERS[schema](event)) == expected
+    # The golden files are what the marshmallow schemas produce
+    assert schema().dumps(event) == expected
+
+
+@pytest.mark.parametrize("event_type", (EventType.created, EventType.updated))
+def test_create_update_events_match_schema_with_python_values(event_type):
+    host = {
+        "id": uuid4(),
+        "org_id": "3340851",
+        "insights_id": UUID(generate_uuid()),
+        "subscription_manager_id": generate_uuid(),
+        "display_name": b"bytes-host",
+        "ip_addresses": ["10.0.0.1", None],
+        "tags": [{"namespace": "ns", "key": "key", "value": "value", "extra": "dropped"}],
+        "facts": [None],
+        "system_profile": {"number_of_cpus": 2},
+        "groups": [{"id": generate_uuid(), "name": "group"}],
+        "openshift_cluster_id": uuid4(),
+    }
+    threadctx.request_id = generate_uuid()
+
+    schema, event = host_create_update_event(event_type, host, platform_metadata={"request_id": "-1"})
+
+    assert json.dumps(EVENT_ENCODERS[schema](event)) == schema().dumps(event)
+
+
+@pytest.mark.parametrize("initiated_by_frontend", (True, False))
+def test_delete_events_match_schema_for_hosts(flask_app, initiated_by_frontend):  # noqa: ARG001
+    host = db_host()
+    host.id = uuid4()
+    threadctx.request_id = generate_uuid()
+
+    schema, event = host_delete_event(EventType.delete, host, initiated_by_frontend=initiated_by_frontend)
+
+    assert json.dumps(EVENT_ENCODERS[schema](event)) == schema().dumps(event)
+
+
+def test_build_event_uses_the_encoder():
+    threadctx.request_id = generate_uuid()
+    host = {"id": generate_uuid(), "org_id": "3340851", "display_name": "host"}
+
+    event = json.loads(build_event(EventType.updated, host))
+
+    assert event["host"] == host
+    assert event["type"] == "updated"
+    assert datetime.fromisoformat(event["timestamp"]).tzinfo == UTC
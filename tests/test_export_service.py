@@ -1,5 +1,6 @@
 import io
 import json
+from copy import deepcopy
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
@@ -12,6 +13,7 @@ from sqlalchemy.orm.exc import ObjectDeletedError
 from app.auth.identity import Identity
 from app.culling import Timestamps
 from app.culling import _Config as CullingConfig
+from app.queue.export_service import _export_upload_body
 from app.queue.export_service import _format_export_data
 from app.queue.export_service import create_export
 from app.queue.export_service import get_host_list
@@ -240,7 +242,7 @@ def test_do_not_export_culled_hosts(flask_app, db_create_host, db_create_stalene
             db_create_host()
 
         identity = Identity(USER_IDENTITY)
-        host_list = get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config)
+        host_list = list(get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config))
 
         assert len(host_list) == 0
 
@@ -249,7 +251,7 @@ def test_export_one_host(flask_app, db_create_host, inventory_config):
     with flask_app.app.app_context():
         db_create_host()
         identity = Identity(USER_IDENTITY)
-        host_list = get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config)
+        host_list = list(get_host_list(identity=identity, rbac_filter=None, inventory_config=inventory_config))
 
         assert len(host_list) == 1
 
@@ -264,3 +266,38 @@ def test_export_catches_db_error(flask_app, inventory_config, mocker):
 
         create_export(validated_msg, base64_x_rh_identity, inventory_config)
         handle_export_error_mock.assert_called_once()
+
+
+@pytest.mark.parametrize("format", ("json", "csv"))
+def test_export_upload_body_is_streamed(format, mocker):
+    hosts = [deepcopy(host) for host in es_utils.EXPORT_DATA * 3]
+    expected = _format_export_data(deepcopy(hosts), format).encode("utf-8")
+    mocker.patch("app.queue.export_service.EXPORT_UPLOAD_CHUNK_SIZE", 16)
+
+    chunks = list(_export_upload_body(iter(hosts), format))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == expected
+
+
+def test_export_json_array_matches_json_dumps():
+    assert _format_export_data(iter([]), "json") == json.dumps([])
+    assert _format_export_data(iter(es_utils.EXPORT_DATA), "json") == json.dumps(es_utils.EXPORT_DATA)
+
+
+@mock.patch("requests.Session.post", autospec=True)
+def test_create_export_uploads_generator_body(mock_post, flask_app, db_create_multiple_hosts, inventory_config):
+    with flask_app.app.app_context():
+        db_create_multiple_hosts(how_many=3)
+        uploaded = []
+
+        def _post(_self, *, data, **_):
+            uploaded.append(b"".join(data) if not isinstance(data, (bytes, str)) else data)
+            return mock.Mock(status_code=202, text="")
+
+        mock_post.side_effect = _post
+        validated_msg = parse_export_service_message(es_utils.create_export_message_mock())
+        base64_x_rh_identity = validated_msg["data"]["resource_request"]["x_rh_identity"]
+
+        assert create_export(validated_msg, base64_x_rh_identity, inventory_config)
+        assert len(json.loads(uploaded[0])) == 3
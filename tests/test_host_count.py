@@ -0,0 +1,189 @@
+import json
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy import select
+
+from app.models import Host
+from app.models import db
+from app.queue.host_mq import IngressMessageConsumer
+from lib.host_count_cache import HostCountCache
+from lib.host_count_cache import host_count_cache
+from tests.helpers.api_utils import assert_response_status
+from tests.helpers.api_utils import build_host_view_url
+from tests.helpers.api_utils import build_hosts_url
+from tests.helpers.mq_utils import wrap_message
+from tests.helpers.test_utils import get_platform_metadata
+from tests.helpers.test_utils import minimal_host
+
+
+@pytest.fixture
+def clean_host_count_cache():
+    host_count_cache.clear()
+    yield
+    host_count_cache.clear()
+
+
+def _total(api_get, url):
+    response_status, response_data = api_get(url)
+    assert_response_status(response_status, 200)
+    return response_data["total"], response_data["total_mode"]
+
+
+def test_cache_entries_expire():
+    cache = HostCountCache()
+    cache.put(("org", 0, "key"), 5, ttl=60, max_size=10)
+    cache.put(("org", 0, "expired"), 5, ttl=0, max_size=10)
+
+    assert cache.get(("org", 0, "key")) == 5
+    assert cache.get(("org", 0, "expired")) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = HostCountCache()
+    cache.put(("org", 0, "a"), 1, ttl=60, max_size=2)
+    cache.put(("org", 0, "b"), 2, ttl=60, max_size=2)
+    cache.get(("org", 0, "a"))
+    cache.put(("org", 0, "c"), 3, ttl=60, max_size=2)
+
+    assert cache.get(("org", 0, "a")) == 1
+    assert cache.get(("org", 0, "b")) is None
+    assert cache.get(("org", 0, "c")) == 3
+
+
+def test_invalidate_orgs_drops_entries_and_bumps_generations():
+    cache = HostCountCache()
+    cache.put(("org1", 0, "key"), 1, ttl=60, max_size=10)
+    cache.put(("org2", 0, "key"), 2, ttl=60, max_size=10)
+    mock_client = MagicMock()
+
+    with patch.multiple(
+        "api.cache",
+        _get_redis_client=MagicMock(return_value=mock_client),
+        CACHE_CONFIG={"CACHE_TYPE": "RedisCache"},
+    ):
+        cache.invalidate_orgs(["org1"])
+
+    assert cache.get(("org1", 0, "key")) is None
+    assert cache.get(("org2", 0, "key")) == 2
+    mock_client.pipeline.return_value.incr.assert_called_once_with("hbi:host_counts_generation:org1")
+    mock_client.pipeline.return_value.execute.assert_called_once()
+
+
+def test_exact_total_is_the_default(db_create_multiple_hosts, api_get):
+    db_create_multiple_hosts(how_many=3)
+
+    assert _total(api_get, build_hosts_url(query="?per_page=1")) == (3, "exact")
+
+
+def test_exact_total_with_group_join(db_create_group_with_hosts, db_create_multiple_hosts, api_get):
+    db_create_group_with_hosts("group1", 2)
+    db_create_multiple_hosts(how_many=3)
+
+    assert _total(api_get, build_hosts_url(query="?group_name=group1&total_mode=exact")) == (2, "exact")
+    assert _total(api_get, build_hosts_url(query="?total_mode=exact")) == (5, "exact")
+
+
+def test_configured_total_mode(inventory_config, db_create_multiple_hosts, api_get):
+    inventory_config.host_list_total_mode = "estimate"
+    db_create_multiple_hosts(how_many=3)
+
+    total, total_mode = _total(api_get, build_hosts_url())
+
+    assert total_mode == "estimate"
+    assert total >= 0
+
+
+@pytest.mark.parametrize("build_url", (build_hosts_url, build_host_view_url))
+def test_estimated_total(db_create_multiple_hosts, api_get, build_url):
+    db_create_multiple_hosts(how_many=3)
+
+    total, total_mode = _total(api_get, build_url(query="?total_mode=estimate"))
+
+    assert total_mode == "estimate"
+    assert total >= 0
+
+
+@pytest.mark.usefixtures("clean_host_count_cache")
+def test_cached_total_is_reused(db_create_multiple_hosts, db_create_host, api_get):
+    db_create_multiple_hosts(how_many=3)
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (3, "cached")
+
+    # Hosts written outside of ingress don't invalidate the cache, so the count isn't run again
+    db_create_host()
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached&per_page=2")) == (3, "cached")
+    assert _total(api_get, build_hosts_url(query="?total_mode=exact")) == (4, "exact")
+
+
+@pytest.mark.usefixtures("clean_host_count_cache")
+def test_cached_total_is_keyed_on_filters(db_create_host, api_get):
+    db_create_host(extra_data={"display_name": "host-a"})
+    db_create_host(extra_data={"display_name": "host-b"})
+
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (2, "cached")
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached&display_name=host-a")) == (1, "cached")
+
+
+@pytest.mark.usefixtures("clean_host_count_cache")
+def test_cached_total_is_invalidated_on_ingress(
+    mocker, flask_app, event_producer_mock, notification_event_producer_mock, db_create_multiple_hosts, api_get
+):
+    db_create_multiple_hosts(how_many=3)
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (3, "cached")
+
+    consumer = IngressMessageConsumer(mocker.Mock(), flask_app, event_producer_mock, notification_event_producer_mock)
+    message = wrap_message(minimal_host().data(), platform_metadata=get_platform_metadata())
+    consumer.processed_rows = [consumer.handle_message(json.dumps(message))]
+    db.session.commit()
+    consumer.post_process_rows()
+
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (4, "cached")
+
+
+@pytest.mark.usefixtures("clean_host_count_cache", "event_producer_mock", "notification_event_producer_mock")
+def test_cached_total_is_invalidated_on_delete(db_create_multiple_hosts, api_delete_host, api_get):
+    hosts = db_create_multiple_hosts(how_many=3)
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (3, "cached")
+
+    response_status, _ = api_delete_host(hosts[0].id)
+    assert_response_status(response_status, 200)
+
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (2, "cached")
+
+
+@pytest.mark.usefixtures("clean_host_count_cache", "event_producer_mock", "notification_event_producer_mock")
+def test_cached_total_is_invalidated_after_delete_commit(mocker, db_create_multiple_hosts, api_delete_host):
+    hosts = db_create_multiple_hosts(how_many=3)
+    committed_counts = []
+    invalidate_orgs = host_count_cache.invalidate_orgs
+
+    def count_committed_hosts(org_ids):
+        # Another connection only sees the deletion once it's committed
+        with db.engine.connect() as connection:
+            committed_counts.append(connection.execute(select(func.count()).select_from(Host)).scalar())
+        invalidate_orgs(org_ids)
+
+    mocker.patch.object(host_count_cache, "invalidate_orgs", side_effect=count_committed_hosts)
+
+    response_status, _ = api_delete_host(hosts[0].id)
+    assert_response_status(response_status, 200)
+
+    assert committed_counts == [2]
+
+
+def test_cached_total_falls_back_to_exact_when_disabled(inventory_config, db_create_multiple_hosts, api_get):
+    inventory_config.host_count_cache_ttl = 0
+    db_create_multiple_hosts(how_many=2)
+
+    assert _total(api_get, build_hosts_url(query="?total_mode=cached")) == (2, "exact")
+
+
+def test_cursor_pages_keep_the_total_mode(db_create_multiple_hosts, api_get):
+    db_create_multiple_hosts(how_many=3)
+
+    _, response_data = api_get(build_hosts_url(query="?per_page=2&total_mode=estimate"))
+    _, response_data = api_get(build_hosts_url(query=f"?per_page=2&cursor={response_data['next_cursor']}"))
+
+    assert response_data["total_mode"] == "estimate"
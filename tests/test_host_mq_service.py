@@ -25,14 +25,18 @@ from api.host_query import staleness_timestamps
 from api.staleness_query import get_staleness_obj
 from app.auth.identity import Identity
 from app.auth.identity import create_mock_identity_with_org_id
+from app.config import Config
 from app.culling import CONVENTIONAL_TIME_TO_DELETE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
 from app.exceptions import InventoryException
 from app.exceptions import ValidationException
 from app.logging import threadctx
+from app.models import Group
 from app.models import Host
+from app.models import HostGroupAssoc
 from app.models import db
+from app.queue import host_mq
 from app.queue.event_producer import EventProducer
 from app.queue.events import EventType
 from app.queue.host_mq import MAX_RETRIES
@@ -43,6 +47,9 @@ from app.queue.host_mq import WorkspaceMessageConsumer
 from app.queue.host_mq import _sanitize_json_object_for_postgres
 from app.queue.host_mq import write_add_update_event_message
 from app.utils import Tag
+from lib import group_repository
+from lib import host_repository
+from lib import outbox_repository
 from lib.host_repository import AddHostResult
 from tests.helpers.db_utils import create_reference_host_in_db
 from tests.helpers.db_utils import minimal_db_host
@@ -2665,6 +2672,280 @@ def test_batch_mq_do_dedup_in_db(
     assert db_hosts[0].subscription_manager_id == msg_host2["subscription_manager_id"]
 
 
+def test_batch_mq_dedup_uses_prefetched_index(
+    mocker: MockerFixture,
+    event_producer: EventProducer,
+    flask_app: FlaskApp,
+    db_get_hosts_by_subman_id: Callable[[str], list[Host]],
+    db_create_host: Callable[..., Host],
+):
+    """The canonical facts of the whole batch are resolved up front, without a DB query per message."""
+    subman_ids = [generate_uuid() for _ in range(3)]
+    existing_hosts = [db_create_host(host=minimal_db_host(subscription_manager_id=smid)) for smid in subman_ids]
+
+    msgs = [
+        json.dumps(
+            wrap_message(minimal_host(subscription_manager_id=smid).data(), "add_host", get_platform_metadata())
+        )
+        for smid in subman_ids
+    ]
+
+    mocker.patch(
+        "app.queue.host_mq.inventory_config",
+        return_value=SimpleNamespace(
+            mq_db_batch_max_messages=3,
+            mq_db_batch_max_seconds=1,
+            culling_stale_warning_offset_delta=1,
+            culling_culled_offset_delta=1,
+        ),
+    )
+    prefetch_spy = mocker.spy(host_repository, "prefetch_hosts_by_canonical_facts")
+    db_query_spy = mocker.spy(host_repository, "multiple_canonical_facts_host_query")
+
+    fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
+
+    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer.event_loop(mocker.Mock(side_effect=(False, True)))
+
+    prefetch_spy.assert_called_once()
+    assert db_query_spy.call_count == 0
+    for smid, existing_host in zip(subman_ids, existing_hosts, strict=True):
+        db_hosts = db_get_hosts_by_subman_id(smid)
+        assert len(db_hosts) == 1
+        assert db_hosts[0].id == existing_host.id
+
+
+def test_batch_mq_resolves_ungrouped_group_up_front(
+    mocker: MockerFixture,
+    event_producer: EventProducer,
+    flask_app: FlaskApp,
+    db_create_group: Callable[..., Group],
+    db_get_hosts_by_subman_id: Callable[[str], list[Host]],
+):
+    """The ungrouped group of the batch's orgs is loaded once, before the messages are processed."""
+    group = db_create_group("Ungrouped Hosts", ungrouped=True)
+    subman_ids = [generate_uuid() for _ in range(3)]
+    msgs = [
+        json.dumps(
+            wrap_message(minimal_host(subscription_manager_id=smid).data(), "add_host", get_platform_metadata())
+        )
+        for smid in subman_ids
+    ]
+
+    mocker.patch(
+        "app.queue.host_mq.inventory_config",
+        return_value=SimpleNamespace(
+            mq_db_batch_max_messages=3,
+            mq_db_batch_max_seconds=1,
+            culling_stale_warning_offset_delta=1,
+            culling_culled_offset_delta=1,
+        ),
+    )
+    get_ungrouped_spy = mocker.spy(group_repository, "get_ungrouped_group")
+    prefetch_spy = mocker.spy(group_repository, "prefetch_ungrouped_groups")
+
+    fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
+
+    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer.event_loop(mocker.Mock(side_effect=(False, True)))
+
+    prefetch_spy.assert_called_once_with({SYSTEM_IDENTITY["org_id"]: None})
+    assert get_ungrouped_spy.call_count == 0
+    for smid in subman_ids:
+        db_hosts = db_get_hosts_by_subman_id(smid)
+        assert len(db_hosts) == 1
+        assert db_hosts[0].groups[0]["id"] == str(group.id)
+
+
+def test_batch_mq_does_not_cache_ungrouped_group_of_rolled_back_batch(
+    mocker: MockerFixture,
+    event_producer: EventProducer,
+    flask_app: FlaskApp,
+    inventory_config: Config,
+    db_get_hosts_by_subman_id: Callable[[str], list[Host]],
+):
+    """An ungrouped group created by a batch that rolls back is not reused by the next batch."""
+    inventory_config.ungrouped_group_cache_ttl = 60
+    group_repository.SerializedUngroupedGroupCache.clear()
+    subman_ids = [generate_uuid() for _ in range(2)]
+    batches = [
+        [
+            FakeMessage(
+                message=json.dumps(
+                    wrap_message(
+                        minimal_host(subscription_manager_id=smid).data(), "add_host", get_platform_metadata()
+                    )
+                )
+            )
+        ]
+        for smid in subman_ids
+    ]
+
+    mocker.patch(
+        "app.queue.host_mq.inventory_config",
+        return_value=SimpleNamespace(
+            mq_db_batch_max_messages=1,
+            mq_db_batch_max_seconds=1,
+            culling_stale_warning_offset_delta=1,
+            culling_culled_offset_delta=1,
+        ),
+    )
+    # The first batch creates the ungrouped group and fails to commit, the retry consumes the second one
+    commit = db.session.commit
+    failures = [IntegrityError("Simulated failure", None, Exception())]
+
+    def commit_or_fail():
+        if failures:
+            raise failures.pop()
+        commit()
+
+    mocker.patch.object(db.session, "commit", side_effect=commit_or_fail)
+    fake_consumer = mocker.Mock(**{"consume.side_effect": batches})
+
+    try:
+        consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+        consumer.event_loop(mocker.Mock(side_effect=(False, True)))
+
+        assert db_get_hosts_by_subman_id(subman_ids[0]) == []
+        db_hosts = db_get_hosts_by_subman_id(subman_ids[1])
+        assert len(db_hosts) == 1
+        ungrouped_group = Group.query.filter(
+            Group.org_id == SYSTEM_IDENTITY["org_id"], Group.ungrouped.is_(True)
+        ).one()
+        assert db_hosts[0].groups[0]["id"] == str(ungrouped_group.id)
+        # The group of the second batch was created in its transaction too, it's cached once read after the commit
+        assert group_repository.SerializedUngroupedGroupCache.get(SYSTEM_IDENTITY["org_id"]) is None
+    finally:
+        group_repository.SerializedUngroupedGroupCache.clear()
+
+
+def test_batch_mq_bulk_inserts_new_hosts(
+    mocker: MockerFixture,
+    event_producer: EventProducer,
+    flask_app: FlaskApp,
+    inventory_config: Config,
+    db_get_hosts_by_subman_id: Callable[[str], list[Host]],
+):
+    """With bulk inserts enabled, new hosts of a batch are written at once and still get outbox entries."""
+    inventory_config.mq_bulk_insert_new_hosts = True
+    subman_ids = [generate_uuid() for _ in range(3)]
+    hosts = [
+        minimal_host(subscription_manager_id=smid, system_profile=valid_system_profile(owner_id=OWNER_ID))
+        for smid in subman_ids
+    ]
+    # The last message updates the host created by the first one, before the batch is written
+    hosts.append(minimal_host(subscription_manager_id=subman_ids[0], display_name="updated-in-batch"))
+    msgs = [json.dumps(wrap_message(host.data(), "add_host", get_platform_metadata())) for host in hosts]
+
+    mocker.patch(
+        "app.queue.host_mq.inventory_config",
+        return_value=SimpleNamespace(
+            mq_db_batch_max_messages=4,
+            mq_db_batch_max_seconds=1,
+            culling_stale_warning_offset_delta=1,
+            culling_culled_offset_delta=1,
+        ),
+    )
+    orm_create_spy = mocker.spy(host_repository, "create_new_host")
+    outbox_spy = mocker.spy(outbox_repository, "write_event_to_outbox")
+    fake_consumer = mocker.Mock(**{"consume.side_effect": [[FakeMessage(message=msg) for msg in msgs]]})
+
+    consumer = IngressMessageConsumer(fake_consumer, flask_app, event_producer, mocker.Mock())
+    consumer.event_loop(mocker.Mock(side_effect=(False, True)))
+
+    orm_create_spy.assert_not_called()
+    created_host_ids = set()
+    for smid in subman_ids:
+        db_hosts = db_get_hosts_by_subman_id(smid)
+        assert len(db_hosts) == 1
+        db_host = db_hosts[0]
+        created_host_ids.add(str(db_host.id))
+        assert db_host.static_system_profile is not None
+        assert db_host.dynamic_system_profile is not None
+        assert db_host.created_on is not None
+        assert len(db_host.groups) == 1
+        assert db.session.query(HostGroupAssoc).filter(HostGroupAssoc.host_id == db_host.id).count() == 1
+
+    assert db_get_hosts_by_subman_id(subman_ids[0])[0].display_name == "updated-in-batch"
+    assert {call.args[1] for call in outbox_spy.call_args_list} == created_host_ids
+    assert event_producer._kafka_producer.produce.call_count == 4
+
+
+def test_mq_heartbeat_fast_path_for_unchanged_host(
+    mocker: MockerFixture,
+    mq_create_or_update_host: Callable,
+    db_get_host: Callable[[str], Host | None],
+    inventory_config: Config,
+):
+    """A check-in with the same content as the last full update only updates the check-in and staleness."""
+    inventory_config.mq_heartbeat_fast_path = True
+    host = minimal_host(
+        subscription_manager_id=generate_uuid(),
+        system_profile=valid_system_profile(owner_id=OWNER_ID),
+        tags=[{"namespace": "ns1", "key": "key1", "value": "val1"}],
+    )
+    created_host = mq_create_or_update_host(host)
+    first_check_in = db_get_host(created_host.id).last_check_in
+    update_spy = mocker.spy(Host, "update")
+    check_in_spy = mocker.spy(Host, "check_in")
+
+    updated_host = mq_create_or_update_host(host)
+
+    update_spy.assert_not_called()
+    check_in_spy.assert_called_once()
+    db_host = db_get_host(created_host.id)
+    assert db_host.last_check_in > first_check_in
+    assert db_host.per_reporter_staleness[host.reporter] == db_host.last_check_in.isoformat()
+    assert updated_host.system_profile == created_host.system_profile
+    assert updated_host.tags == created_host.tags
+
+
+def test_mq_heartbeat_fast_path_falls_back_to_full_update(
+    mocker: MockerFixture,
+    mq_create_or_update_host: Callable,
+    db_get_host: Callable[[str], Host | None],
+    inventory_config: Config,
+):
+    """Changed content, or a host changed by anything else since its last full update, gets a full update."""
+    inventory_config.mq_heartbeat_fast_path = True
+    host = minimal_host(
+        subscription_manager_id=generate_uuid(), system_profile=valid_system_profile(owner_id=OWNER_ID)
+    )
+    created_host = mq_create_or_update_host(host)
+    update_spy = mocker.spy(Host, "update")
+
+    # Changed system profile
+    host.system_profile = {**host.system_profile, "number_of_cpus": 64}
+    mq_create_or_update_host(host)
+    assert update_spy.call_count == 1
+    assert db_get_host(created_host.id).static_system_profile.number_of_cpus == 64
+
+    # Changed through the API since the last full update
+    db_host = db_get_host(created_host.id)
+    db_host.patch({"display_name": "patched-display-name"})
+    db.session.commit()
+    assert db_get_host(created_host.id).content_digest is None
+
+    mq_create_or_update_host(host)
+    assert update_spy.call_count == 2
+    assert db_get_host(created_host.id).content_digest is not None
+
+
+def test_mq_heartbeat_fast_path_disabled(
+    mocker: MockerFixture,
+    mq_create_or_update_host: Callable,
+    db_get_host: Callable[[str], Host | None],
+):
+    host = minimal_host(subscription_manager_id=generate_uuid())
+    created_host = mq_create_or_update_host(host)
+    update_spy = mocker.spy(Host, "update")
+
+    mq_create_or_update_host(host)
+
+    update_spy.assert_called_once()
+    assert db_get_host(created_host.id).content_digest is None
+
+
 def test_batch_mq_header_request_id_updates(mocker, flask_app):
     # Verifies that when messages are sent as part of the same batch,
     # the request_id used in the header is updated correctly.
@@ -2912,6 +3193,15 @@ def test_workspace_mq_create(workspace_message_consumer_mock, workspace_type, db
     assert found_group.ungrouped == (workspace_type == "ungrouped-hosts")
 
 
+def test_workspace_mq_invalidates_kessel_decisions(mocker, workspace_message_consumer_mock):
+    invalidate_mock = mocker.patch("app.queue.host_mq.invalidate_kessel_decisions")
+    message = generate_kessel_workspace_message("create", str(generate_uuid()), "test-kessel-workspace", "standard")
+
+    workspace_message_consumer_mock.handle_message(json.dumps(message))
+
+    invalidate_mock.assert_called_once_with(SYSTEM_IDENTITY["org_id"])
+
+
 @pytest.mark.parametrize(
     "workspace_type",
     (
@@ -3549,6 +3839,7 @@ def test_write_message_batch_flushes_once(mocker):
     mock_write = mocker.patch(
         "app.queue.host_mq.write_add_update_event_message",
     )
+    mock_get_existing_host_ids = mocker.patch("app.queue.host_mq.get_existing_host_ids", return_value=set())
 
     mock_results = []
     for _ in range(5):
@@ -3559,4 +3850,39 @@ def test_write_message_batch_flushes_once(mocker):
     write_message_batch(mock_event_producer, notification_producer, mock_results)
 
     assert mock_write.call_count == 5
+    mock_get_existing_host_ids.assert_called_once()
     assert mock_event_producer.flush.call_count == 1, "flush() should be called exactly once at the end of the batch"
+
+
+def test_write_message_batch_checks_host_existence_once(mocker, flask_app, db_create_host):  # noqa: ARG001
+    """Existence of all hosts in the batch is checked with one query, and deleted hosts are skipped."""
+    from app.queue.host_mq import write_message_batch
+
+    existing_host = db_create_host()
+    deleted_host = db_create_host()
+    deleted_host_id = deleted_host.id
+    db.session.delete(deleted_host)
+    db.session.commit()
+
+    mock_event_producer = mocker.Mock()
+    mock_host_exists = mocker.patch("app.queue.host_mq.host_exists")
+    get_existing_host_ids_spy = mocker.spy(host_mq, "get_existing_host_ids")
+    mocker.patch("app.queue.host_mq.send_notification")
+
+    results = []
+    for host_id in (existing_host.id, deleted_host_id):
+        host_row = mocker.Mock(id=host_id, org_id=existing_host.org_id, account=None, insights_id=generate_uuid())
+        results.append(OperationResult(host_row, {"request_id": None}, None, None, EventType.updated, mocker.Mock()))
+    mocker.patch(
+        "app.queue.host_mq.serialize_host",
+        side_effect=lambda row, *_args, **_kwargs: {"id": str(row.id), "org_id": row.org_id},
+    )
+    mocker.patch("app.queue.host_mq.build_event", return_value="event")
+    mocker.patch("app.queue.host_mq.extract_system_profile_fields_for_headers", return_value=(None, None, "False"))
+
+    write_message_batch(mock_event_producer, mocker.Mock(), results)
+
+    get_existing_host_ids_spy.assert_called_once()
+    mock_host_exists.assert_not_called()
+    mock_event_producer.write_event.assert_called_once()
+    assert mock_event_producer.write_event.call_args[0][1] == str(existing_host.id)
@@ -1,11 +1,15 @@
 import io
+import tracemalloc
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
 from app.config import Config
+from app.models import db
 from jobs import delete_hosts_s3
+from lib.job_checkpoint import load_checkpoint
+from lib.job_checkpoint import save_checkpoint
 
 # Patch constants and functions used in run
 BATCH_SIZE = 2
@@ -30,7 +34,10 @@ def mock_config():
 
 @pytest.fixture
 def mock_session():
-    return MagicMock(spec=["query", "commit"])
+    session = MagicMock(spec=["query", "commit", "get", "execute"])
+    # No checkpoint left by a previous run
+    session.get.return_value = None
+    return session
 
 
 @pytest.fixture
@@ -178,3 +185,132 @@ def test_run_handles_app_context(
     mock_app.app.app_context.assert_called_once()
     mock_ctx.__enter__.assert_called_once()
     mock_ctx.__exit__.assert_called_once()
+
+
+class _SyntheticCsvBody(io.RawIOBase):
+    """An S3 object body that generates its rows as it is read, so the test itself holds none of them."""
+
+    def __init__(self, row_count):
+        self._rows = (f"{index:036d}\n".encode() for index in range(row_count))
+        self._pending = b"subscription_manager_id\n"
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while len(self._pending) < len(buffer):
+            chunk = b"".join(row for _, row in zip(range(1000), self._rows, strict=False))
+            if not chunk:
+                break
+            self._pending += chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size], self._pending = self._pending[:size], self._pending[size:]
+        return size
+
+
+def _run_with_real_session(config, logger, flask_app, event_producer, notification_event_producer):
+    delete_hosts_s3.run(config, logger, db.session, event_producer, notification_event_producer, flask_app)
+
+
+@pytest.mark.usefixtures("patch_globals")
+def test_run_saves_and_clears_checkpoint(
+    mock_config,
+    mock_logger,
+    flask_app,
+    patch_get_s3_client,
+    patch_process_batch,
+    event_producer,
+    notification_event_producer,
+):
+    patch_get_s3_client.get_object.return_value = {"Body": io.BytesIO(b"header\nid1\nid2\nid3\n"), "ETag": "etag"}
+    saved_rows = []
+    patch_process_batch.side_effect = lambda *_: saved_rows.append(
+        (load_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME) or {}).get("row")
+    )
+
+    _run_with_real_session(mock_config, mock_logger, flask_app, event_producer, notification_event_producer)
+
+    # Each batch sees the checkpoint of the previous one
+    assert saved_rows == [None, 2]
+    assert load_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME) is None
+
+
+@pytest.mark.usefixtures("patch_globals")
+def test_run_resumes_after_checkpoint(
+    mock_config,
+    mock_logger,
+    flask_app,
+    patch_get_s3_client,
+    patch_process_batch,
+    event_producer,
+    notification_event_producer,
+):
+    csv_content = b"header\nid1\nid2\nid3\nid4\nid5\n"
+    patch_get_s3_client.get_object.return_value = {"Body": io.BytesIO(csv_content), "ETag": "etag"}
+    patch_process_batch.side_effect = [None, RuntimeError("DB went away")]
+
+    _run_with_real_session(mock_config, mock_logger, flask_app, event_producer, notification_event_producer)
+
+    # The first batch was deleted, the second one failed
+    assert load_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME) == {"etag": "etag", "row": 2}
+
+    patch_process_batch.reset_mock(side_effect=True)
+    patch_get_s3_client.get_object.return_value = {"Body": io.BytesIO(csv_content), "ETag": "etag"}
+
+    _run_with_real_session(mock_config, mock_logger, flask_app, event_producer, notification_event_producer)
+
+    assert [call[0][0] for call in patch_process_batch.call_args_list] == [["id3", "id4"], ["id5"]]
+    assert load_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME) is None
+
+
+@pytest.mark.usefixtures("patch_globals")
+@pytest.mark.parametrize("dry_run, etag", ((False, "new-etag"), (True, "etag")))
+def test_run_ignores_checkpoint(
+    dry_run,
+    etag,
+    mock_config,
+    mock_logger,
+    flask_app,
+    patch_get_s3_client,
+    patch_process_batch,
+    event_producer,
+    notification_event_producer,
+):
+    # A checkpoint is only valid for the file it was saved for, and dry runs don't use them
+    mock_config.dry_run = dry_run
+    save_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME, {"etag": "etag", "row": 2})
+    patch_get_s3_client.get_object.return_value = {"Body": io.BytesIO(b"header\nid1\nid2\nid3\n"), "ETag": etag}
+
+    _run_with_real_session(mock_config, mock_logger, flask_app, event_producer, notification_event_producer)
+
+    assert [call[0][0] for call in patch_process_batch.call_args_list] == [["id1", "id2"], ["id3"]]
+    expected_checkpoint = {"etag": "etag", "row": 2} if dry_run else None
+    assert load_checkpoint(db.session, delete_hosts_s3.CHECKPOINT_NAME) == expected_checkpoint
+
+
+@pytest.mark.usefixtures("patch_globals")
+def test_run_memory_does_not_grow_with_file_size(
+    mock_config,
+    mock_logger,
+    flask_app,
+    patch_get_s3_client,
+    monkeypatch,
+    event_producer,
+    notification_event_producer,
+):
+    row_count = 300_000  # about 11 MB of CSV, 22 MB once decoded
+    monkeypatch.setattr("jobs.delete_hosts_s3.BATCH_SIZE", 1000)
+    patch_get_s3_client.get_object.return_value = {"Body": _SyntheticCsvBody(row_count)}
+    # A plain function, a mock would keep every batch in its call list
+    processed = []
+    monkeypatch.setattr("jobs.delete_hosts_s3.process_batch", lambda batch, *_: processed.append(len(batch)))
+
+    tracemalloc.start()
+    try:
+        _run_with_real_session(mock_config, mock_logger, flask_app, event_producer, notification_event_producer)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sum(processed) == row_count
+    assert peak < 4 * 1024 * 1024
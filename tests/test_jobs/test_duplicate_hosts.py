@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 import json
+from collections import namedtuple
 from collections.abc import Callable
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from random import Random
 from random import randint
 from unittest import mock
 from uuid import UUID
@@ -13,10 +18,14 @@ from connexion import FlaskApp
 
 from app.config import Config
 from app.logging import get_logger
+from app.logging import threadctx
 from app.models import Host
 from app.models import ProviderType
 from app.queue.host_mq import IngressMessageConsumer
 from jobs.common import init_db
+from jobs.host_delete_duplicates import DELETE_DUPLICATE_HOSTS_BY_ORG_ID
+from jobs.host_delete_duplicates import HOST_FACT_COLUMNS
+from jobs.host_delete_duplicates import find_duplicate_host_ids
 from jobs.host_delete_duplicates import run as host_delete_duplicates_run
 from tests.helpers.db_utils import minimal_db_host
 from tests.helpers.mq_utils import MockEventProducer
@@ -28,11 +37,13 @@ from tests.helpers.test_utils import get_platform_metadata
 from tests.helpers.test_utils import minimal_host
 
 ID_FACTS = ("provider_id", "subscription_manager_id", "insights_id")
+ALGORITHMS = ("per_host", "in_memory")
 logger = get_logger(__name__)
 
 
 @pytest.mark.host_delete_duplicates
 @pytest.mark.parametrize("dry_run", (True, False))
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicate_host(
     inventory_config: Config,
     flask_app: FlaskApp,
@@ -41,7 +52,9 @@ def test_delete_duplicate_host(
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID], Host | None],
     dry_run: bool,
+    algorithm: str,
 ) -> None:
+    inventory_config.duplicate_hosts_algorithm = algorithm
     inventory_config.dry_run = dry_run
 
     # make two hosts that are the same
@@ -86,6 +99,7 @@ def test_delete_duplicate_host(
 
 
 @pytest.mark.host_delete_duplicates
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicate_host_more_hosts_than_chunk_size(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -94,7 +108,9 @@ def test_delete_duplicate_host_more_hosts_than_chunk_size(
     db_create_host: Callable[..., Host],
     db_create_multiple_hosts: Callable[..., list[Host]],
     db_get_host: Callable[[UUID], Host | None],
+    algorithm: str,
 ) -> None:
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
     canonical_facts_1 = {
         "provider_id": generate_uuid(),
         "provider_type": ProviderType.AWS.value,
@@ -153,6 +169,7 @@ def test_delete_duplicate_host_more_hosts_than_chunk_size(
 
 
 @pytest.mark.host_delete_duplicates
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_no_hosts_delete_when_no_dupes(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -160,7 +177,9 @@ def test_no_hosts_delete_when_no_dupes(
     notification_event_producer_mock: MockEventProducer,
     db_create_multiple_hosts: Callable[..., list[Host]],
     db_get_host: Callable[[UUID], Host | None],
+    algorithm: str,
 ) -> None:
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
     num_hosts = 100
     created_hosts = db_create_multiple_hosts(how_many=num_hosts)
     created_host_ids = [host.id for host in created_hosts]
@@ -185,6 +204,7 @@ def test_no_hosts_delete_when_no_dupes(
 
 @pytest.mark.host_delete_duplicates
 @pytest.mark.parametrize("tested_id", ID_FACTS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicates_id_facts_matching(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -193,7 +213,10 @@ def test_delete_duplicates_id_facts_matching(
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID], Host | None],
     tested_id: str,
+    algorithm: str,
 ) -> None:
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
+
     def _gen_canonical_facts() -> dict[str, str | list[str]]:
         facts = {
             "provider_id": generate_uuid(),
@@ -263,6 +286,7 @@ def test_delete_duplicates_id_facts_matching(
 
 @pytest.mark.host_delete_duplicates
 @pytest.mark.parametrize("tested_id", ID_FACTS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicates_id_facts_not_matching(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -271,7 +295,9 @@ def test_delete_duplicates_id_facts_not_matching(
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID], Host | None],
     tested_id: str,
+    algorithm: str,
 ) -> None:
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
     canonical_facts = {
         "provider_id": generate_uuid(),
         "insights_id": generate_uuid(),
@@ -331,6 +357,7 @@ def test_delete_duplicates_id_facts_not_matching(
 
 
 @pytest.mark.host_delete_duplicates
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicates_last_checked_in(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -339,8 +366,10 @@ def test_delete_duplicates_last_checked_in(
     db_create_host: Callable[..., Host],
     db_create_multiple_hosts: Callable[..., list[Host]],
     db_get_host: Callable[[UUID], Host | None],
+    algorithm: str,
 ) -> None:
     """Test that the deletion script always keeps host with the latest 'last_check_in' date"""
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
     canonical_facts = {
         "provider_id": generate_uuid(),
         "insights_id": generate_uuid(),
@@ -383,6 +412,7 @@ def test_delete_duplicates_last_checked_in(
 
 
 @pytest.mark.host_delete_duplicates
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
 def test_delete_duplicates_multiple_org_ids(
     no_dry_run_config: Config,
     flask_app: FlaskApp,
@@ -390,7 +420,9 @@ def test_delete_duplicates_multiple_org_ids(
     notification_event_producer_mock: MockEventProducer,
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID, str], Host | None],
+    algorithm: str,
 ) -> None:
+    no_dry_run_config.duplicate_hosts_algorithm = algorithm
     canonical_facts = {
         "insights_id": generate_uuid(),
         "subscription_manager_id": generate_uuid(),
@@ -420,6 +452,147 @@ def test_delete_duplicates_multiple_org_ids(
     assert db_get_host(created_host2, "222222")
 
 
+def _generate_duplicate_fixtures(org_id: str, seed: int, id_prefix: int) -> list[Host]:
+    """
+    Hosts of 30 machines with a random subset of their ID facts each, and the newest host of every
+    machine reporting all of them, plus 10 hosts chaining two machines by reporting the Subscription Manager ID
+    of one and the Insights ID of the next, and 20 hosts that have no duplicates.
+
+    The hosts are searched in the order of their IDs, and which chained hosts survive depends on it, so the IDs
+    only differ by id_prefix between orgs generated with the same seed.
+    """
+    rng = Random(seed)
+    now = datetime.now(UTC)
+    reported_facts_subsets = (
+        ("provider_id",),
+        ("subscription_manager_id",),
+        ("insights_id",),
+        ("subscription_manager_id", "insights_id"),
+        ("provider_id", "insights_id"),
+    )
+    machines_facts = [
+        {
+            "provider_id": f"provider-{seed}-{machine}",
+            "subscription_manager_id": str(UUID(int=rng.getrandbits(128))),
+            "insights_id": str(UUID(int=rng.getrandbits(128))),
+        }
+        for machine in range(30)
+    ]
+    hosts = []
+    for machine, machine_facts in enumerate(machines_facts):
+        host_count = rng.randint(1, 4)
+        for host_index in range(host_count):
+            newest = host_index == host_count - 1
+            facts = (
+                machine_facts if newest else {key: machine_facts[key] for key in rng.choice(reported_facts_subsets)}
+            )
+            if "provider_id" in facts:
+                facts = {**facts, "provider_type": ProviderType.AWS.value}
+            host = minimal_db_host(org_id=org_id, display_name=f"machine-{machine}-{host_index}", **facts)
+            # Distinct check-ins, so that the survivor of every search is unambiguous
+            host.last_check_in = now - timedelta(hours=rng.randint(24, 96) - host_index * 100, seconds=len(hosts))
+            hosts.append(host)
+    for chain in range(10):
+        machine = rng.randrange(len(machines_facts) - 1)
+        host = minimal_db_host(
+            org_id=org_id,
+            display_name=f"chain-{chain}",
+            subscription_manager_id=machines_facts[machine]["subscription_manager_id"],
+            insights_id=machines_facts[machine + 1]["insights_id"],
+        )
+        host.last_check_in = now - timedelta(hours=rng.randint(-96, 96), seconds=len(hosts))
+        hosts.append(host)
+    for unique in range(20):
+        hosts.append(minimal_db_host(org_id=org_id, display_name=f"unique-{unique}"))
+    rng.shuffle(hosts)
+    for position, host in enumerate(hosts):
+        host.id = UUID(int=(id_prefix << 96) + position)
+    return hosts
+
+
+@pytest.mark.host_delete_duplicates
+@pytest.mark.parametrize("seed", (1, 2, 3))
+def test_in_memory_matches_per_host_search(
+    no_dry_run_config: Config,
+    flask_app: FlaskApp,
+    event_producer_mock: MockEventProducer,
+    notification_event_producer_mock: MockEventProducer,
+    db_create_multiple_hosts: Callable[..., list[Host]],
+    seed: int,
+) -> None:
+    no_dry_run_config.script_chunk_size = 7
+    for id_prefix, org_id in enumerate(("per-host-org", "in-memory-org")):
+        db_create_multiple_hosts(hosts=_generate_duplicate_fixtures(org_id, seed, id_prefix))
+
+    Session = init_db(no_dry_run_config)
+    session = Session()
+    surviving_hosts = {}
+    for org_id, delete_duplicate_hosts_by_org_id in (
+        ("per-host-org", DELETE_DUPLICATE_HOSTS_BY_ORG_ID["per_host"]),
+        ("in-memory-org", DELETE_DUPLICATE_HOSTS_BY_ORG_ID["in_memory"]),
+    ):
+        with flask_app.app.app_context():
+            threadctx.request_id = None
+            delete_duplicate_hosts_by_org_id(
+                org_id,
+                session=session,
+                chunk_size=no_dry_run_config.script_chunk_size,
+                logger=logger,
+                event_producer=event_producer_mock,  # type: ignore[arg-type]
+                notifications_event_producer=notification_event_producer_mock,  # type: ignore[arg-type]
+                dry_run=False,
+            )
+        surviving_hosts[org_id] = {
+            display_name for (display_name,) in session.query(Host.display_name).filter(Host.org_id == org_id)
+        }
+    session.close()
+
+    assert surviving_hosts["in-memory-org"] == surviving_hosts["per-host-org"]
+    assert {f"unique-{unique}" for unique in range(20)} <= surviving_hosts["in-memory-org"]
+
+
+@pytest.mark.host_delete_duplicates
+@pytest.mark.usefixtures("flask_app")
+def test_in_memory_keeps_hosts_chained_through_a_duplicate() -> None:
+    # B shares its Insights ID with A and its Subscription Manager ID with C, but A and C don't match each other
+    host_facts = namedtuple("host_facts", ("id", *(column.key for column in HOST_FACT_COLUMNS[1:])))
+    now = datetime.now(UTC)
+    subscription_manager_id, insights_id_a, insights_id_c = (str(UUID(int=number)) for number in range(3))
+    hosts = [
+        host_facts("A", now - timedelta(days=1), None, None, None, insights_id_a),
+        host_facts("B", now - timedelta(days=2), None, None, subscription_manager_id, insights_id_a),
+        host_facts("C", now, None, None, subscription_manager_id, insights_id_c),
+    ]
+
+    assert list(find_duplicate_host_ids(hosts, chunk_size=10)) == [{"B"}]
+
+
+@pytest.mark.host_delete_duplicates
+@pytest.mark.usefixtures("flask_app")
+def test_in_memory_scales_to_large_orgs() -> None:
+    # 500k hosts of 200k machines: 100k reported twice by subscription-manager and insights-client,
+    # 100k reported by a cloud provider, a second time with only the provider ID, and 100k unique hosts
+    host_facts = namedtuple("host_facts", ("id", *(column.key for column in HOST_FACT_COLUMNS[1:])))
+    now = datetime.now(UTC)
+    hosts = []
+    for machine in range(100_000):
+        subscription_manager_id = str(UUID(int=machine))
+        hosts.append(host_facts(f"s{machine}-old", now - timedelta(days=1), None, None, subscription_manager_id, None))
+        hosts.append(
+            host_facts(f"s{machine}-new", now, None, None, subscription_manager_id, UUID(int=machine + 10**9))
+        )
+        provider_id = f"i-{machine}"
+        hosts.append(host_facts(f"p{machine}-old", now - timedelta(days=1), provider_id, "aws", None, None))
+        hosts.append(host_facts(f"p{machine}-new", now, provider_id, "aws", None, UUID(int=machine + 2 * 10**9)))
+        hosts.append(host_facts(f"u{machine}", now, None, None, None, UUID(int=machine + 3 * 10**9)))
+
+    duplicate_host_ids = set().union(*find_duplicate_host_ids(hosts, chunk_size=1000))
+
+    assert len(hosts) == 500_000
+    assert len(duplicate_host_ids) == 200_000
+    assert all(host_id.endswith("-old") for host_id in duplicate_host_ids)
+
+
 @pytest.mark.usefixtures("flask_app")
 def test_canonical_facts_columns_update_via_mq(
     db_get_host: Callable[[UUID], Host | None],
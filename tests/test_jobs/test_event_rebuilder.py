@@ -2,19 +2,37 @@ import json
 from unittest import mock
 
 import pytest
+from confluent_kafka.error import ProduceError
 
 from app.logging import threadctx
 from app.models import db
 from app.queue.events import EventType
 from app.queue.events import build_event
 from jobs.rebuild_events_topic import run as rebuild_events_run
+from lib import host_repository
 from tests.helpers.db_utils import minimal_db_host
 from tests.helpers.mq_utils import create_kafka_consumer_mock
 from tests.helpers.test_utils import generate_uuid
 
 
+def _event_producer_mock(undelivered=()):
+    return mock.Mock(**{"flush_delivery_report.return_value": set(undelivered)})
+
+
+def _run_rebuild(mocker, inventory_config, event_producer, event_list):
+    consumer_mock = create_kafka_consumer_mock(mocker, inventory_config.event_topic, 1, 0, 1, event_list)
+    rebuild_events_run(
+        inventory_config,
+        mock.Mock(),
+        db.session,
+        consumer_mock,
+        event_producer,
+        shutdown_handler=mock.Mock(**{"shut_down.return_value": False}),
+    )
+
+
 def test_no_delete_when_hosts_present(mocker, db_create_host, inventory_config):
-    event_producer_mock = mock.Mock()
+    event_producer_mock = _event_producer_mock()
     threadctx.request_id = None
     event_list = []
 
@@ -42,7 +60,7 @@ def test_no_delete_when_hosts_present(mocker, db_create_host, inventory_config):
 def test_creates_delete_event_when_missing_from_db(
     mocker, db_create_host, inventory_config, num_existing, num_missing
 ):
-    event_producer_mock = mock.Mock()
+    event_producer_mock = _event_producer_mock()
     threadctx.request_id = None
     event_list = []
     existing_hosts_created = 0
@@ -78,3 +96,99 @@ def test_creates_delete_event_when_missing_from_db(
         produced_event = json.loads(event_producer_mock.write_event.call_args_list[i][0][0])
         assert produced_event["type"] == "delete"
         assert produced_event["id"] in missing_hosts_id_list
+
+
+def test_checks_existence_once_per_batch(mocker, db_create_host, inventory_config):
+    event_producer_mock = _event_producer_mock()
+    threadctx.request_id = None
+    event_list = []
+    for _ in range(3):
+        host = minimal_db_host()
+        db_create_host(host=host)
+        event_list.append(build_event(EventType.created, host))
+        missing_host = minimal_db_host()
+        missing_host.id = generate_uuid()
+        event_list.append(build_event(EventType.updated, missing_host))
+
+    get_existing_host_keys = mocker.patch(
+        "app.queue.host_mq.host_repository.get_existing_host_keys",
+        wraps=host_repository.get_existing_host_keys,
+    )
+
+    _run_rebuild(mocker, inventory_config, event_producer_mock, event_list)
+
+    # One batch of messages, then an empty one that ends the loop
+    assert [len(call.args[0]) for call in get_existing_host_keys.call_args_list] == [6, 0]
+    assert event_producer_mock.write_event.call_count == 3
+    assert event_producer_mock.flush_delivery_report.call_count == 2
+    for call in event_producer_mock.write_event.call_args_list:
+        assert call.kwargs["delivery_report"] is event_producer_mock.flush_delivery_report.call_args_list[0].args[0]
+
+
+def test_uses_last_message_of_each_host(mocker, inventory_config):
+    event_producer_mock = _event_producer_mock()
+    threadctx.request_id = None
+
+    updated_host = minimal_db_host()
+    updated_host.id = generate_uuid()
+    deleted_host = minimal_db_host()
+    deleted_host.id = generate_uuid()
+    event_list = [
+        build_event(EventType.created, updated_host),
+        build_event(EventType.updated, updated_host),
+        build_event(EventType.created, deleted_host),
+        build_event(EventType.delete, deleted_host),
+    ]
+
+    _run_rebuild(mocker, inventory_config, event_producer_mock, event_list)
+
+    # The deleted host already has its delete event, the updated one gets a single one
+    assert event_producer_mock.write_event.call_count == 1
+    produced_event = json.loads(event_producer_mock.write_event.call_args.args[0])
+    assert produced_event["type"] == "delete"
+    assert produced_event["id"] == updated_host.id
+
+
+def test_skips_unparsable_messages(mocker, inventory_config):
+    event_producer_mock = _event_producer_mock()
+    threadctx.request_id = None
+
+    missing_host = minimal_db_host()
+    missing_host.id = generate_uuid()
+    event_list = [
+        "not json",
+        json.dumps({"type": "updated", "host": {"id": "not-a-uuid", "org_id": missing_host.org_id}}),
+    ]
+    event_list.append(build_event(EventType.updated, missing_host))
+
+    _run_rebuild(mocker, inventory_config, event_producer_mock, event_list)
+
+    assert event_producer_mock.write_event.call_count == 1
+    assert json.loads(event_producer_mock.write_event.call_args.args[0])["id"] == missing_host.id
+
+
+def test_skips_messages_without_org_id(mocker, db_create_host, inventory_config):
+    event_producer_mock = _event_producer_mock()
+    threadctx.request_id = None
+
+    host = db_create_host(host=minimal_db_host())
+    message = json.loads(build_event(EventType.updated, host))
+    del message["host"]["org_id"]
+
+    _run_rebuild(mocker, inventory_config, event_producer_mock, [json.dumps(message)])
+
+    event_producer_mock.write_event.assert_not_called()
+
+
+def test_raises_when_delete_events_are_not_delivered(mocker, inventory_config):
+    missing_host = minimal_db_host()
+    missing_host.id = generate_uuid()
+    threadctx.request_id = None
+
+    with pytest.raises(ProduceError):
+        _run_rebuild(
+            mocker,
+            inventory_config,
+            _event_producer_mock(undelivered={missing_host.id}),
+            [build_event(EventType.updated, missing_host)],
+        )
@@ -22,6 +22,7 @@ from app.culling import CONVENTIONAL_TIME_TO_STALE_SECONDS
 from app.culling import CONVENTIONAL_TIME_TO_STALE_WARNING_SECONDS
 from app.logging import threadctx
 from app.models import Group
+from app.models import GroupHostCount
 from app.models import Host
 from app.models import HostGroupAssoc
 from app.models import Staleness
@@ -32,6 +33,9 @@ from tests.helpers.db_utils import minimal_db_host
 from tests.helpers.mq_utils import MockEventProducer
 from tests.helpers.mq_utils import assert_delete_event_is_valid
 from tests.helpers.mq_utils import assert_delete_notification_is_valid
+from tests.helpers.test_utils import SYSTEM_IDENTITY
+
+QUERY_MODES = ("per_org", "join")
 
 CUSTOM_STALENESS_DELETE = {
     "conventional_time_to_stale": CONVENTIONAL_TIME_TO_STALE_SECONDS,
@@ -53,6 +57,7 @@ CUSTOM_STALENESS_NO_HOSTS_TO_DELETE = {
     (True, False),
 )
 @pytest.mark.parametrize("reporter", ["puptoo", "rhsm-system-profile-bridge"])
+@pytest.mark.parametrize("query_mode", QUERY_MODES)
 def test_culled_host_is_removed(
     flask_app: FlaskApp,
     event_producer_mock: MockEventProducer,
@@ -66,7 +71,9 @@ def test_culled_host_is_removed(
     host_type: str,
     is_host_grouped: bool,
     reporter: str,
+    query_mode: str,
 ) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
     with patch("app.models.utils.datetime") as mock_datetime:
         mock_datetime.now.return_value = datetime(year=2023, month=4, day=2, hour=1, minute=1, second=1, tzinfo=UTC)
         mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
@@ -104,6 +111,46 @@ def test_culled_host_is_removed(
     )
 
 
+@pytest.mark.host_reaper
+def test_reaper_refreshes_group_host_counts(
+    flask_app: FlaskApp,
+    event_producer_mock: MockEventProducer,
+    notification_event_producer_mock: MockEventProducer,
+    inventory_config: Config,
+    db_create_host: Callable[..., Host],
+    db_create_group: Callable[..., Group],
+    db_create_host_group_assoc: Callable[..., HostGroupAssoc],
+) -> None:
+    inventory_config.group_host_counts_table_enabled = True
+    group = db_create_group("test_group")
+    empty_group = db_create_group("empty_group")
+
+    with patch("app.models.utils.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(year=2023, month=4, day=2, hour=1, minute=1, second=1, tzinfo=UTC)
+        mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
+        culled_host = db_create_host(host=minimal_db_host())
+    db_create_host_group_assoc(culled_host.id, group.id)
+    db_create_host_group_assoc(db_create_host().id, group.id)
+
+    # A stale count, e.g. from hosts that were deleted or culled since it was written
+    db.session.add(GroupHostCount(group.id, group.org_id, host_count=5))
+    db.session.commit()
+
+    threadctx.request_id = None
+    host_reaper_run(
+        inventory_config,
+        mock.Mock(),
+        db.session,
+        event_producer_mock,
+        notification_event_producer_mock,
+        shutdown_handler=mock.Mock(**{"shut_down.return_value": False}),
+        application=flask_app,
+    )
+
+    host_counts = {row.group_id: row.host_count for row in GroupHostCount.query.all()}
+    assert host_counts == {group.id: 1, empty_group.id: 0}
+
+
 @pytest.mark.host_reaper
 @pytest.mark.parametrize("host_type", ["conventional", "edge"])
 @pytest.mark.parametrize(
@@ -111,6 +158,7 @@ def test_culled_host_is_removed(
     (True, False),
 )
 @pytest.mark.parametrize("reporter", ["puptoo", "rhsm-system-profile-bridge"])
+@pytest.mark.parametrize("query_mode", QUERY_MODES)
 def test_non_culled_host_is_not_removed(
     flask_app: FlaskApp,
     event_producer_mock: MockEventProducer,
@@ -123,7 +171,9 @@ def test_non_culled_host_is_not_removed(
     host_type: str,
     is_host_grouped: bool,
     reporter: str,
+    query_mode: str,
 ) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
     created_hosts = []
 
     for time_delta in (
@@ -192,6 +242,7 @@ def test_reaper_shutdown_handler(
     assert created_hosts.count() == host_count
 
     fake_event_producer = mock.Mock()
+    fake_event_producer.flush_delivery_report.return_value = set()
 
     threadctx.request_id = None
     inventory_config.host_delete_chunk_size = 1
@@ -276,6 +327,7 @@ def test_reaper_stops_after_kafka_producer_error(
     assert notification_event_producer._kafka_producer.produce.call_count == 1
 
 
+@pytest.mark.parametrize("query_mode", QUERY_MODES)
 def test_delete_all_type_of_hosts(
     flask_app: FlaskApp,
     inventory_config: Config,
@@ -284,7 +336,9 @@ def test_delete_all_type_of_hosts(
     db_create_staleness_culling: Callable[..., Staleness],
     db_create_multiple_hosts: Callable[..., list[Host]],
     db_get_hosts: Callable[..., Query],
+    query_mode: str,
 ) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_DELETE)
 
     with patch("app.models.utils.datetime") as mock_datetime:
@@ -310,6 +364,7 @@ def test_delete_all_type_of_hosts(
     assert len(db_get_hosts(conventional_hosts).all()) == 0
 
 
+@pytest.mark.parametrize("query_mode", QUERY_MODES)
 def test_no_hosts_to_delete(
     flask_app: FlaskApp,
     inventory_config: Config,
@@ -318,7 +373,9 @@ def test_no_hosts_to_delete(
     db_create_staleness_culling: Callable[..., Staleness],
     db_create_multiple_hosts: Callable[..., list[Host]],
     db_get_hosts: Callable[..., Query],
+    query_mode: str,
 ) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_NO_HOSTS_TO_DELETE)
 
     with patch("app.models.utils.datetime") as mock_datetime:
@@ -388,3 +445,51 @@ def test_host_reaper_doesnt_use_updated_timestamp(
     assert_delete_notification_is_valid(
         notification_event_producer=notification_event_producer_mock, host=created_host
     )
+
+
+@pytest.mark.host_reaper
+@pytest.mark.parametrize("query_mode", QUERY_MODES)
+@pytest.mark.parametrize("clear_deletion_timestamp", (False, True))
+def test_reaper_applies_each_org_staleness(
+    flask_app: FlaskApp,
+    inventory_config: Config,
+    event_producer_mock: MockEventProducer,
+    notification_event_producer_mock: MockEventProducer,
+    db_create_staleness_culling: Callable[..., Staleness],
+    db_create_multiple_hosts: Callable[..., list[Host]],
+    db_get_hosts: Callable[..., Query],
+    query_mode: str,
+    clear_deletion_timestamp: bool,
+) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
+    custom_staleness = db_create_staleness_culling(**CUSTOM_STALENESS_DELETE)
+
+    with patch("app.models.utils.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime.now(UTC) - timedelta(minutes=1)
+        custom_staleness_hosts = [host.id for host in db_create_multiple_hosts(how_many=2)]
+        default_staleness_hosts = [
+            host.id
+            for host in db_create_multiple_hosts(
+                how_many=2, identity={**SYSTEM_IDENTITY, "org_id": "default-staleness-org"}
+            )
+        ]
+
+    assert all(host.org_id == custom_staleness.org_id for host in db_get_hosts(custom_staleness_hosts))
+    if clear_deletion_timestamp:
+        # Hosts without a precomputed deletion_timestamp fall back to the org staleness
+        db.session.query(Host).update({Host.deletion_timestamp: None})
+        db.session.commit()
+
+    threadctx.request_id = None
+    host_reaper_run(
+        inventory_config,
+        mock.Mock(),
+        db.session,
+        event_producer_mock,
+        notification_event_producer_mock,
+        shutdown_handler=mock.Mock(**{"shut_down.return_value": False}),
+        application=flask_app,
+    )
+
+    assert db_get_hosts(custom_staleness_hosts).count() == 0
+    assert db_get_hosts(default_staleness_hosts, "default-staleness-org").count() == 2
@@ -1,12 +1,14 @@
 from unittest import mock
 
 import pytest
+from confluent_kafka.error import ProduceError
 
 from app.logging import threadctx
 from app.models import Host
 from app.models import db
 from jobs.host_sync_group_data import run as host_group_sync_run
 from jobs.host_synchronizer import run as host_synchronizer_run
+from lib.job_checkpoint import load_checkpoint
 from tests.helpers.db_utils import minimal_db_host
 from tests.helpers.mq_utils import assert_synchronize_event_is_valid
 from tests.helpers.test_utils import get_staleness_timestamps
@@ -76,6 +78,101 @@ def test_synchronize_multiple_host_events(event_producer, db_create_multiple_hos
     assert event_producer._kafka_producer.produce.call_count == host_count
 
 
+def _run_synchronizer(inventory_config, event_producer, interrupt=None):
+    threadctx.request_id = None
+    return host_synchronizer_run(
+        inventory_config,
+        mock.Mock(),
+        db.session,
+        event_producer,
+        shutdown_handler=mock.Mock(**{"shut_down.side_effect": interrupt or (lambda: False)}),
+    )
+
+
+def _produced_host_ids(event_producer):
+    return [call.args[2].decode() for call in event_producer._kafka_producer.produce.call_args_list]
+
+
+@pytest.mark.host_synchronizer
+def test_synchronize_orgs_of_the_shard(event_producer, db_create_host, inventory_config):
+    host_ids = {str(db_create_host(extra_data={"org_id": f"org-{index}"}).id) for index in range(8)}
+    inventory_config.synchronizer_shard_count = 2
+
+    shard_host_ids = []
+    for shard_index in range(2):
+        event_producer._kafka_producer.produce.reset_mock()
+        inventory_config.synchronizer_shard_index = shard_index
+        _run_synchronizer(inventory_config, event_producer)
+        shard_host_ids.append(set(_produced_host_ids(event_producer)))
+
+    assert shard_host_ids[0] | shard_host_ids[1] == host_ids
+    assert not shard_host_ids[0] & shard_host_ids[1]
+
+
+@pytest.mark.host_synchronizer
+def test_synchronize_rejects_a_shard_out_of_range(event_producer, inventory_config):
+    inventory_config.synchronizer_shard_index = 2
+    inventory_config.synchronizer_shard_count = 2
+
+    with pytest.raises(ValueError):
+        _run_synchronizer(inventory_config, event_producer)
+
+
+@pytest.mark.host_synchronizer
+def test_synchronize_resumes_from_the_checkpoint(event_producer, db_create_multiple_hosts, inventory_config):
+    host_ids = sorted(str(host.id) for host in db_create_multiple_hosts(how_many=7))
+    inventory_config.script_chunk_size = 2
+
+    # The org and its first chunk are started, then the run is interrupted before the second chunk
+    interrupt_checks = iter([False, False, True])
+    event_count = _run_synchronizer(inventory_config, event_producer, lambda: next(interrupt_checks, True))
+
+    assert event_count == 2
+    assert _produced_host_ids(event_producer) == host_ids[:2]
+    assert load_checkpoint(db.session, "host_synchronizer:0/1")["host_id"] == host_ids[1]
+
+    event_producer._kafka_producer.produce.reset_mock()
+    event_count = _run_synchronizer(inventory_config, event_producer)
+
+    assert event_count == 5
+    assert _produced_host_ids(event_producer) == host_ids[2:]
+    assert load_checkpoint(db.session, "host_synchronizer:0/1") is None
+
+
+@pytest.mark.host_synchronizer
+def test_synchronize_flushes_once_per_chunk(event_producer, db_create_multiple_hosts, inventory_config):
+    db_create_multiple_hosts(how_many=5)
+    inventory_config.script_chunk_size = 2
+
+    _run_synchronizer(inventory_config, event_producer)
+
+    assert event_producer._kafka_producer.flush.call_count == 3
+    assert event_producer._kafka_producer.poll.call_count == 5
+
+
+@pytest.mark.host_synchronizer
+def test_synchronize_stops_on_undelivered_events(event_producer, db_create_multiple_hosts, inventory_config):
+    host_ids = sorted(str(host.id) for host in db_create_multiple_hosts(how_many=5))
+    inventory_config.script_chunk_size = 2
+    # The second chunk's messages are still in the queue after the flush timeout, so they are not delivered
+    event_producer._kafka_producer.flush.side_effect = [0, 2]
+
+    with pytest.raises(ProduceError):
+        _run_synchronizer(inventory_config, event_producer)
+
+    assert event_producer._kafka_producer.produce.call_count == 4
+    # Only the delivered chunk is checkpointed
+    assert load_checkpoint(db.session, "host_synchronizer:0/1")["host_id"] == host_ids[1]
+
+    event_producer._kafka_producer.produce.reset_mock()
+    event_producer._kafka_producer.flush.side_effect = None
+    event_producer._kafka_producer.flush.return_value = 0
+
+    assert _run_synchronizer(inventory_config, event_producer) == 3
+    assert _produced_host_ids(event_producer) == host_ids[2:]
+    assert load_checkpoint(db.session, "host_synchronizer:0/1") is None
+
+
 @pytest.mark.parametrize("ungrouped", [True, False])
 @pytest.mark.host_synchronizer
 def test_synchronize_grouped_host_event(
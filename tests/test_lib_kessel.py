@@ -7,18 +7,22 @@ that forces single-resource checks instead of bulk checks.
 
 from unittest.mock import Mock
 
+import grpc
 import pytest
 from kessel.inventory.v1beta2 import allowed_pb2
 from kessel.inventory.v1beta2 import reporter_reference_pb2
 from kessel.inventory.v1beta2 import resource_reference_pb2
 from kessel.inventory.v1beta2 import subject_reference_pb2
 from kessel.inventory.v1beta2.check_bulk_response_pb2 import CheckBulkResponse
+from kessel.inventory.v1beta2.check_for_update_response_pb2 import CheckForUpdateResponse
 
 from app.auth.identity import Identity
 from app.auth.rbac import KesselPermission
 from app.auth.rbac import KesselResourceTypes
 from app.auth.rbac import RbacPermission
 from lib.kessel import Kessel
+from lib.kessel import invalidate_kessel_decisions
+from lib.kessel_decision_cache import kessel_decision_cache
 from tests.helpers.test_utils import USER_IDENTITY
 
 
@@ -36,6 +40,9 @@ def kessel_client(mocker) -> Kessel:
     client.inventory_svc = mock_inventory_svc
     client.channel = mock_channel
     client.timeout = 10.0
+    client.max_concurrent_checks = 20
+    client.decision_cache_ttl = 0
+    client.decision_cache_max_size = 100
 
     return client
 
@@ -421,3 +428,172 @@ class TestCheckBulkResourcesEdgeCases:
         assert mock_check_single.call_count == 1
         assert result is True
         assert unauthorized_ids == []
+
+
+@pytest.fixture
+def update_permission() -> KesselPermission:
+    return KesselPermission(
+        resource_type=KesselResourceTypes.HOST,
+        workspace_permission="inventory_host_update",
+        resource_permission="update",
+        v1_permission=RbacPermission.WRITE,
+    )
+
+
+@pytest.fixture
+def decision_cache(kessel_client: Kessel):
+    kessel_client.decision_cache_ttl = 60
+    kessel_decision_cache.clear()
+    yield kessel_decision_cache
+    kessel_decision_cache.clear()
+
+
+def _update_check_future(allowed: bool) -> Mock:
+    response = CheckForUpdateResponse(
+        allowed=allowed_pb2.Allowed.ALLOWED_TRUE if allowed else allowed_pb2.Allowed.ALLOWED_FALSE
+    )
+    return Mock(result=Mock(return_value=response))
+
+
+class TestCheckBulkResourcesForUpdate:
+    """Tests for the concurrent CheckForUpdate fan-out."""
+
+    def test_requests_are_sent_before_waiting_for_responses(
+        self,
+        kessel_client: Kessel,
+        update_permission: KesselPermission,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+    ) -> None:
+        kessel_client.max_concurrent_checks = 2
+        resource_ids = ["host-1", "host-2", "host-3"]
+        calls = []
+        futures = {rid: _update_check_future(rid != "host-2") for rid in resource_ids}
+
+        def _future(request, timeout):  # noqa: ARG001
+            calls.append(("sent", request.object.resource_id))
+            future = futures[request.object.resource_id]
+            future.result.side_effect = lambda: (
+                calls.append(("waited", request.object.resource_id)) or (future.result.return_value)
+            )
+            return future
+
+        kessel_client.inventory_svc.CheckForUpdate.future = Mock(side_effect=_future)
+
+        result, unauthorized_ids = kessel_client._check_bulk_resources_for_update(
+            mock_subject_ref, update_permission, resource_ids
+        )
+
+        assert result is False
+        assert unauthorized_ids == ["host-2"]
+        assert calls == [
+            ("sent", "host-1"),
+            ("sent", "host-2"),
+            ("waited", "host-1"),
+            ("waited", "host-2"),
+            ("sent", "host-3"),
+            ("waited", "host-3"),
+        ]
+        kessel_client.inventory_svc.CheckForUpdate.assert_not_called()
+
+    def test_error_cancels_in_flight_requests(
+        self,
+        kessel_client: Kessel,
+        update_permission: KesselPermission,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+    ) -> None:
+        failing_future = Mock(result=Mock(side_effect=grpc.RpcError()))
+        pending_future = _update_check_future(True)
+        kessel_client.inventory_svc.CheckForUpdate.future = Mock(side_effect=[failing_future, pending_future])
+
+        with pytest.raises(grpc.RpcError):
+            kessel_client._check_bulk_resources_for_update(mock_subject_ref, update_permission, ["host-1", "host-2"])
+
+        pending_future.cancel.assert_called_once()
+
+
+class TestDecisionCache:
+    """Tests for caching Kessel decisions per subject."""
+
+    def test_granted_update_checks_are_cached(
+        self,
+        kessel_client: Kessel,
+        decision_cache,  # noqa: ARG002
+        test_identity: Identity,
+        update_permission: KesselPermission,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+        mocker,
+    ) -> None:
+        mocker.patch("lib.kessel.principal_from_rh_identity", return_value=mock_subject_ref)
+        kessel_client.inventory_svc.CheckForUpdate.future = Mock(
+            side_effect=lambda request, timeout: _update_check_future(request.object.resource_id != "host-2")  # noqa: ARG005
+        )
+
+        assert kessel_client.check_for_update(test_identity, update_permission, ["host-1", "host-2"]) == (
+            False,
+            ["host-2"],
+        )
+        assert kessel_client.check_for_update(test_identity, update_permission, ["host-1", "host-2"]) == (
+            False,
+            ["host-2"],
+        )
+
+        # host-1 was granted, so only the denied host-2 is checked again
+        sent_ids = [
+            call.args[0].object.resource_id
+            for call in kessel_client.inventory_svc.CheckForUpdate.future.call_args_list
+        ]
+        assert sent_ids == ["host-1", "host-2"]
+        kessel_client.inventory_svc.CheckForUpdate.assert_called_once()
+
+    def test_decisions_are_not_cached_by_default(
+        self,
+        kessel_client: Kessel,
+        test_identity: Identity,
+        test_permission: KesselPermission,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+        mocker,
+    ) -> None:
+        mocker.patch("lib.kessel.principal_from_rh_identity", return_value=mock_subject_ref)
+        mock_check_single = mocker.patch.object(kessel_client, "_check_single_resource", return_value=True)
+
+        kessel_client.check(test_identity, test_permission, ["host-1"])
+        kessel_client.check(test_identity, test_permission, ["host-1"])
+
+        assert mock_check_single.call_count == 2
+
+    def test_allowed_workspaces_are_cached_until_invalidated(
+        self,
+        kessel_client: Kessel,
+        decision_cache,  # noqa: ARG002
+        test_identity: Identity,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+        mocker,
+    ) -> None:
+        mocker.patch("lib.kessel.principal_from_rh_identity", return_value=mock_subject_ref)
+        workspace = Mock()
+        workspace.object.resource_id = "workspace-1"
+        list_workspaces_mock = mocker.patch("lib.kessel.list_workspaces", return_value=[workspace])
+
+        assert kessel_client.ListAllowedWorkspaces(test_identity, "inventory_host_view") == ["workspace-1"]
+        assert kessel_client.ListAllowedWorkspaces(test_identity, "inventory_host_view") == ["workspace-1"]
+        assert list_workspaces_mock.call_count == 1
+
+        invalidate_kessel_decisions(test_identity.org_id)
+
+        assert kessel_client.ListAllowedWorkspaces(test_identity, "inventory_host_view") == ["workspace-1"]
+        assert list_workspaces_mock.call_count == 2
+
+    def test_failed_workspace_listing_is_not_cached(
+        self,
+        kessel_client: Kessel,
+        decision_cache,  # noqa: ARG002
+        test_identity: Identity,
+        mock_subject_ref: subject_reference_pb2.SubjectReference,
+        mocker,
+    ) -> None:
+        mocker.patch("lib.kessel.principal_from_rh_identity", return_value=mock_subject_ref)
+        list_workspaces_mock = mocker.patch("lib.kessel.list_workspaces", side_effect=grpc.RpcError())
+
+        assert kessel_client.ListAllowedWorkspaces(test_identity, "inventory_host_view") == []
+        assert kessel_client.ListAllowedWorkspaces(test_identity, "inventory_host_view") == []
+        assert list_workspaces_mock.call_count == 2
@@ -25,6 +25,7 @@ from app.models import HostAppDataVulnerability
 from app.models import HostSchema
 from app.models import InputGroupSchema
 from app.models import LimitedHost
+from app.models import LimitedHostSchema
 from app.models import _create_staleness_timestamps_values
 from app.models import db
 from app.models.system_profile_dynamic import HostDynamicSystemProfile
@@ -2690,6 +2691,73 @@ def test_host_schema_logs_partial_migration_state(mocker):
     assert "sending_both_formats=True" in call_args  # Mixed state
 
 
+@pytest.mark.parametrize(
+    "system_profile",
+    (
+        {"arch": "x86_64"},
+        {"workloads": {"ansible": {"controller_version": "4.5.6"}}},
+        {"workloads": {}},
+        {"sap_sids": ["H2O"]},
+        {"sap": "not-an-object"},
+        {"ansible": {"controller_version": "4.5.6"}},
+        {"third_party_services": {}},
+        {"third_party_services": {"crowdstrike": {"falcon_aid": "abc123"}}},
+        {"third_party_services": {"other": {}}},
+        {"third_party_services": None},
+    ),
+)
+def test_has_legacy_workloads_fields_matches_migration(system_profile):
+    migrated = {"system_profile": deepcopy(system_profile)}
+    LimitedHostSchema._migrate_and_remove_legacy_workloads_fields(migrated)
+
+    has_legacy_fields = LimitedHostSchema._has_legacy_workloads_fields(system_profile)
+
+    assert has_legacy_fields == (migrated["system_profile"] != system_profile)
+
+
+def test_host_schema_load_does_not_modify_input_system_profile():
+    system_profile = {
+        "number_of_cpus": "2",
+        "installed_packages": ["openssl-1:1.1.1k-6.el8_5.x86_64"],
+        "network_interfaces": [{"ipv4_addresses": ["10.0.0.1"], "unknown": "dropped"}],
+        "ansible": {"controller_version": "4.5.6"},
+    }
+    original = deepcopy(system_profile)
+    host_data = {
+        "fqdn": "test.example.com",
+        "reporter": "puptoo",
+        "org_id": "org123",
+        "system_profile": system_profile,
+    }
+
+    loaded = HostSchema().load(host_data)
+
+    assert system_profile == original
+    assert loaded["system_profile"] == {
+        "number_of_cpus": 2,
+        "installed_packages": ["openssl-1:1.1.1k-6.el8_5.x86_64"],
+        "network_interfaces": [{"ipv4_addresses": ["10.0.0.1"]}],
+        "workloads": {"ansible": {"controller_version": "4.5.6"}},
+    }
+
+
+def test_host_does_not_modify_legacy_input_system_profile(flask_app):
+    system_profile = {"arch": "x86_64", "ansible": {"controller_version": "4.5.6"}}
+    original = deepcopy(system_profile)
+
+    with flask_app.app.app_context():
+        host = Host(
+            insights_id=generate_uuid(),
+            reporter="puptoo",
+            org_id=USER_IDENTITY["org_id"],
+            system_profile_facts=system_profile,
+        )
+
+    assert system_profile == original
+    assert host.static_system_profile.arch == "x86_64"
+    assert host.dynamic_system_profile.workloads == {"ansible": {"controller_version": "4.5.6"}}
+
+
 def test_update_display_name_skips_when_unchanged(db_create_host, models_datetime_mock):
     """When display_name and reporter are the same, no assignment should happen."""
     insights_id = generate_uuid()
@@ -2928,3 +2996,90 @@ def test_ungrouped_group_cache_deduplicates_group_creation_rbac_v2(flask_app, mo
     mock_rbac.assert_called_once_with(mock_identity)
     mock_wait.assert_called_once()
     mock_get_rbac_ws.assert_called_once_with(str(workspace_id))
+
+
+@pytest.fixture
+def ungrouped_group_cache_enabled(inventory_config):
+    from lib.group_repository import SerializedUngroupedGroupCache
+
+    inventory_config.ungrouped_group_cache_ttl = 60
+    SerializedUngroupedGroupCache.clear()
+    yield
+    SerializedUngroupedGroupCache.clear()
+
+
+@pytest.mark.usefixtures("ungrouped_group_cache_enabled")
+def test_serialized_ungrouped_group_cache_outlives_batch(db_create_group, mocker):
+    """The serialized ungrouped group is reused across batches, and dropped when the group is deleted."""
+    from app.auth.identity import create_mock_identity_with_org_id
+    from lib.group_repository import SerializedUngroupedGroupCache
+    from lib.group_repository import delete_group_list
+    from lib.group_repository import get_serialized_ungrouped_group_for_identity
+    from lib.group_repository import get_ungrouped_group
+
+    identity = create_mock_identity_with_org_id(SYSTEM_IDENTITY["org_id"])
+    group = db_create_group("Ungrouped Hosts", ungrouped=True)
+    get_ungrouped = mocker.patch("lib.group_repository.get_ungrouped_group", wraps=get_ungrouped_group)
+
+    first = get_serialized_ungrouped_group_for_identity(identity)
+    first["name"] = "mutated by the caller"
+    second = get_serialized_ungrouped_group_for_identity(identity)
+
+    assert second["id"] == str(group.id)
+    assert second["name"] == "Ungrouped Hosts"
+    get_ungrouped.assert_called_once()
+
+    delete_group_list([str(group.id)], identity, mocker.Mock())
+    assert SerializedUngroupedGroupCache.get(identity.org_id) is None
+
+
+def test_serialized_ungrouped_group_cache_disabled_by_default(flask_app, mocker):  # noqa: ARG001
+    from lib.group_repository import SerializedUngroupedGroupCache
+
+    SerializedUngroupedGroupCache.put("org1", {"id": generate_uuid()})
+    assert SerializedUngroupedGroupCache.get("org1") is None
+
+
+def test_prefetch_ungrouped_groups_loads_existing_groups_at_once(flask_app, db_create_group, mocker):  # noqa: ARG001
+    from lib.group_repository import UngroupedGroupCache
+    from lib.group_repository import prefetch_ungrouped_groups
+
+    group = db_create_group("Ungrouped Hosts", ungrouped=True)
+    mock_rbac = mocker.patch("lib.group_repository.rbac_create_ungrouped_hosts_workspace")
+
+    with UngroupedGroupCache():
+        prefetch_ungrouped_groups({SYSTEM_IDENTITY["org_id"]: None})
+        assert UngroupedGroupCache.get(SYSTEM_IDENTITY["org_id"]).id == group.id
+
+    mock_rbac.assert_not_called()
+
+
+def test_prefetch_ungrouped_groups_creates_missing_workspaces_concurrently(flask_app, mocker):  # noqa: ARG001
+    """Workspaces of new orgs are requested in parallel; one org failing doesn't affect the others."""
+    import threading
+
+    from lib.group_repository import prefetch_ungrouped_groups
+
+    org_ids = ["org1", "org2", "org3"]
+    # Every RBAC call waits until all of them are in flight, so this only passes if they run concurrently
+    barrier = threading.Barrier(len(org_ids), timeout=5)
+
+    def _create_workspace(identity):
+        barrier.wait()
+        if identity.org_id == "org3":
+            raise RuntimeError("RBAC is down")
+        return generate_uuid()
+
+    mock_config = mocker.patch("lib.group_repository.inventory_config")
+    mock_config.return_value.bypass_kessel = False
+    mock_config.return_value.ungrouped_workspace_create_workers = len(org_ids)
+    mock_config.return_value.ungrouped_group_cache_ttl = 0
+    mock_rbac = mocker.patch(
+        "lib.group_repository.rbac_create_ungrouped_hosts_workspace", side_effect=_create_workspace
+    )
+    mock_wait = mocker.patch("lib.group_repository.wait_for_workspace_event")
+
+    prefetch_ungrouped_groups(dict.fromkeys(org_ids, "test_account"))
+
+    assert sorted(call.args[0].org_id for call in mock_rbac.call_args_list) == org_ids
+    assert mock_wait.call_count == 2
@@ -20,6 +20,7 @@ from app.models import Host
 from app.models import HostGroupAssoc
 from app.models import Staleness
 from app.models import db
+from jobs.generate_stale_host_notifications import _create_host_operation_result
 from jobs.generate_stale_host_notifications import run as run_stale_host_notification
 from jobs.host_reaper import run as host_reaper_run
 from tests.helpers.db_utils import minimal_db_host
@@ -33,6 +34,7 @@ from tests.test_custom_staleness import CUSTOM_STALENESS_HOST_BECAME_STALE
 from tests.test_custom_staleness import CUSTOM_STALENESS_NO_HOSTS_TO_DELETE
 
 OWNER_ID = SYSTEM_IDENTITY["system"]["cn"]
+STALENESS_JOB_QUERY_MODES = ("per_org", "join")
 
 # Custom staleness configurations for testing
 # Makes hosts stale in 1 second and stale_warning after 2 seconds
@@ -100,13 +102,17 @@ def test_add_host_fail(mq_create_or_update_host, notification_event_producer_moc
 
 
 # System Became Stale
+@pytest.mark.parametrize("query_mode", STALENESS_JOB_QUERY_MODES)
 def test_host_did_not_became_stale(
     notification_event_producer_mock: MockEventProducer,
     db_create_staleness_culling: Callable[..., Staleness],
     flask_app: FlaskApp,
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID | str], Host | None],
+    inventory_config: Config,
+    query_mode: str,
 ) -> None:
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_NO_HOSTS_TO_DELETE)
 
     with patch("app.models.utils.datetime") as models_datetime:
@@ -243,15 +249,19 @@ def test_host_stale_warning_triggers_notification(
 
 
 @pytest.mark.usefixtures("notification_event_producer_mock")
+@pytest.mark.parametrize("query_mode", STALENESS_JOB_QUERY_MODES)
 def test_multiple_hosts_became_stale(
     db_create_staleness_culling: Callable[..., Staleness],
     flask_app: FlaskApp,
     db_create_multiple_hosts: Callable[..., list[Host]],
+    inventory_config: Config,
+    query_mode: str,
 ) -> None:
     """
     Test that one stale host notification per host is triggered when multiple
     hosts become stale.
     """
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_HOST_BECAME_STALE)
 
     with patch("app.models.utils.datetime") as models_datetime:
@@ -301,16 +311,65 @@ def test_multiple_hosts_became_stale(
         assert notified_host_ids == created_host_ids
 
 
+@pytest.mark.parametrize("query_mode", STALENESS_JOB_QUERY_MODES)
+def test_stale_notifications_apply_each_org_staleness(
+    notification_event_producer_mock: MockEventProducer,
+    db_create_staleness_culling: Callable[..., Staleness],
+    flask_app: FlaskApp,
+    db_create_host: Callable[..., Host],
+    inventory_config: Config,
+    query_mode: str,
+) -> None:
+    """
+    Verify that only the hosts of the org with custom staleness go stale, while the hosts
+    of an org using the system default staleness stay fresh.
+    """
+    inventory_config.staleness_job_query_mode = query_mode
+    db_create_staleness_culling(**CUSTOM_STALENESS_HOST_BECAME_STALE)
+
+    with patch("app.models.utils.datetime") as models_datetime:
+        job_start_time = datetime.now(UTC)
+        models_datetime.now.return_value = job_start_time - timedelta(minutes=5)
+
+        custom_staleness_host = db_create_host(host=minimal_db_host(reporter="puptoo"))
+        db_create_host(host=minimal_db_host(org_id="default-staleness-org", reporter="puptoo"))
+
+        threadctx.request_id = None
+        notified_host_ids = []
+
+        def _record_host(host: Host, *args: Any) -> Any:
+            notified_host_ids.append(host.id)
+            return _create_host_operation_result(host, *args)
+
+        with patch("jobs.generate_stale_host_notifications._create_host_operation_result", side_effect=_record_host):
+            run_stale_host_notification(
+                mock.Mock(),
+                db.session,
+                notification_event_producer=notification_event_producer_mock,
+                application=flask_app,
+                job_start_time=job_start_time,
+            )
+
+    assert notified_host_ids == [custom_staleness_host.id]
+    assert_stale_notification_is_valid(
+        notification_event_producer=notification_event_producer_mock, host=custom_staleness_host
+    )
+
+
+@pytest.mark.parametrize("query_mode", STALENESS_JOB_QUERY_MODES)
 def test_host_stale_retrigger(
     notification_event_producer_mock: MockEventProducer,
     db_create_staleness_culling: Callable[..., Staleness],
     flask_app: FlaskApp,
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID | str], Host | None],
+    inventory_config: Config,
+    query_mode: str,
 ) -> None:
     """
     Verify that a stale notification is only triggered once per stale transition.
     """
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_HOST_BECAME_STALE)
 
     with patch("app.models.utils.datetime") as models_datetime:
@@ -352,6 +411,7 @@ def test_host_stale_retrigger(
         assert notification_event_producer_mock.event is None
 
 
+@pytest.mark.parametrize("query_mode", STALENESS_JOB_QUERY_MODES)
 def test_host_stale_to_stale_warning_no_notification(
     notification_event_producer_mock: MockEventProducer,
     db_create_staleness_culling: Callable[..., Staleness],
@@ -359,11 +419,14 @@ def test_host_stale_to_stale_warning_no_notification(
     flask_app: FlaskApp,
     db_create_host: Callable[..., Host],
     db_get_host: Callable[[UUID | str], Host | None],
+    inventory_config: Config,
+    query_mode: str,
 ) -> None:
     """
     Test that a notification isn't triggered when a host transitions from
     stale to stale_warning.
     """
+    inventory_config.staleness_job_query_mode = query_mode
     db_create_staleness_culling(**CUSTOM_STALENESS_HOST_BECAME_STALE)
 
     with patch("app.models.utils.datetime") as models_datetime:
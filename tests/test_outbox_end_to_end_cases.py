@@ -858,10 +858,13 @@ class TestOutboxE2ECases:
             def __init__(self):
                 self.mq_topic = "test-topic"
 
-            def write_event(self, event, key, headers, *, wait=False):
+            def write_event(self, event, key, headers, *, wait=False, delivery_report=None):
                 # Don't call remove_event_from_outbox, just simulate the event production
                 pass
 
+            def flush_delivery_report(self, delivery_report, timeout):  # noqa: ARG002
+                return set()
+
             def close(self):
                 pass
 
@@ -895,7 +898,7 @@ class TestOutboxE2ECases:
         assert host2.display_name == "host-to-delete-2"
 
         # We want to use the real event producer, but we need to mock the kafka functions
-        event_producer._kafka_producer.flush = Mock(return_value=True)
+        event_producer._kafka_producer.flush = Mock(return_value=0)
         event_producer._kafka_producer.poll = Mock(return_value=True)
         event_producer._kafka_producer.produce = Mock(return_value=True)
 
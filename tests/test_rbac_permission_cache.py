@@ -0,0 +1,157 @@
+import json
+import threading
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from api.cache import get_cached_rbac_permissions
+from api.cache import set_cached_rbac_permissions
+from lib.rbac_permission_cache import RbacPermissionCache
+from lib.rbac_permission_cache import rbac_permission_cache
+from tests.helpers.api_utils import assert_response_status
+from tests.helpers.api_utils import build_hosts_url
+from tests.helpers.api_utils import create_mock_rbac_response
+
+CACHE_KEY = ("test_user", "test_org", "inventory")
+PERMISSIONS = [{"permission": "inventory:*:*", "resourceDefinitions": []}]
+
+
+@pytest.fixture
+def rbac_permission_cache_enabled(inventory_config):
+    inventory_config.rbac_permission_cache_ttl = 60
+    rbac_permission_cache.clear()
+    yield
+    rbac_permission_cache.clear()
+
+
+def _rbac_l2_patches(enabled: bool = True):
+    mock_client = MagicMock()
+    return (
+        patch.multiple(
+            "api.cache",
+            _get_redis_client=MagicMock(return_value=mock_client),
+            RBAC_PERMISSIONS_L2_CACHE_ENABLED=enabled,
+        ),
+        mock_client,
+    )
+
+
+def test_cache_hit_skips_loader():
+    cache = RbacPermissionCache()
+    loader = MagicMock(return_value=PERMISSIONS)
+
+    assert cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10) == PERMISSIONS
+    assert cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10) == PERMISSIONS
+    loader.assert_called_once()
+
+
+def test_expired_entry_is_reloaded():
+    cache = RbacPermissionCache()
+    loader = MagicMock(return_value=PERMISSIONS)
+
+    with patch("lib.rbac_permission_cache.time.monotonic", side_effect=[0, 61, 61]):
+        cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10)
+        cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10)
+
+    assert loader.call_count == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RbacPermissionCache()
+    loader = MagicMock(return_value=PERMISSIONS)
+
+    cache.get_or_load(("a",), loader, ttl=60, max_size=2)
+    cache.get_or_load(("b",), loader, ttl=60, max_size=2)
+    cache.get_or_load(("a",), loader, ttl=60, max_size=2)
+    cache.get_or_load(("c",), loader, ttl=60, max_size=2)
+    assert loader.call_count == 3
+
+    cache.get_or_load(("a",), loader, ttl=60, max_size=2)
+    assert loader.call_count == 3
+    cache.get_or_load(("b",), loader, ttl=60, max_size=2)
+    assert loader.call_count == 4
+
+
+def test_concurrent_misses_call_rbac_once():
+    cache = RbacPermissionCache()
+    release = threading.Event()
+    loader = MagicMock(side_effect=lambda: release.wait(5) and PERMISSIONS)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load(CACHE_KEY, loader, 60, 10))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    loader.assert_called_once()
+    assert results == [PERMISSIONS] * 5
+
+
+def test_loader_error_is_not_cached():
+    cache = RbacPermissionCache()
+    loader = MagicMock(side_effect=[RuntimeError("RBAC down"), PERMISSIONS])
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10)
+
+    assert cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10) == PERMISSIONS
+
+
+def test_redis_tier_is_used_before_rbac():
+    redis_patch, mock_client = _rbac_l2_patches()
+    mock_client.get.return_value = json.dumps(PERMISSIONS)
+    cache = RbacPermissionCache()
+    loader = MagicMock()
+
+    with redis_patch:
+        assert cache.get_or_load(CACHE_KEY, loader, ttl=60, max_size=10) == PERMISSIONS
+
+    loader.assert_not_called()
+
+
+def test_set_and_get_cached_rbac_permissions():
+    redis_patch, mock_client = _rbac_l2_patches()
+    with redis_patch:
+        set_cached_rbac_permissions(CACHE_KEY, PERMISSIONS, 60)
+        assert mock_client.set.call_args[1]["ex"] == 60
+        mock_client.get.return_value = mock_client.set.call_args[0][1]
+        assert get_cached_rbac_permissions(CACHE_KEY) == PERMISSIONS
+
+
+def test_cached_rbac_permissions_skip_redis_when_disabled():
+    redis_patch, mock_client = _rbac_l2_patches(enabled=False)
+    with redis_patch:
+        set_cached_rbac_permissions(CACHE_KEY, PERMISSIONS, 60)
+        assert get_cached_rbac_permissions(CACHE_KEY) is None
+
+    mock_client.set.assert_not_called()
+    mock_client.get.assert_not_called()
+
+
+@pytest.mark.usefixtures("enable_rbac", "rbac_permission_cache_enabled")
+def test_rbac_permissions_are_cached_between_requests(mocker, api_get):
+    fetch_mock = mocker.patch("lib.middleware._fetch_rbac_permissions")
+    fetch_mock.return_value = create_mock_rbac_response("tests/helpers/rbac-mock-data/inv-hosts-read-only.json")
+
+    for _ in range(3):
+        response_status, _ = api_get(build_hosts_url())
+        assert_response_status(response_status, 200)
+
+    fetch_mock.assert_called_once()
+
+
+@pytest.mark.usefixtures("enable_rbac")
+def test_rbac_permissions_are_not_cached_by_default(mocker, api_get):
+    fetch_mock = mocker.patch("lib.middleware._fetch_rbac_permissions")
+    fetch_mock.return_value = create_mock_rbac_response("tests/helpers/rbac-mock-data/inv-hosts-read-only.json")
+
+    for _ in range(2):
+        response_status, _ = api_get(build_hosts_url())
+        assert_response_status(response_status, 200)
+
+    assert fetch_mock.call_count == 2
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from api.cache import delete_cached_system_keys
+from api.cache import delete_cached_system_keys_batch
+from api.cache import set_cached_system
+from api.cache_key import make_system_cache_key
+from tests.helpers.test_utils import generate_uuid
+
+ORG_ID = "test_org_123"
+INDEX_KEY = f"hbi:system_keys:{ORG_ID}"
+
+
+@pytest.fixture
+def redis_client():
+    mock_client = MagicMock()
+    with patch.multiple(
+        "api.cache",
+        CACHE_CONFIG={"CACHE_TYPE": "RedisCache"},
+        CACHE_EXECUTOR=None,
+        _get_redis_client=MagicMock(return_value=mock_client),
+    ):
+        yield mock_client
+
+
+def _prefixed_key(insights_id, owner_id, org_id=ORG_ID):
+    return f"flask_cache_{make_system_cache_key(insights_id, org_id, owner_id)}"
+
+
+def test_set_cached_system_indexes_key_per_org(redis_client):
+    system_key = make_system_cache_key(generate_uuid(), ORG_ID, generate_uuid())
+    config = SimpleNamespace(cache_insights_client_system_timeout_sec=120)
+
+    with patch("api.cache.CACHE") as mock_cache:
+        set_cached_system(system_key, {"org_id": ORG_ID}, config)
+
+    mock_cache.set.assert_called_once_with(key=system_key, value={"org_id": ORG_ID}, timeout=120)
+    pipeline = redis_client.pipeline.return_value
+    pipeline.sadd.assert_called_once_with(INDEX_KEY, f"flask_cache_{system_key}")
+    pipeline.expire.assert_called_once_with(INDEX_KEY, 120)
+    pipeline.execute.assert_called_once()
+
+
+def test_batch_deletion_uses_one_round_trip(redis_client):
+    systems = [(generate_uuid(), ORG_ID, generate_uuid()) for _ in range(3)]
+    other_org_system = (generate_uuid(), "other_org", generate_uuid())
+
+    delete_cached_system_keys_batch([*systems, other_org_system, (None, ORG_ID, generate_uuid())])
+
+    redis_client.pipeline.assert_called_once()
+    pipeline = redis_client.pipeline.return_value
+    pipeline.execute.assert_called_once()
+    expected_keys = {_prefixed_key(insights_id, owner_id) for insights_id, _, owner_id in systems}
+    deleted_keys = {key for call in pipeline.delete.call_args_list for key in call.args}
+    assert deleted_keys == expected_keys | {_prefixed_key(other_org_system[0], other_org_system[2], "other_org")}
+    assert {call.args[0] for call in pipeline.srem.call_args_list} == {INDEX_KEY, "hbi:system_keys:other_org"}
+
+
+def test_org_deletion_uses_index_instead_of_scan(redis_client):
+    insights_id = generate_uuid()
+    matching_key = _prefixed_key(insights_id, generate_uuid())
+    other_key = _prefixed_key(generate_uuid(), generate_uuid())
+    redis_client.smembers.return_value = {matching_key.encode(), other_key.encode()}
+
+    delete_cached_system_keys(insights_id=insights_id, org_id=ORG_ID)
+    delete_cached_system_keys(org_id=ORG_ID)
+
+    redis_client.scan_iter.assert_not_called()
+    redis_client.smembers.assert_called_with(INDEX_KEY)
+    pipeline = redis_client.pipeline.return_value
+    assert [set(call.args) for call in pipeline.delete.call_args_list] == [
+        {matching_key.encode()},
+        {matching_key.encode(), other_key.encode()},
+    ]
+
+
+def test_deletion_is_skipped_without_redis():
+    mock_client = MagicMock()
+    with patch.multiple(
+        "api.cache",
+        CACHE_CONFIG={"CACHE_TYPE": "NullCache"},
+        _get_redis_client=MagicMock(return_value=mock_client),
+    ):
+        delete_cached_system_keys_batch([(generate_uuid(), ORG_ID, generate_uuid())])
+        delete_cached_system_keys(org_id=ORG_ID)
+
+    mock_client.pipeline.assert_not_called()
+    mock_client.smembers.assert_not_called()
@@ -1,4 +1,7 @@
+import random
+import re
 import time
+from collections import Counter
 from unittest.mock import MagicMock
 
 import pytest
@@ -503,6 +506,77 @@ def test_system_profile_sap_sids_with_search(mq_create_or_update_host, api_get):
             assert {item["value"]: item_count} == {item["value"]: expected_counts[item["value"]]}
 
 
+def _seed_profile_hosts(mq_create_or_update_host, seed):
+    rng = random.Random(seed)
+    sids_vocabulary = ["ABC", "A01", "B2C", "C1E", "DEF", "HZO", "XYZ"]
+    system_profiles = []
+    for _ in range(24):
+        system_profile = {"workloads": {"sap": {"sids": rng.sample(sids_vocabulary, rng.randint(0, 3))}}}
+        if rng.random() < 0.8:
+            system_profile["operating_system"] = {
+                "name": rng.choice(["RHEL", "CentOS"]),
+                "major": rng.randint(7, 9),
+                "minor": rng.randint(0, 2),
+            }
+        system_profiles.append(system_profile)
+        mq_create_or_update_host(minimal_host(insights_id=generate_uuid(), system_profile=system_profile))
+    return system_profiles
+
+
+def _expected_page(counts, query):
+    # The previous implementations counted in Python and sliced the pages from the full list
+    page = int(re.search(r"[?&]page=(\d+)", query).group(1)) if "&page=" in query else 1
+    per_page = int(re.search(r"per_page=(\d+)", query).group(1)) if "per_page=" in query else 50
+    return counts[(page - 1) * per_page : page * per_page], len(counts)
+
+
+@pytest.mark.parametrize("seed", (1, 2))
+def test_system_profile_sap_sids_match_in_memory_counts(mq_create_or_update_host, api_get, seed):
+    system_profiles = _seed_profile_hosts(mq_create_or_update_host, seed)
+
+    for query in ("", "?per_page=2&page=2", "?per_page=3&page=3", "?per_page=5&page=9", "?search=a", "?search=1"):
+        search = re.search(r"search=(\w+)", query)
+        sid_hosts = {}
+        for index, system_profile in enumerate(system_profiles):
+            for sid in system_profile["workloads"]["sap"]["sids"]:
+                if not search or re.search(search.group(1), sid, re.IGNORECASE):
+                    sid_hosts.setdefault(sid, set()).add(index)
+        counts = sorted(
+            ({"value": sid, "count": len(hosts)} for sid, hosts in sid_hosts.items()),
+            key=lambda item: (-item["count"], item["value"]),
+        )
+        expected_results, expected_total = _expected_page(counts, query)
+
+        response_status, response_data = api_get(build_system_profile_sap_sids_url(query=query))
+
+        assert response_status == 200
+        assert response_data["results"] == expected_results
+        assert response_data["total"] == expected_total
+
+
+@pytest.mark.parametrize("seed", (1, 2))
+def test_system_profile_operating_system_match_in_memory_counts(mq_create_or_update_host, api_get, seed):
+    system_profiles = _seed_profile_hosts(mq_create_or_update_host, seed)
+    os_counts = Counter(
+        (os["name"], os["major"], os["minor"])
+        for os in (system_profile.get("operating_system") for system_profile in system_profiles)
+        if os
+    )
+    counts = [
+        {"value": {"name": name, "major": major, "minor": minor}, "count": count}
+        for (name, major, minor), count in sorted(os_counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+    for query in ("", "?per_page=2&page=2", "?per_page=4&page=3", "?per_page=10&page=9"):
+        expected_results, expected_total = _expected_page(counts, query)
+
+        response_status, response_data = api_get(build_system_profile_operating_system_url(query=query))
+
+        assert response_status == 200
+        assert response_data["results"] == expected_results
+        assert response_data["total"] == expected_total
+
+
 def test_create_empty_update_system_profile(
     mq_create_or_update_host, api_get, db_get_static_system_profile, db_get_dynamic_system_profile
 ):
@@ -1,3 +1,4 @@
+import re
 import uuid
 from datetime import UTC
 from datetime import datetime
@@ -5,6 +6,7 @@ from datetime import timedelta
 
 import pytest
 
+from api.host_query_db import _expand_host_tags
 from app.models import ProviderType
 from app.serialization import _deserialize_tags_dict
 from tests.helpers.api_utils import HOST_READ_ALLOWED_RBAC_RESPONSE_FILES
@@ -478,3 +480,46 @@ def test_query_tags_group_id_nonexistent_uuid(api_get, db_create_group_with_host
     assert response_status == 200
     assert response_data["results"] == []
     assert response_data["count"] == 0
+
+
+@pytest.mark.parametrize(
+    "query",
+    (
+        "?order_by=tag&order_how=ASC",
+        "?order_by=tag&order_how=DESC",
+        "?order_by=count&order_how=ASC",
+        "?order_by=count&order_how=DESC",
+        "?order_by=tag&search=ns",
+        "?order_by=tag&search=NONE",
+        "?order_by=tag&per_page=2&page=2",
+        "?order_by=count&per_page=3&page=5",
+    ),
+)
+def test_get_tags_matches_in_memory_expansion(api_get, db_create_host, query):
+    tags = [
+        {"ns1": {"key1": ["val1", "val2"], "key2": []}, "NS2": {"key1": ["val1"]}},
+        {"ns1": {"key1": ["val1"]}, "null": {"key3": ["val3"]}, "ns3": {"key4": None}},
+        {"ns1": {"key1": ["val1"], "Key2": [""]}, "ns4": {"key5": ["null"]}},
+        {},
+    ]
+    hosts = [db_create_host(extra_data={"tags": host_tags}) for host_tags in tags]
+    # The previous implementation expanded every host's tags in Python
+    _, expected_tags = _expand_host_tags(hosts)
+
+    response_status, response_data = api_get(build_tags_url(query=query))
+    assert_response_status(response_status, 200)
+
+    search = re.search(r"search=(\w+)", query)
+    expected = [
+        {"tag": tracked["output"], "count": len(tracked["hosts"])}
+        for tag, tracked in sorted(expected_tags.items())
+        if not search or search.group(1).lower() in tag.lower()
+    ]
+    if "count" in query:
+        expected.sort(key=lambda item: item["count"], reverse="DESC" in query)
+    elif "DESC" in query:
+        expected.reverse()
+
+    assert response_data["total"] == len(expected)
+    offset = (response_data["page"] - 1) * response_data["per_page"]
+    assert response_data["results"] == expected[offset : offset + response_data["per_page"]]
@@ -15,6 +15,9 @@ from uuid import uuid4
 import pytest
 from confluent_kafka import KafkaException
 from connexion.exceptions import BadRequestProblem
+from jsonschema import ValidationError as JsonSchemaValidationError
+from jsonschema import validate as jsonschema_validate
+from jsonschema.validators import Draft4Validator
 from marshmallow import ValidationError
 
 from api import api_operation
@@ -70,6 +73,7 @@ from app.staleness_serialization import get_sys_default_staleness
 from app.utils import Tag
 from lib import host_kafka
 from tests.helpers.system_profile_utils import INVALID_SYSTEM_PROFILES
+from tests.helpers.system_profile_utils import VALID_SYSTEM_PROFILES
 from tests.helpers.system_profile_utils import mock_system_profile_specification
 from tests.helpers.system_profile_utils import system_profile_specification
 from tests.helpers.test_utils import SERVICE_ACCOUNT_IDENTITY
@@ -402,6 +406,22 @@ def test_configuration_with_env_vars():
     assert conf.culling_culled_offset_delta == timedelta(days=culling_culled_offset_days)
 
 
+@pytest.mark.parametrize(
+    "env, expected_shard_index",
+    (
+        ({}, 0),
+        ({"SYNCHRONIZER_SHARD_INDEX": "2"}, 2),
+        ({"SYNCHRONIZER_SHARD_INDEX": "", "JOB_COMPLETION_INDEX": "3"}, 3),
+        ({"SYNCHRONIZER_SHARD_INDEX": "1", "JOB_COMPLETION_INDEX": "3"}, 1),
+    ),
+)
+def test_config_synchronizer_shard_index(env, expected_shard_index):
+    with set_environment({"SYNCHRONIZER_SHARD_INDEX": "", "JOB_COMPLETION_INDEX": "", **env}):
+        conf = _config()
+
+    assert conf.synchronizer_shard_index == expected_shard_index
+
+
 def test_config_default_settings():
     expected_api_path = "/api/inventory/v1"
     expected_mgmt_url_path_prefix = "/"
@@ -2583,6 +2603,40 @@ def test_root_invalid_arrays_are_ignored_models_system_profile_normalizer_filter
     assert original == payload
 
 
+def test_models_system_profile_normalizer_is_shared_per_spec(flask_app):
+    with flask_app.app.app_context():
+        spec = deepcopy(SystemProfileNormalizer.for_spec().schema)
+        assert SystemProfileNormalizer.for_spec() is SystemProfileNormalizer.for_spec()
+        assert SystemProfileNormalizer.for_spec(spec) is SystemProfileNormalizer.for_spec(spec)
+        assert SystemProfileNormalizer.for_spec(spec) is not SystemProfileNormalizer.for_spec()
+
+
+def test_models_system_profile_normalizer_validate_matches_jsonschema(normalizer, subtests):
+    edge_cases = (
+        {"number_of_cpus": "1"},
+        {"number_of_cpus": True},
+        {"number_of_cpus": 1.0},
+        {"disk_devices": [{"options": {"uid": "0", "nested": {"ro": True, "list": [1, {"a": None}]}}}]},
+        {"disk_devices": [{"options": "not-an-object"}]},
+        {"unknown_field": {"anything": []}},
+    )
+    for system_profile in (*VALID_SYSTEM_PROFILES, *INVALID_SYSTEM_PROFILES, *edge_cases):
+        with subtests.test(system_profile=system_profile):
+            try:
+                jsonschema_validate(system_profile, normalizer.schema, format_checker=Draft4Validator.FORMAT_CHECKER)
+                expected = None
+            except JsonSchemaValidationError as error:
+                expected = str(error)
+
+            try:
+                normalizer.validate(system_profile)
+                actual = None
+            except JsonSchemaValidationError as error:
+                actual = str(error)
+
+            assert actual == expected
+
+
 def _payload(system_profile):
     return {
         "account": "0000001",
@@ -2648,26 +2702,26 @@ def test_fields_are_filtered_models_system_profile(flask_app):
         assert expected == result["system_profile"]
 
 
-@patch("app.models.schemas.jsonschema_validate")
-def test_type_coercion_happens_before_loading_models_system_profile(jsonschema_validate, flask_app):
+@patch.object(SystemProfileNormalizer, "validate")
+def test_type_coercion_happens_before_loading_models_system_profile(validate, flask_app):
     with flask_app.app.app_context():
         schema = HostSchema()
         payload = _payload({"number_of_cpus": "1"})
         schema.load(payload)
-        jsonschema_validate.assert_called_once_with(
-            {"number_of_cpus": 1}, HostSchema.system_profile_normalizer.schema, format_checker=ANY
-        )
+        validate.assert_called_once_with({"number_of_cpus": 1})
 
 
-@patch("app.models.schemas.jsonschema_validate")
-def test_type_filtering_happens_after_loading_models_system_profile(jsonschema_validate, flask_app):
-    with flask_app.app.app_context():
+def test_type_filtering_happens_after_loading_models_system_profile(flask_app):
+    validated = []
+    with (
+        flask_app.app.app_context(),
+        # The system profile is filtered in place, so it is recorded as it was when validated
+        patch.object(SystemProfileNormalizer, "validate", side_effect=lambda sp: validated.append(deepcopy(sp))),
+    ):
         schema = HostSchema()
         payload = _payload({"number_of_gpus": 1})
         result = schema.load(payload)
-        jsonschema_validate.assert_called_once_with(
-            {"number_of_gpus": 1}, HostSchema.system_profile_normalizer.schema, format_checker=ANY
-        )
+        assert validated == [{"number_of_gpus": 1}]
         assert result["system_profile"] == {}
 
 
@@ -0,0 +1,109 @@
+"""
+Peak RSS and rows/sec of delete_hosts_s3 reading its CSV file, downloaded whole vs streamed.
+
+The S3 client is replaced with one that serves a local file, generated with --size-gb of synthetic
+Subscription Manager IDs if it doesn't exist yet. The batches are counted instead of deleted, so only the
+reading is measured. Run each mode in its own process, the peak RSS is the one of the whole process.
+
+"download" reads the file the way the job used to: the whole body, decoded and parsed from memory.
+"stream" runs jobs.delete_hosts_s3.run, which reads the body incrementally in a separate thread and hands
+the batches over through a bounded queue. Its peak RSS stays the same whatever the size of the file.
+
+    python -m utils.benchmarks.delete_hosts_s3_memory --size-gb 2 --mode stream
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import resource
+import time
+from unittest import mock
+from uuid import uuid4
+
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.models import db
+from jobs import delete_hosts_s3
+
+HEADER = b"subscription_manager_id\n"
+
+
+class _FileS3Client:
+    """Serves every object from the same local file."""
+
+    def __init__(self, path):
+        self._path = path
+
+    def get_object(self, Bucket, Key):  # noqa: ARG002, N803
+        return {"Body": open(self._path, "rb"), "ETag": str(os.stat(self._path).st_mtime_ns)}  # noqa: SIM115
+
+    def close(self):
+        pass
+
+
+def _generate(path, size_gb):
+    row = f"{uuid4()}\n".encode()
+    rows_per_chunk = 10000
+    with open(path, "wb") as csv_file:
+        csv_file.write(HEADER)
+        while csv_file.tell() < size_gb * 1024**3:
+            csv_file.write(row * rows_per_chunk)
+
+
+def _download(s3_client, batch_size, process_batch):
+    """The job before streaming: download the whole file, then parse it from memory."""
+    csv_content = s3_client.get_object(Bucket=None, Key=None)["Body"].read().decode("utf-8")
+    reader = csv.reader(io.StringIO(csv_content), delimiter="\t")
+    next(reader)
+    batch = []
+    for row in reader:
+        if row:
+            batch.append(row[0])
+        if len(batch) == batch_size:
+            process_batch(batch)
+            batch = []
+    if batch:
+        process_batch(batch)
+
+
+def _stream(s3_client, batch_size, process_batch):  # noqa: ARG001
+    application = create_app(RuntimeEnvironment.JOB)
+    config = mock.Mock(dry_run=True, s3_bucket=None)
+    with (
+        mock.patch.object(delete_hosts_s3, "get_s3_client", return_value=s3_client),
+        mock.patch.object(delete_hosts_s3, "process_batch", lambda batch, *_: process_batch(batch)),
+    ):
+        delete_hosts_s3.run(config, logging.getLogger(__name__), db.session, None, None, application)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=2)
+    parser.add_argument("--mode", choices=("download", "stream"), default="stream")
+    parser.add_argument("--path", default="/tmp/delete_hosts_s3_benchmark.csv")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path) or os.path.getsize(args.path) < args.size_gb * 1024**3:
+        _generate(args.path, args.size_gb)
+
+    rows = 0
+
+    def count_batch(batch):
+        nonlocal rows
+        rows += len(batch)
+
+    start = time.perf_counter()
+    implementation = _download if args.mode == "download" else _stream
+    implementation(_FileS3Client(args.path), delete_hosts_s3.BATCH_SIZE, count_batch)
+    elapsed = time.perf_counter() - start
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    file_mb = os.path.getsize(args.path) / 1024**2
+    print(f"{'mode':>9} {'file MB':>9} {'rows':>11} {'rows/sec':>10} {'peak RSS MB':>12}")
+    print(f"{args.mode:>9} {file_mb:>9.0f} {rows:>11} {rows / elapsed:>10.0f} {peak_rss_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Events/sec of the host events on one core, marshmallow Schema.dumps vs the compiled event encoders.
+
+The hosts are the payloads utils.payloads builds for ingress, completed with the fields serialize_host adds.
+"schema" renders the events with Schema.dumps the way build_event used to, which walks and converts the
+serialized host again with SerializedHostSchema and its nested schemas; "encoder" runs build_event, which
+uses the encoder compiled from the same schemas. Both produce the same bytes.
+
+    python -m utils.benchmarks.event_encoding --events 5000 --repeat 3
+"""
+
+import argparse
+import time
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from uuid import uuid4
+
+from app.logging import threadctx
+from app.queue.events import EVENT_TYPE_MAP
+from app.queue.events import EventType
+from app.queue.events import build_event
+from utils.payloads import build_host_chunk
+from utils.payloads import build_sap_host_chunk
+
+PAYLOAD_BUILDERS = {"standard": build_host_chunk, "sap": build_sap_host_chunk}
+PLATFORM_METADATA = {"request_id": str(uuid4()), "b64_identity": "e30="}
+
+
+def _serialized_host(payload):
+    now = datetime.now(UTC)
+    return {
+        **payload,
+        "id": str(uuid4()),
+        "account": None,
+        "facts": [{"namespace": "satellite", "facts": {"distribution": "RHEL"}}],
+        "created": now.isoformat(),
+        "updated": now.isoformat(),
+        "last_check_in": now.isoformat(),
+        "stale_warning_timestamp": (now + timedelta(days=7)).isoformat(),
+        "culled_timestamp": (now + timedelta(days=14)).isoformat(),
+        "per_reporter_staleness": {payload["reporter"]: {"last_check_in": now.isoformat()}},
+        "groups": [{"id": str(uuid4()), "name": "benchmark", "ungrouped": False}],
+    }
+
+
+def _schema_dumps(host):
+    schema, event = EVENT_TYPE_MAP[EventType.updated](EventType.updated, host, platform_metadata=PLATFORM_METADATA)
+    return schema().dumps(event)
+
+
+def _encoder(host):
+    return build_event(EventType.updated, host, platform_metadata=PLATFORM_METADATA)
+
+
+def _run(implementation, hosts):
+    start = time.perf_counter()
+    for host in hosts:
+        implementation(host)
+    return len(hosts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    threadctx.request_id = PLATFORM_METADATA["request_id"]
+
+    print(f"{'payload':>9} {'mode':>8} {'best events/sec':>16}")
+    for payload_name, payload_builder in PAYLOAD_BUILDERS.items():
+        hosts = [_serialized_host(payload_builder()) for _ in range(args.events)]
+        for mode, implementation in (("schema", _schema_dumps), ("encoder", _encoder)):
+            best = max(_run(implementation, hosts) for _ in range(args.repeat))
+            print(f"{payload_name:>9} {mode:>8} {best:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
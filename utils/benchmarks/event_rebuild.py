@@ -0,0 +1,191 @@
+"""
+Messages/sec of the events topic rebuild, per-message checks vs batched checks.
+
+The events topic is faked with a consumer that hands out pre-built "updated" events of the payloads
+utils.payloads builds for ingress, and the Kafka producer with one that acknowledges every buffered message on
+flush after --flush-ms, standing in for the broker round trip. A share of the hosts (--existing) is inserted in
+the configured database, the others only exist in the topic and get a delete event. The job commits its
+session, so the hosts are committed too and deleted afterwards.
+
+"per_message" is the loop the job used to run: one existence query per message and a flush for every delete
+event. "batched" is jobs.rebuild_events_topic.run: one existence query and one flush per batch of
+REBUILD_EVENTS_BATCH_SIZE messages. Both produce the same number of delete events.
+
+    python -m utils.benchmarks.event_rebuild --messages 20000 --existing 0.9 --flush-ms 5
+"""
+
+import argparse
+import json
+import logging
+import time
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+from confluent_kafka import TopicPartition
+from sqlalchemy import text
+
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.logging import threadctx
+from app.models import Host
+from app.models import db
+from app.queue.event_producer import EventProducer
+from app.queue.events import EventType
+from app.queue.events import build_event
+from app.queue.host_mq import _sync_delete_event
+from jobs.rebuild_events_topic import run as rebuild_events_run
+from utils.payloads import build_host_chunk
+
+ORG_ID = "benchmark-event-rebuild"
+
+INSERT_HOSTS = text(
+    """
+    INSERT INTO hbi.hosts (id, org_id, display_name, reporter, per_reporter_staleness, groups, created_on,
+                           modified_on, last_check_in, insights_id, tags)
+    SELECT id, :org_id, 'host', 'puptoo', '{}', '[]', now(), now(), now(), gen_random_uuid(), '{}'
+    FROM unnest(CAST(:ids AS uuid[])) AS id
+    """
+)
+DELETE_HOSTS = text("DELETE FROM hbi.hosts WHERE org_id = :org_id")
+
+
+class _FakeMessage:
+    def __init__(self, value, topic=None, offset=None):
+        self._value = value
+        self._topic = topic
+        self._offset = offset
+
+    def value(self):
+        return self._value
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return 0
+
+    def offset(self):
+        return self._offset
+
+
+class _FakeConsumer:
+    """Hands out the messages in order, the way the consumer does after seeking to the beginning."""
+
+    def __init__(self, topic, messages):
+        self._topic = topic
+        self._messages = [_FakeMessage(message) for message in messages]
+        self._offset = 0
+
+    def list_topics(self, topic):
+        return SimpleNamespace(topics={topic: SimpleNamespace(partitions={0: None})})
+
+    def assign(self, partitions):
+        pass
+
+    def assignment(self):
+        return [TopicPartition(self._topic, 0)]
+
+    def consume(self, num_messages, timeout):  # noqa: ARG002
+        batch = self._messages[self._offset : self._offset + num_messages]
+        self._offset += len(batch)
+        return batch
+
+
+class _FakeKafkaProducer:
+    """Buffers the produced messages and acknowledges them on flush, after a simulated broker round trip."""
+
+    def __init__(self, flush_latency):
+        self._flush_latency = flush_latency
+        self._callbacks = []
+        self.produced = 0
+
+    def produce(self, topic, value, key, callback, headers):  # noqa: ARG002
+        self._callbacks.append((callback, _FakeMessage(value, topic, self.produced + len(self._callbacks))))
+
+    def poll(self, timeout):  # noqa: ARG002
+        return 0
+
+    def flush(self, timeout=None):  # noqa: ARG002
+        if self._callbacks:
+            time.sleep(self._flush_latency)
+        for callback, message in self._callbacks:
+            callback(None, message)
+        self.produced += len(self._callbacks)
+        self._callbacks.clear()
+        return 0
+
+
+def _event_producer(config, flush_latency):
+    event_producer = EventProducer.__new__(EventProducer)
+    event_producer._kafka_producer = _FakeKafkaProducer(flush_latency)
+    event_producer.mq_topic = config.event_topic
+    return event_producer
+
+
+def _per_message(config, logger, consumer, event_producer):  # noqa: ARG001
+    """The job loop before batching: one query per message, flushing every delete event."""
+    while new_messages := consumer.consume(num_messages=config.script_chunk_size, timeout=10):
+        for kafka_message in new_messages:
+            message = json.loads(kafka_message.value())
+            if message["type"] == EventType.delete.name:
+                continue
+            host_id = message["host"]["id"]
+            query = db.session.query(Host).filter((Host.org_id == message["host"]["org_id"]) & (Host.id == host_id))
+            if not query.count():
+                event, key, headers = _sync_delete_event(message["host"])
+                event_producer.write_event(event, key, headers, wait=True)
+        event_producer._kafka_producer.flush(300)
+
+
+def _batched(config, logger, consumer, event_producer):
+    rebuild_events_run(
+        config, logger, db.session, consumer, event_producer, mock.Mock(**{"shut_down.return_value": False})
+    )
+
+
+def _messages(count, existing_share):
+    messages, existing_ids = [], []
+    for index in range(count):
+        host = {**build_host_chunk(), "id": str(uuid4()), "org_id": ORG_ID}
+        if index < count * existing_share:
+            existing_ids.append(host["id"])
+        messages.append(build_event(EventType.updated, host))
+    return messages, existing_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--existing", type=float, default=0.9, help="share of the hosts that exist in the DB")
+    parser.add_argument("--flush-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(__name__)
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        config = application.app.config["INVENTORY_CONFIG"]
+        threadctx.request_id = None
+        messages, existing_ids = _messages(args.messages, args.existing)
+        try:
+            db.session.execute(INSERT_HOSTS, {"org_id": ORG_ID, "ids": existing_ids})
+            db.session.commit()
+            db.session.execute(text("ANALYZE hbi.hosts"))
+
+            print(f"{'mode':>12} {'messages/sec':>13} {'delete events':>14}")
+            for mode, implementation in (("per_message", _per_message), ("batched", _batched)):
+                consumer = _FakeConsumer(config.event_topic, messages)
+                event_producer = _event_producer(config, args.flush_ms / 1000)
+                start = time.perf_counter()
+                implementation(config, logger, consumer, event_producer)
+                elapsed = time.perf_counter() - start
+                produced = event_producer._kafka_producer.produced
+                print(f"{mode:>12} {len(messages) / elapsed:>13.0f} {produced:>14}")
+        finally:
+            db.session.rollback()
+            db.session.execute(DELETE_HOSTS, {"org_id": ORG_ID})
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Peak RSS of the export service upload, materialized vs streamed, by host count.
+
+Each run happens in a fresh process that serializes synthetic export rows and uploads them
+to a local stand-in for the export service, so the numbers only cover serialization and upload.
+
+    python -m utils.benchmarks.export_rss --hosts 10000 50000 100000 --format csv
+"""
+
+import argparse
+import multiprocessing
+import resource
+import threading
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import requests
+
+MODES = ("materialized", "streamed")
+
+
+class _ExportServiceStandIn(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while chunk_size := int(self.rfile.readline().strip(), 16):
+                self.rfile.read(chunk_size + 2)
+            self.rfile.readline()
+        else:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        self.send_response(HTTPStatus.ACCEPTED)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_):
+        pass
+
+
+def _fake_export_hosts(host_count):
+    for index in range(host_count):
+        yield {
+            "host_id": str(uuid.uuid4()),
+            "fqdn": f"host-{index}.example.com",
+            "subscription_manager_id": str(uuid.uuid4()),
+            "satellite_id": None,
+            "display_name": f"host-{index}.example.com",
+            "group_id": str(uuid.uuid4()),
+            "group_name": "benchmark-group",
+            "os_release": "Red Hat Enterprise Linux 9.4",
+            "updated": "2024-07-23T16:24:41.159435+00:00",
+            "state": "fresh",
+            "tags": [{"namespace": "insights-client", "key": f"key{n}", "value": f"value{n}"} for n in range(5)],
+            "host_type": "conventional",
+        }
+
+
+def _upload(mode, host_count, export_format, url):
+    from app.queue.export_service import _export_upload_body
+    from app.queue.export_service import _format_export_data
+
+    session = requests.Session()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if mode == "materialized":
+        host_data = list(_fake_export_hosts(host_count))
+        body = _format_export_data(host_data, export_format).encode("utf-8")
+    else:
+        body = _export_upload_body(_fake_export_hosts(host_count), export_format)
+
+    response = session.post(url, data=body)
+    response.raise_for_status()
+
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ExportServiceStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/upload"
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'hosts':>10} {'mode':>14} {'peak RSS growth (MiB)':>22}")
+    try:
+        for host_count in args.hosts:
+            for mode in MODES:
+                with context.Pool(1) as pool:
+                    growth = pool.apply(_upload, (mode, host_count, args.format, url))
+                print(f"{host_count:>10} {mode:>14} {growth / 1024:>22.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
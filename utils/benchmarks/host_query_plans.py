@@ -0,0 +1,166 @@
+"""
+Query plans and latency of the GET /hosts list query for representative filter combinations.
+
+A synthetic org is generated in the configured database with a few INSERT ... SELECTs: hosts, groups
+(one of them the ungrouped group) and hosts_groups rows for three quarters of the hosts; the transaction
+is rolled back afterwards. Every case builds the host list query the way the API does, EXPLAINs it and
+times one page of it.
+
+The plan check guards the join elimination of the host list queries: hosts_groups must not be read at all
+unless the case filters by group, and when it is read, it must be under a semi or anti join, a subplan or
+a unique-ified input, never a plain join that repeats hosts. The script exits with status 1 if a check fails.
+
+    python -m utils.benchmarks.host_query_plans --hosts 100000 --groups 50 --repeat 3
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from api.filtering.db_filters import query_filters
+from api.host_count import _Explain
+from api.host_query_db import DEFAULT_COLUMNS
+from api.host_query_db import _find_hosts_entities_query
+from api.host_query_db import _join_referenced_group_tables
+from api.host_query_db import params_to_order_by
+from app import create_app
+from app.auth.identity import create_mock_identity_with_org_id
+from app.environment import RuntimeEnvironment
+from app.models import db
+
+ORG_ID = "benchmark-host-query-plans"
+PAGE_SIZE = 50
+GROUP_TABLE = "hosts_groups"
+
+INSERT_HOSTS = text(
+    """
+    INSERT INTO hbi.hosts (id, org_id, display_name, reporter, per_reporter_staleness, groups, created_on,
+                           modified_on, last_check_in, stale_timestamp, stale_warning_timestamp,
+                           deletion_timestamp, insights_id, tags)
+    SELECT gen_random_uuid(), :org_id, 'host-' || n, 'puptoo', '{}', '[]', now(), now(),
+           now() - n % 30 * interval '1 day', now() + (1 - n % 3) * interval '1 day',
+           now() + interval '7 days', now() + interval '14 days', gen_random_uuid(),
+           jsonb_build_object('insights-client', jsonb_build_object('env', jsonb_build_array('env-' || n % 5)))
+    FROM generate_series(1, :host_count) AS n
+    """
+)
+INSERT_GROUPS = text(
+    """
+    INSERT INTO hbi.groups (id, org_id, name, ungrouped, created_on, modified_on)
+    SELECT gen_random_uuid(), :org_id, 'group-' || n, n = 0, now(), now()
+    FROM generate_series(0, :group_count - 1) AS n
+    """
+)
+INSERT_HOSTS_GROUPS = text(
+    """
+    INSERT INTO hbi.hosts_groups (org_id, host_id, group_id)
+    SELECT h.org_id, h.id, g.id
+    FROM (SELECT org_id, id, row_number() OVER () AS n FROM hbi.hosts WHERE org_id = :org_id) AS h
+    JOIN (SELECT id, row_number() OVER (ORDER BY name) - 1 AS n FROM hbi.groups WHERE org_id = :org_id) AS g
+      ON g.n = h.n % :group_count
+    WHERE h.n % 4 <> 0
+    """
+)
+SELECT_GROUP_IDS = text("SELECT id FROM hbi.groups WHERE org_id = :org_id AND NOT ungrouped ORDER BY name LIMIT 2")
+
+
+def _cases(group_ids):
+    return (
+        ("no filters", {}, False),
+        ("display_name", {"display_name": "host-1"}, False),
+        ("staleness", {"staleness": ["fresh", "stale"]}, False),
+        ("tags", {"tags": ["insights-client/env=env-1"]}, False),
+        ("order by group_name", {"order_by": "group_name"}, False),
+        ("group_name", {"group_name": ["group-1"]}, True),
+        ("group_name ungrouped", {"group_name": [""]}, True),
+        ("RBAC groups", {"rbac_filter": {"groups": group_ids}}, True),
+        ("RBAC groups and ungrouped", {"rbac_filter": {"groups": [*group_ids, None]}, "staleness": ["fresh"]}, True),
+    )
+
+
+def _list_query(identity, params):
+    filters, query_base = query_filters(identity=identity, **params)
+    order_by = params.get("order_by")
+    ordering = params_to_order_by(order_by, None)
+    query = _find_hosts_entities_query(
+        query=query_base, columns=DEFAULT_COLUMNS.copy(), identity=identity, order_by=order_by
+    )
+    query = _join_referenced_group_tables(query, *filters, *ordering)
+    return query.filter(*filters).order_by(*ordering).limit(PAGE_SIZE)
+
+
+# Contexts in which hosts_groups is read without repeating hosts; joins below them are the subquery's own
+SAFE_CONTEXTS = ("SubPlan", "Unique", "Semi", "Anti", "Right Semi", "Right Anti")
+
+
+def _group_table_reads(node, context=None):
+    """Yield the join, subplan or unique-ifying context of every hosts_groups read in the plan."""
+    if context not in SAFE_CONTEXTS:
+        if node.get("Parent Relationship") in ("SubPlan", "InitPlan"):
+            context = "SubPlan"
+        elif "Join Type" in node:
+            context = node["Join Type"]
+        elif node["Node Type"] in ("Unique", "Aggregate"):
+            context = "Unique"
+    if node.get("Relation Name") == GROUP_TABLE:
+        yield context
+    for child in node.get("Plans", ()):
+        yield from _group_table_reads(child, context)
+
+
+def _plan_problem(plan, filters_by_group):
+    reads = list(_group_table_reads(plan))
+    if reads and not filters_by_group:
+        return f"reads {GROUP_TABLE}"
+    repeating = [context for context in reads if context is not None and context not in SAFE_CONTEXTS]
+    if repeating:
+        return f"joins {GROUP_TABLE} ({', '.join(repeating)})"
+    return None
+
+
+def _measure(query, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = query.all()
+        runs.append(time.perf_counter() - start)
+    return min(runs), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=100_000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        try:
+            params = {"org_id": ORG_ID, "host_count": args.hosts, "group_count": args.groups}
+            db.session.execute(INSERT_HOSTS, params)
+            db.session.execute(INSERT_GROUPS, params)
+            db.session.execute(INSERT_HOSTS_GROUPS, params)
+            db.session.execute(text("ANALYZE hbi.hosts, hbi.groups, hbi.hosts_groups"))
+            group_ids = [str(row.id) for row in db.session.execute(SELECT_GROUP_IDS, params)]
+            identity = create_mock_identity_with_org_id(ORG_ID)
+
+            print(f"{'case':>26} {'best seconds':>13} {'rows':>5} {'plan rows':>10}  plan check")
+            for name, case_params, filters_by_group in _cases(group_ids):
+                query = _list_query(identity, case_params)
+                plan = db.session.execute(_Explain(query.statement)).scalar()[0]["Plan"]
+                problem = _plan_problem(plan, filters_by_group)
+                failed = failed or problem is not None
+                elapsed, row_count = _measure(query, args.repeat)
+                print(f"{name:>26} {elapsed:>13.3f} {row_count:>5} {plan['Plan Rows']:>10}  {problem or 'ok'}")
+        finally:
+            db.session.rollback()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Rows/sec of writing brand-new hosts, ORM unit of work vs multi-row INSERTs (MQ_BULK_INSERT_NEW_HOSTS).
+
+Synthetic hosts with a system profile are written to the configured database in one transaction
+per run, the same way an ingress batch would, and the transaction is rolled back afterwards.
+Only the writes are timed, not building the Host objects.
+
+    python -m utils.benchmarks.new_host_insert --hosts 100 500 1000 --repeat 3
+"""
+
+import argparse
+import time
+import uuid
+
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.models import Host
+from app.models import HostGroupAssoc
+from app.models import db
+from lib.group_repository import add_group
+from lib.host_repository import NewHostBulkInsert
+
+MODES = ("orm", "bulk")
+ORG_ID = "benchmark-new-host-insert"
+
+
+def _fake_hosts(host_count):
+    return [
+        Host(
+            org_id=ORG_ID,
+            reporter="puptoo",
+            subscription_manager_id=str(uuid.uuid4()),
+            fqdn=f"host-{index}.example.com",
+            tags={"insights-client": {f"key{n}": [f"value{n}"] for n in range(5)}},
+            system_profile_facts={
+                "arch": "x86_64",
+                "number_of_cpus": 4,
+                "os_release": "9.4",
+                "operating_system": {"name": "RHEL", "major": 9, "minor": 4},
+                "installed_packages": [f"package-{n}-1.0-1.el9.x86_64" for n in range(50)],
+            },
+        )
+        for index in range(host_count)
+    ]
+
+
+def _write(mode, hosts, group_id):
+    if mode == "orm":
+        for host in hosts:
+            db.session.add(HostGroupAssoc(host.id, group_id, ORG_ID))
+            host.save()
+        db.session.flush()
+    else:
+        # Leaving the context writes the staged hosts
+        with NewHostBulkInsert():
+            for host in hosts:
+                NewHostBulkInsert.put(str(host.id), (host, group_id))
+
+
+def _run(mode, host_count):
+    try:
+        group_id = add_group("Ungrouped Hosts", ORG_ID, ungrouped=True).id
+        hosts = _fake_hosts(host_count)
+        for host in hosts:
+            host.id = uuid.uuid4()
+
+        start = time.perf_counter()
+        _write(mode, hosts, group_id)
+        return host_count / (time.perf_counter() - start)
+    finally:
+        db.session.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        # The staging context only activates when bulk inserts are enabled
+        application.app.config["INVENTORY_CONFIG"].mq_bulk_insert_new_hosts = True
+
+        print(f"{'hosts':>8} {'mode':>6} {'best rows/sec':>14}")
+        for host_count in args.hosts:
+            for mode in MODES:
+                best = max(_run(mode, host_count) for _ in range(args.repeat))
+                print(f"{host_count:>8} {mode:>6} {best:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
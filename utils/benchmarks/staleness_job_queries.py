@@ -0,0 +1,140 @@
+"""
+Plan and execution time of the host reaper and stale host notification queries, per-org filters vs staleness join.
+
+Synthetic orgs are generated in the configured database with a few INSERT ... SELECTs: every other org gets
+custom staleness, and each org gets hosts that checked in over the last 60 days, with their stale and deletion
+timestamps precomputed from the org staleness the way ingress does. The transaction is rolled back afterwards.
+
+"per_org" builds one filter per org with custom staleness and ORs them together with the system default one;
+"join" joins the hosts against the staleness table and computes the thresholds in SQL. Both queries are the
+ones the jobs run, EXPLAIN ANALYZEd; the rows column should match between the modes.
+
+    python -m utils.benchmarks.staleness_job_queries --orgs 1000 --hosts-per-org 100 --repeat 3
+"""
+
+import argparse
+import logging
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from sqlalchemy import ClauseElement
+from sqlalchemy import Executable
+from sqlalchemy import func
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.models import Host
+from app.models import HostInventoryMetadata
+from app.models import db
+from app.staleness_serialization import get_sys_default_staleness
+from jobs.generate_stale_host_notifications import _stale_hosts_query
+from jobs.host_reaper import find_hosts_to_delete
+
+ORG_PREFIX = "benchmark-staleness-"
+QUERY_MODES = ("per_org", "join")
+LAST_RUN = timedelta(hours=1)
+
+INSERT_STALENESS = text(
+    """
+    INSERT INTO hbi.staleness (id, org_id, conventional_time_to_stale, conventional_time_to_stale_warning,
+                               conventional_time_to_delete, created_on, modified_on)
+    SELECT gen_random_uuid(), :org_prefix || n, 86400 * (1 + n % 3), 86400 * (4 + n % 3), 86400 * (7 + n % 21),
+           now(), now()
+    FROM generate_series(0, :org_count - 1) AS n
+    WHERE n % 2 = 0
+    """
+)
+INSERT_HOSTS = text(
+    """
+    INSERT INTO hbi.hosts (id, org_id, display_name, reporter, per_reporter_staleness, groups, created_on,
+                           modified_on, last_check_in, stale_timestamp, stale_warning_timestamp,
+                           deletion_timestamp, insights_id, tags)
+    SELECT gen_random_uuid(), h.org_id, 'host-' || h.n, 'puptoo', '{}', '[]', now(), now(), h.last_check_in,
+           h.last_check_in + coalesce(s.conventional_time_to_stale, :stale) * interval '1 second',
+           h.last_check_in + coalesce(s.conventional_time_to_stale_warning, :stale_warning) * interval '1 second',
+           h.last_check_in + coalesce(s.conventional_time_to_delete, :delete) * interval '1 second',
+           gen_random_uuid(), '{}'
+    FROM (
+        SELECT :org_prefix || o AS org_id, n, now() - (o * 7 + n * 7919) % 86400 * interval '1 minute' AS last_check_in
+        FROM generate_series(0, :org_count - 1) AS o, generate_series(1, :hosts_per_org) AS n
+    ) AS h
+    LEFT JOIN hbi.staleness AS s ON s.org_id = h.org_id
+    """
+)
+
+
+class _ExplainAnalyze(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainAnalyze, "postgresql")
+def _compile_explain_analyze(element, compiler, **kwargs):
+    return f"EXPLAIN (ANALYZE, FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def _reaper_query(config, logger):
+    return find_hosts_to_delete(config, logger, db.session)
+
+
+def _stale_notification_query(_config, logger):
+    stale_host_timestamp = HostInventoryMetadata(name="stale_host_notification", type="job")
+    job_start_time = datetime.now(UTC)
+    stale_host_timestamp.last_succeeded = job_start_time - LAST_RUN
+    return _stale_hosts_query(logger, db.session, stale_host_timestamp, job_start_time)
+
+
+def _measure(config, logger, build_query, repeat):
+    """Best plan time, best execution time, in milliseconds, and the row count of the count query."""
+    plan_times, execution_times = [], []
+    for _ in range(repeat):
+        query = build_query(config, logger).with_entities(func.count(Host.id))
+        explained = db.session.execute(_ExplainAnalyze(query.statement)).scalar()[0]
+        plan_times.append(explained["Planning Time"])
+        execution_times.append(explained["Execution Time"])
+    row_count = build_query(config, logger).with_entities(func.count(Host.id)).scalar()
+    return min(plan_times), min(execution_times), row_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orgs", type=int, default=1000)
+    parser.add_argument("--hosts-per-org", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(__name__)
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        config = application.app.config["INVENTORY_CONFIG"]
+        try:
+            default_staleness = get_sys_default_staleness()
+            params = {
+                "org_prefix": ORG_PREFIX,
+                "org_count": args.orgs,
+                "hosts_per_org": args.hosts_per_org,
+                "stale": default_staleness["conventional_time_to_stale"],
+                "stale_warning": default_staleness["conventional_time_to_stale_warning"],
+                "delete": default_staleness["conventional_time_to_delete"],
+            }
+            db.session.execute(INSERT_STALENESS, params)
+            db.session.execute(INSERT_HOSTS, params)
+            db.session.execute(text("ANALYZE hbi.hosts, hbi.staleness"))
+
+            print(f"{'query':>18} {'mode':>8} {'plan ms':>9} {'execution ms':>13} {'rows':>8}")
+            for name, build_query in (("reaper", _reaper_query), ("stale notification", _stale_notification_query)):
+                for mode in QUERY_MODES:
+                    config.staleness_job_query_mode = mode
+                    plan_time, execution_time, row_count = _measure(config, logger, build_query, args.repeat)
+                    print(f"{name:>18} {mode:>8} {plan_time:>9.1f} {execution_time:>13.1f} {row_count:>8}")
+        finally:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Latency of the GET /system_profile/sap_sids and /system_profile/operating_system aggregations, in memory vs SQL.
+
+A synthetic org is generated in the configured database with a few INSERT ... SELECTs: hosts, their static
+system profile with an operating system and their dynamic one with three SAP SIDs out of 2600. The endpoints
+close the session, so the rows are committed and deleted afterwards.
+
+"memory" runs the queries the endpoints used to: every (host, SID) pair loaded and counted in Python, and
+every OS group loaded and sliced in Python. "sql" runs get_sap_sids_info and get_os_info, which group, order
+and paginate in the database. Both fetch the first page and the total.
+
+    python -m utils.benchmarks.system_profile_counts --hosts 200000 --repeat 3
+"""
+
+import argparse
+import time
+from itertools import islice
+from unittest import mock
+
+from sqlalchemy import Integer
+from sqlalchemy import func
+from sqlalchemy import text
+
+from api.filtering.db_filters import query_filters
+from api.host_query_db import _find_hosts_entities_query
+from api.host_query_db import get_os_info
+from api.host_query_db import get_sap_sids_info
+from app import create_app
+from app.auth.identity import create_mock_identity_with_org_id
+from app.environment import RuntimeEnvironment
+from app.models import Host
+from app.models import HostDynamicSystemProfile
+from app.models import db
+from app.models.system_profile_static import HostStaticSystemProfile
+
+ORG_ID = "benchmark-system-profile-counts"
+PAGE_SIZE = 50
+
+INSERT_HOSTS = text(
+    """
+    INSERT INTO hbi.hosts (id, org_id, display_name, reporter, per_reporter_staleness, groups, created_on,
+                           modified_on, last_check_in, stale_timestamp, stale_warning_timestamp,
+                           deletion_timestamp, insights_id, tags)
+    SELECT gen_random_uuid(), :org_id, 'host-' || n, 'puptoo', '{}', '[]', now(), now(), now(),
+           now() + interval '1 day', now() + interval '7 days', now() + interval '14 days', gen_random_uuid(), '{}'
+    FROM generate_series(1, :host_count) AS n
+    """
+)
+INSERT_STATIC_PROFILES = text(
+    """
+    INSERT INTO hbi.system_profiles_static (org_id, host_id, operating_system)
+    SELECT org_id, id, jsonb_build_object('name', CASE WHEN n % 5 = 0 THEN 'CentOS' ELSE 'RHEL' END,
+                                          'major', 7 + n % 3, 'minor', n % 10)
+    FROM (SELECT org_id, id, row_number() OVER () AS n FROM hbi.hosts WHERE org_id = :org_id) AS h
+    """
+)
+INSERT_DYNAMIC_PROFILES = text(
+    """
+    INSERT INTO hbi.system_profiles_dynamic (org_id, host_id, workloads)
+    SELECT org_id, id, jsonb_build_object('sap', jsonb_build_object('sap_system', true, 'sids', (
+        SELECT jsonb_agg(DISTINCT chr((65 + s % 26)::int) || lpad((s / 26 % 100)::text, 2, '0'))
+        FROM unnest(ARRAY[n % 2600, n * 7 % 2600, n * 13 % 2600]) AS s
+    )))
+    FROM (SELECT org_id, id, row_number() OVER () AS n FROM hbi.hosts WHERE org_id = :org_id) AS h
+    """
+)
+DELETE_HOSTS = text("DELETE FROM hbi.hosts WHERE org_id = :org_id")
+
+
+def _sap_sids_in_memory(identity):
+    """get_sap_sids_info before the aggregation moved to SQL."""
+    columns = [Host.id, func.jsonb_array_elements_text(HostDynamicSystemProfile.workloads["sap"]["sids"])]
+    filters, query_base = query_filters(identity=identity, join_dynamic_profile=True)
+    sap_sids = {}
+    for host_id, sap_sid in _find_hosts_entities_query(query_base, columns, identity).filter(*filters).all():
+        sap_sids.setdefault(sap_sid, set()).add(host_id)
+    counts = sorted(
+        ({"value": sap_sid, "count": len(hosts)} for sap_sid, hosts in sap_sids.items()),
+        reverse=True,
+        key=lambda item: item["count"],
+    )
+    return list(islice(counts, PAGE_SIZE)), len(counts)
+
+
+def _os_in_memory(identity):
+    """get_os_info before the pagination moved to SQL."""
+    os_field = HostStaticSystemProfile.operating_system
+    columns = [
+        os_field["name"].astext,
+        os_field["major"].astext.cast(Integer),
+        os_field["minor"].astext.cast(Integer),
+        func.count(),
+    ]
+    filters, query_base = query_filters(identity=identity, join_static_profile=True)
+    query = _find_hosts_entities_query(query_base, columns, identity).filter(*filters, columns[0].isnot(None))
+    counts = [
+        {"value": {"name": name, "major": major, "minor": minor}, "count": count}
+        for name, major, minor, count in query.group_by(*columns[:-1]).order_by(func.count().desc()).all()
+    ]
+    return list(islice(counts, PAGE_SIZE)), len(counts)
+
+
+def _sap_sids_sql(identity):
+    return get_sap_sids_info(PAGE_SIZE, 0, None, None, None, None, None, None, identity)
+
+
+def _os_sql(identity):
+    return get_os_info(PAGE_SIZE, 0, None, None, None, None, None, identity)
+
+
+def _measure(implementation, identity, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, total = implementation(identity)
+        runs.append(time.perf_counter() - start)
+        db.session.close()
+    return min(runs), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        identity = create_mock_identity_with_org_id(ORG_ID)
+        try:
+            params = {"org_id": ORG_ID, "host_count": args.hosts}
+            db.session.execute(INSERT_HOSTS, params)
+            db.session.execute(INSERT_STATIC_PROFILES, params)
+            db.session.execute(INSERT_DYNAMIC_PROFILES, params)
+            db.session.commit()
+            db.session.execute(text("ANALYZE hbi.hosts, hbi.system_profiles_static, hbi.system_profiles_dynamic"))
+
+            cases = (
+                ("sap_sids", "memory", _sap_sids_in_memory),
+                ("sap_sids", "sql", _sap_sids_sql),
+                ("operating_system", "memory", _os_in_memory),
+                ("operating_system", "sql", _os_sql),
+            )
+            print(f"{'endpoint':>17} {'mode':>7} {'best seconds':>13} {'total':>6}")
+            # The endpoints read the current identity for the owner_id filter of system identities
+            with mock.patch("api.host_query_db.get_current_identity", return_value=identity):
+                for endpoint, mode, implementation in cases:
+                    elapsed, total = _measure(implementation, identity, args.repeat)
+                    print(f"{endpoint:>17} {mode:>7} {elapsed:>13.3f} {total:>6}")
+        finally:
+            db.session.rollback()
+            db.session.execute(DELETE_HOSTS, {"org_id": ORG_ID})
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
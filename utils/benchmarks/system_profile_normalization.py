@@ -0,0 +1,80 @@
+"""
+Per-message latency and allocations of normalizing an ingress system profile.
+
+Each message is deserialized the way the MQ service does it: HostSchema coerces, validates and filters the
+system profile, migrates the legacy workloads fields, and the host model splits it into its static and
+dynamic system profiles. Nothing is written to the database. The standard payload carries a large
+installed_packages list; the SAP payload uses the legacy sap_* fields, which have to be migrated.
+
+    python -m utils.benchmarks.system_profile_normalization --messages 200 --packages 2000
+"""
+
+import argparse
+import logging
+import time
+import tracemalloc
+from copy import deepcopy
+from statistics import mean
+
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.serialization import deserialize_host
+from utils.payloads import build_host_chunk
+from utils.payloads import build_sap_host_chunk
+
+
+def _standard_payload(package_count):
+    payload = build_host_chunk()
+    payload["system_profile"]["installed_packages"] = [
+        f"package-{n}-1.0.{n}-1.el9.x86_64" for n in range(package_count)
+    ]
+    return payload
+
+
+def _latency(payloads):
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        deserialize_host(payload)
+        latencies.append(time.perf_counter() - start)
+    return mean(latencies)
+
+
+def _allocations(payloads):
+    # Measured in a separate pass, tracing allocations slows them down too much to time the messages
+    peaks = []
+    tracemalloc.start()
+    for payload in payloads:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        deserialize_host(payload)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return mean(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--packages", type=int, default=2000, help="installed_packages in the standard payload")
+    args = parser.parse_args()
+
+    application = create_app(RuntimeEnvironment.JOB)
+    # Every legacy payload logs the migrated fields, which would dominate the SAP timings
+    logging.disable(logging.INFO)
+    with application.app.app_context():
+        payloads = {
+            "standard": _standard_payload(args.packages),
+            "sap": build_sap_host_chunk(),
+        }
+        print(f"{'payload':>9} {'mean ms':>8} {'mean peak KiB':>14}")
+        for name, payload in payloads.items():
+            # Warm up the schemas, then give every message its own copy of the payload, as if freshly parsed
+            deserialize_host(deepcopy(payload))
+            latency = _latency([deepcopy(payload) for _ in range(args.messages)])
+            peak = _allocations([deepcopy(payload) for _ in range(args.messages)])
+            print(f"{name:>9} {latency * 1000:>8.2f} {peak / 2**10:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
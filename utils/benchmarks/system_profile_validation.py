@@ -0,0 +1,57 @@
+"""
+Validations/sec of system profiles, jsonschema.validate per payload vs the normalizer's compiled schema.
+
+The payloads are the system profiles utils.payloads builds for ingress: the standard host chunk and the
+SAP host chunk. "validate" calls jsonschema.validate the way LimitedHostSchema used to, which builds a
+validator and interprets the schema for every payload; "compiled" calls SystemProfileNormalizer.validate,
+which checks the payload with the predicates compiled once per spec.
+
+    python -m utils.benchmarks.system_profile_validation --payloads 1000 --repeat 3
+"""
+
+import argparse
+import time
+
+from jsonschema import validate as jsonschema_validate
+from jsonschema.validators import Draft4Validator
+
+from app.models.system_profile_normalizer import SystemProfileNormalizer
+from utils.payloads import build_host_chunk
+from utils.payloads import build_sap_host_chunk
+
+PAYLOAD_BUILDERS = {"standard": build_host_chunk, "sap": build_sap_host_chunk}
+
+
+def _jsonschema_validate(normalizer, system_profile):
+    jsonschema_validate(system_profile, normalizer.schema, format_checker=Draft4Validator.FORMAT_CHECKER)
+
+
+def _compiled_validate(normalizer, system_profile):
+    normalizer.validate(system_profile)
+
+
+def _run(implementation, normalizer, system_profiles):
+    start = time.perf_counter()
+    for system_profile in system_profiles:
+        implementation(normalizer, system_profile)
+    return len(system_profiles) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    normalizer = SystemProfileNormalizer.for_spec()
+
+    print(f"{'payload':>9} {'mode':>9} {'best validations/sec':>21}")
+    for payload_name, payload_builder in PAYLOAD_BUILDERS.items():
+        system_profiles = [payload_builder()["system_profile"] for _ in range(args.payloads)]
+        for mode, implementation in (("validate", _jsonschema_validate), ("compiled", _compiled_validate)):
+            best = max(_run(implementation, normalizer, system_profiles) for _ in range(args.repeat))
+            print(f"{payload_name:>9} {mode:>9} {best:>21.0f}")
+
+
+if __name__ == "__main__":
+    main()
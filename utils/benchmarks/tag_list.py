@@ -0,0 +1,97 @@
+"""
+Latency and peak memory of the GET /tags aggregation, in-memory expansion vs SQL-side GROUP BY.
+
+A synthetic org is generated in the configured database with one INSERT ... SELECT, each host carrying
+a handful of tags drawn from a fixed vocabulary, and the transaction is rolled back afterwards.
+"memory" loads Host.id and Host.tags for the whole org and counts the tags with _expand_host_tags,
+the way get_tag_list used to; "sql" runs the query get_tag_list now builds and fetches one page.
+
+    python -m utils.benchmarks.tag_list --hosts 100000 --repeat 3
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import text
+
+from api.host_query_db import _expand_host_tags
+from api.host_query_db import _tag_counts_subquery
+from app import create_app
+from app.environment import RuntimeEnvironment
+from app.models import Host
+from app.models import db
+
+ORG_ID = "benchmark-tag-list"
+PAGE_SIZE = 50
+
+INSERT_HOSTS = text(
+    """
+    INSERT INTO hbi.hosts (id, org_id, display_name, reporter, per_reporter_staleness, groups, created_on,
+                           modified_on, insights_id, tags)
+    SELECT gen_random_uuid(), :org_id, 'host-' || n, 'puptoo', '{}', '[]', now(), now(), gen_random_uuid(),
+           jsonb_build_object(
+               'insights-client', jsonb_build_object('env', jsonb_build_array('env-' || n % 5),
+                                                     'team', jsonb_build_array('team-' || n % 40)),
+               'satellite', jsonb_build_object('location', jsonb_build_array('dc-' || n % 12),
+                                               'hostgroup', jsonb_build_array('hg-' || n % 300, 'all')),
+               'qualys', jsonb_build_object('tag-' || n % 1000, '[]'::jsonb)
+           )
+    FROM generate_series(1, :host_count) AS n
+    """
+)
+
+
+def _hosts_query():
+    return db.session.query(Host).filter(Host.org_id == ORG_ID).with_entities(Host.id, Host.tags)
+
+
+def _in_memory(search):
+    _, tags = _expand_host_tags(_hosts_query().all())
+    counts = sorted(((len(tracked["hosts"]), tag) for tag, tracked in tags.items() if search in tag), reverse=True)
+    return len(counts), counts[:PAGE_SIZE]
+
+
+def _sql(search):
+    tag_counts = _tag_counts_subquery(_hosts_query(), f".*{search}.*" if search else None)
+    page = select(tag_counts, func.count().over().label("total")).order_by(tag_counts.c.count.desc()).limit(PAGE_SIZE)
+    rows = db.session.execute(page).all()
+    return rows[0].total if rows else 0, rows
+
+
+def _measure(implementation, search):
+    tracemalloc.start()
+    start = time.perf_counter()
+    total, _ = implementation(search)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--search", default="", help="substring the tags must contain")
+    args = parser.parse_args()
+
+    application = create_app(RuntimeEnvironment.JOB)
+    with application.app.app_context():
+        try:
+            db.session.execute(INSERT_HOSTS, {"org_id": ORG_ID, "host_count": args.hosts})
+            db.session.execute(text("ANALYZE hbi.hosts"))
+
+            print(f"{'mode':>8} {'best seconds':>13} {'peak MiB':>9} {'tags':>7}")
+            for name, implementation in (("memory", _in_memory), ("sql", _sql)):
+                runs = [_measure(implementation, args.search) for _ in range(args.repeat)]
+                elapsed, peak, total = min(runs)
+                print(f"{name:>8} {elapsed:>13.3f} {peak / 2**20:>9.1f} {total:>7}")
+        finally:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
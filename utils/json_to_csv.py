@@ -11,17 +11,23 @@ def _tags_to_string(tags_arr):
     return f"{tags_str}"
 
 
-def json_arr_to_csv(json_arr_data):
-    # Prepare a buffer to store the CSV data
+def iter_json_to_csv(json_iter):
+    # Reuse one small buffer, yielding the CSV text row by row
     output = io.StringIO()
     writer = csv.writer(output, quoting=csv.QUOTE_NONNUMERIC)
-    writer.writerow(json_arr_data[0].keys())
-    for host in json_arr_data:
+    header_written = False
+    for host in json_iter:
+        if not header_written:
+            writer.writerow(host.keys())
+            header_written = True
         host["tags"] = _tags_to_string(host["tags"])
         # Write the data row
         writer.writerow(host.values())
 
-    # Get the CSV string from the buffer
-    csv_string = output.getvalue()
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
 
-    return csv_string
+def json_arr_to_csv(json_arr_data):
+    return "".join(iter_json_to_csv(json_arr_data))